@@ -7,8 +7,9 @@ import random
 import secrets
 import warnings
 from argparse import Namespace
+from array import array
 from collections import Counter, deque, defaultdict
-from collections.abc import Collection, MutableSequence
+from collections.abc import Collection, MutableMapping, MutableSequence
 from enum import IntEnum, IntFlag
 from typing import (AbstractSet, Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Literal, Mapping, NamedTuple,
                     Optional, Protocol, Set, Tuple, Union, TYPE_CHECKING, Literal, overload)
@@ -25,6 +26,10 @@ if TYPE_CHECKING:
     from worlds import AutoWorld
 
 
+RuleDependencies = Tuple[AbstractSet[Tuple[int, str]], AbstractSet[Tuple[int, str]]]
+"""(player, item name)s and (player, region name)s that an access rule reads, see `Location.get_rule_dependencies`."""
+
+
 class Group(TypedDict):
     name: str
     game: str
@@ -98,6 +103,9 @@ class MultiWorld():
 
     game: Dict[int, str]
 
+    playthrough_model: Optional[PlaythroughModel] = None
+    """Cached by `get_playthrough_model` until placements change, read by the sphere and playthrough consumers."""
+
     random: random.Random
     per_slot_randoms: Utils.DeprecateDict[int, random.Random]
     """Deprecated. Please use `self.random` instead."""
@@ -490,10 +498,12 @@ class MultiWorld():
     def push_precollected(self, item: Item):
         self.precollected_items[item.player].append(item)
         self.state.collect(item, True)
+        self.playthrough_model = None
 
     def push_item(self, location: Location, item: Item, collect: bool = True):
         location.item = item
         item.location = location
+        self.playthrough_model = None
         if collect:
             self.state.collect(item, location.advancement, location)
 
@@ -578,6 +588,26 @@ class MultiWorld():
 
         return False
 
+    def get_playthrough_model(self) -> PlaythroughModel:
+        """
+        Returns the spheres of all filled locations, computing them if they are not cached yet.
+        The result is cached in `playthrough_model` until `push_item`, `push_precollected`,
+        `Location.place_locked_item` or `Fill.swap_location_item` change the placements. Items placed any other way are
+        noticed by `get_current_playthrough_model` before the cache is read. Until this is called, the consumers compute
+        spheres on their own.
+        """
+        model = self.get_current_playthrough_model()
+        if model is None:
+            model = self.playthrough_model = PlaythroughModel(self)
+        return model
+
+    def get_current_playthrough_model(self) -> Optional[PlaythroughModel]:
+        """Returns the cached playthrough model, unless placements changed since, in which case it is dropped."""
+        model = self.playthrough_model
+        if model and not model.matches(self):
+            self.playthrough_model = model = None
+        return model
+
     def get_spheres(self) -> Iterator[Set[Location]]:
         """
         yields a set of locations for each logical sphere
@@ -586,24 +616,12 @@ class MultiWorld():
         locations is followed by an empty set, and then a set of all of the
         unreachable locations.
         """
-        state = CollectionState(self)
-        locations = set(self.get_filled_locations())
-
-        while locations:
-            sphere: Set[Location] = set()
-
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-            yield sphere
-            if not sphere:
-                if locations:
-                    yield locations  # unreachable locations
-                break
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-            locations -= sphere
+        model = self.get_current_playthrough_model() or PlaythroughModel(self)
+        for sphere in model.spheres:
+            yield set(sphere)
+        if model.unreachable:
+            yield set()
+            yield set(model.unreachable)
 
     def get_sendable_spheres(self) -> Iterator[Set[Location]]:
         """
@@ -621,6 +639,21 @@ class MultiWorld():
             else:
                 events.add(location)
 
+        # With events collected for free, the state before the n-th sendable sphere holds at least everything of the
+        # first n - 1 spheres of get_spheres, so locations known to be in the first n of those do not need testing,
+        # and ones known to be unreachable can be skipped.
+        model = self.get_current_playthrough_model()
+        sphere_num = 1
+
+        def can_reach(location: Location) -> bool:
+            if model:
+                known = model.sphere_of.get(location)
+                if known is None:
+                    return False
+                if known <= sphere_num:
+                    return True
+            return location.can_reach(state)
+
         while locations:
             sphere: Set[Location] = set()
 
@@ -629,13 +662,13 @@ class MultiWorld():
             while done_events:
                 done_events = set()
                 for event in events:
-                    if event.can_reach(state):
+                    if can_reach(event):
                         state.collect(event.item, True, event)
                         done_events.add(event)
                 events -= done_events
 
             for location in locations:
-                if location.can_reach(state):
+                if can_reach(location):
                     sphere.add(location)
 
             yield sphere
@@ -647,6 +680,7 @@ class MultiWorld():
             for location in sphere:
                 state.collect(location.item, True, location)
             locations -= sphere
+            sphere_num += 1
 
     def fulfills_accessibility(self, state: Optional[CollectionState] = None):
         """Check if accessibility rules are fulfilled with current or supplied state."""
@@ -715,6 +749,249 @@ class MultiWorld():
 PathValue = Tuple[str, Optional["PathValue"]]
 
 
+class DependencyTrackingCounter(Counter):
+    """
+    Counter used as `CollectionState.prog_items` entry for worlds with `World.incremental_reachability`.
+    Records every item name that gets looked up while `reads` is set, and every item name that gets written into
+    `changed`, so reachability only has to be recomputed for what actually depends on a changed item.
+    """
+    reads: Optional[Set[str]]
+    changed: Set[str]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.reads = None
+        self.changed = set()
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, item: str) -> int:
+        if self.reads is not None:
+            self.reads.add(item)
+        return super().__getitem__(item)
+
+    def __contains__(self, item: object) -> bool:
+        if self.reads is not None:
+            self.reads.add(item)
+        return super().__contains__(item)
+
+    def get(self, item: str, default: Any = None) -> Any:
+        if self.reads is not None:
+            self.reads.add(item)
+        return super().get(item, default)
+
+    def __setitem__(self, item: str, count: int) -> None:
+        self.changed.add(item)
+        super().__setitem__(item, count)
+
+    def __delitem__(self, item: str) -> None:
+        self.changed.add(item)
+        super().__delitem__(item)
+
+    def pop(self, item: str, *args: Any) -> Any:
+        self.changed.add(item)
+        return super().pop(item, *args)
+
+    def setdefault(self, item: str, default: int = 0) -> int:
+        self.changed.add(item)
+        return super().setdefault(item, default)
+
+    def clear(self) -> None:
+        self.changed.update(self)
+        super().clear()
+
+    def update(self, iterable: Any = None, /, **kwargs: int) -> None:
+        # Counter.update writes through dict.update when empty, bypassing __setitem__
+        if iterable is not None:
+            if not isinstance(iterable, Mapping):
+                iterable = Counter(iterable)
+            self.changed.update(iterable)
+        self.changed.update(kwargs)
+        super().update(iterable, **kwargs)
+
+    def copy(self) -> DependencyTrackingCounter:
+        ret = DependencyTrackingCounter()
+        dict.update(ret, self)
+        ret.changed = self.changed.copy()
+        return ret
+
+
+class CompactItemCounter(MutableMapping):
+    """
+    Counter-compatible mapping of item name to count, used as `CollectionState.prog_items` entry for worlds with
+    `World.compact_prog_items`. Counts live in an array indexed by `World.item_name_to_index`, so copying is a buffer
+    copy and item groups can be counted through precomputed indices. Names that were not known at registration, such as
+    events, get an index the first time they are written.
+    Unlike Counter, only integer counts can be stored and a count of 0 is the same as the item being absent.
+    """
+    __slots__ = ("index", "counts")
+    index: Dict[str, int]
+    counts: array
+
+    def __init__(self, index: Dict[str, int], iterable: Any = None, /, **kwargs: int) -> None:
+        self.index = index
+        self.counts = array("i", [0]) * len(index)
+        self.update(iterable, **kwargs)
+
+    def __getitem__(self, item: str) -> int:
+        try:
+            return self.counts[self.index[item]]
+        except (KeyError, IndexError):
+            return 0
+
+    def __setitem__(self, item: str, count: int) -> None:
+        index = self.index.get(item)
+        if index is None:
+            index = self.index.setdefault(item, len(self.index))
+        counts = self.counts
+        if index >= len(counts):
+            counts.frombytes(bytes(counts.itemsize * (len(self.index) - len(counts))))
+        counts[index] = count
+
+    def __delitem__(self, item: str) -> None:
+        index = self.index.get(item)
+        if index is not None and index < len(self.counts):
+            self.counts[index] = 0
+
+    def __iter__(self) -> Iterator[str]:
+        # indices are handed out in insertion order, so names and counts line up
+        for name, count in zip(tuple(self.index), self.counts):
+            if count:
+                yield name
+
+    def __len__(self) -> int:
+        return len(self.counts) - self.counts.count(0)
+
+    def __contains__(self, item: object) -> bool:
+        return self[item] != 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+    def get(self, item: str, default: Any = None) -> Any:
+        count = self[item]
+        return count if count else default
+
+    def copy(self) -> CompactItemCounter:
+        ret = CompactItemCounter.__new__(CompactItemCounter)
+        ret.index = self.index
+        ret.counts = self.counts[:]
+        return ret
+
+    def update(self, iterable: Any = None, /, **kwargs: int) -> None:
+        """Adds counts like Counter.update, instead of replacing them like dict.update."""
+        if iterable is not None:
+            if isinstance(iterable, Mapping):
+                for item, count in iterable.items():
+                    self[item] += count
+            else:
+                for item in iterable:
+                    self[item] += 1
+        for item, count in kwargs.items():
+            self[item] += count
+
+    def subtract(self, iterable: Any = None, /, **kwargs: int) -> None:
+        if iterable is not None:
+            if isinstance(iterable, Mapping):
+                for item, count in iterable.items():
+                    self[item] -= count
+            else:
+                for item in iterable:
+                    self[item] -= 1
+        for item, count in kwargs.items():
+            self[item] -= count
+
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        return Counter(self).most_common(n)
+
+    def elements(self) -> Iterator[str]:
+        return Counter(self).elements()
+
+    def count_indices(self, indices: Iterable[int]) -> int:
+        """Sums the counts at indices interned at registration, such as `World.item_name_group_indices`."""
+        return sum(map(self.counts.__getitem__, indices))
+
+    def count_indices_unique(self, indices: Collection[int]) -> int:
+        """Counts the indices interned at registration that have a count of at least 1."""
+        return len(indices) - list(map(self.counts.__getitem__, indices)).count(0)
+
+
+class SweepDependencyIndex:
+    """
+    Maps item and region inputs to the locations of one player's sweep whose rules read them, see
+    `Location.get_rule_dependencies`. Between two passes of a sweep, only the locations whose inputs changed, plus the
+    ones with unknown dependencies, have to be tested again.
+    """
+    __slots__ = ("by_item", "by_region", "always", "watched_players", "item_snapshots", "region_snapshots")
+
+    by_item: Dict[Tuple[int, str], List[Location]]
+    by_region: Dict[Tuple[int, str], List[Location]]
+    always: Set[Location]
+    """Locations with unknown dependencies, which are tested in every pass."""
+    watched_players: Set[int]
+    item_snapshots: Dict[int, Dict[str, int]]
+    region_snapshots: Dict[int, Set[Region]]
+
+    def __init__(self, state: CollectionState, locations: Iterable[Location]) -> None:
+        self.by_item = defaultdict(list)
+        self.by_region = defaultdict(list)
+        self.always = set()
+        watched_players: Set[int] = set()
+        for location in locations:
+            dependencies = location.get_rule_dependencies()
+            if dependencies is None:
+                self.always.add(location)
+                continue
+            item_dependencies, region_dependencies = dependencies
+            for key in item_dependencies:
+                self.by_item[key].append(location)
+                watched_players.add(key[0])
+            for key in region_dependencies:
+                self.by_region[key].append(location)
+                watched_players.add(key[0])
+        self.watched_players = watched_players & state.prog_items.keys()
+        self.item_snapshots = {}
+        self.region_snapshots = {}
+
+    def copy(self) -> SweepDependencyIndex:
+        """Returns an index with its own snapshots, sharing the dependency maps, which do not change after creation."""
+        ret = SweepDependencyIndex.__new__(SweepDependencyIndex)
+        ret.by_item = self.by_item
+        ret.by_region = self.by_region
+        ret.always = self.always
+        ret.watched_players = self.watched_players
+        # snapshot() replaces the per-player snapshots instead of mutating them, so they can be shared
+        ret.item_snapshots = self.item_snapshots.copy()
+        ret.region_snapshots = self.region_snapshots.copy()
+        return ret
+
+    def snapshot(self, state: CollectionState) -> None:
+        """Remembers the inputs the locations were just tested against."""
+        for player in self.watched_players:
+            self.item_snapshots[player] = dict(state.prog_items[player])
+            self.region_snapshots[player] = set(state.reachable_regions[player])
+
+    def get_changed_locations(self, state: CollectionState) -> Set[Location]:
+        """Returns the locations whose inputs changed since the last snapshot, and the ones that always need testing."""
+        changed = set(self.always)
+        by_item = self.by_item
+        by_region = self.by_region
+        for player in self.watched_players:
+            previous = self.item_snapshots[player]
+            current = state.prog_items[player]
+            for name, count in current.items():
+                if previous.get(name) != count and (player, name) in by_item:
+                    changed.update(by_item[player, name])
+            for name in previous.keys() - current.keys():
+                changed.update(by_item.get((player, name), ()))
+            if state.stale[player]:
+                state.update_reachable_regions(player)
+            for region in state.reachable_regions[player] - self.region_snapshots[player]:
+                changed.update(by_region.get((player, region.name), ()))
+        return changed
+
+
 class CollectionState():
     prog_items: Dict[int, Counter[str]]
     multiworld: MultiWorld
@@ -725,12 +1002,31 @@ class CollectionState():
     locations_checked: Set[Location]
     stale: Dict[int, bool]
     allow_partial_entrances: bool
+    incremental_players: AbstractSet[int]
+    """Players using incremental reachability, see `World.incremental_reachability`."""
+    region_dependencies: Dict[int, Dict[Region, Tuple[Entrance, AbstractSet[str]]]]
+    """Per reached Region, the Entrance it was reached through and the item names that Entrance's rule read."""
+    blocked_dependencies: Dict[int, Dict[Entrance, AbstractSet[str]]]
+    """Per blocked Entrance, the item names its rule read when it was last found to be blocked."""
+    shared_players: Set[int]
+    """Players whose per-player structures may still be shared with another state from a copy-on-write copy."""
     additional_init_functions: List[Callable[[CollectionState, MultiWorld], None]] = []
     additional_copy_functions: List[Callable[[CollectionState, CollectionState], CollectionState]] = []
+    additional_lazy_copy_functions: List[Callable[[CollectionState, CollectionState], CollectionState]] = []
+    additional_materialize_functions: List[Callable[[CollectionState, int], None]] = []
 
     def __init__(self, parent: MultiWorld, allow_partial_entrances: bool = False):
         assert parent.worlds, "CollectionState created without worlds initialized in parent"
-        self.prog_items = {player: Counter() for player in parent.get_all_ids()}
+        self.incremental_players = frozenset(
+            player for player in parent.get_all_ids()
+            if parent.worlds[player].incremental_reachability and parent.worlds[player].explicit_indirect_conditions
+        )
+        self.prog_items = {player: DependencyTrackingCounter() if player in self.incremental_players
+                           else CompactItemCounter(parent.worlds[player].item_name_to_index)
+                           if parent.worlds[player].compact_prog_items else Counter()
+                           for player in parent.get_all_ids()}
+        self.region_dependencies = {player: {} for player in self.incremental_players}
+        self.blocked_dependencies = {player: {} for player in self.incremental_players}
         self.multiworld = parent
         self.reachable_regions = {player: set() for player in parent.get_all_ids()}
         self.blocked_connections = {player: set() for player in parent.get_all_ids()}
@@ -739,6 +1035,7 @@ class CollectionState():
         self.locations_checked = set()
         self.stale = {player: True for player in parent.get_all_ids()}
         self.allow_partial_entrances = allow_partial_entrances
+        self.shared_players = set()
         for function in self.additional_init_functions:
             function(self, parent)
         for items in parent.precollected_items.values():
@@ -746,12 +1043,18 @@ class CollectionState():
                 self.collect(item, True)
 
     def update_reachable_regions(self, player: int):
+        if player in self.shared_players:
+            self.materialize(player)
         self.stale[player] = False
         world: AutoWorld.World = self.multiworld.worlds[player]
         reachable_regions = self.reachable_regions[player]
         queue = deque(self.blocked_connections[player])
         start: Region = world.get_region(world.origin_region_name)
 
+        if player in self.incremental_players:
+            self._update_reachable_regions_incremental(player, start)
+            return
+
         # init on first call - this can't be done on construction since the regions don't exist yet
         if start not in reachable_regions:
             reachable_regions.add(start)
@@ -812,7 +1115,123 @@ class CollectionState():
             # sweep for indirect connections, mostly Entrance.can_reach(unrelated_Region)
             queue.extend(blocked_connections)
 
-    def copy(self) -> CollectionState:
+    def _update_reachable_regions_incremental(self, player: int, start: Region):
+        reachable_regions = self.reachable_regions[player]
+        blocked_connections = self.blocked_connections[player]
+        region_dependencies = self.region_dependencies[player]
+        blocked_dependencies = self.blocked_dependencies[player]
+        player_prog_items: DependencyTrackingCounter = self.prog_items[player]
+        changed = player_prog_items.changed
+        player_prog_items.changed = set()
+
+        if start not in reachable_regions:
+            # first call, or the cache was wiped from outside, so nothing recorded can be trusted
+            region_dependencies.clear()
+            blocked_dependencies.clear()
+            reachable_regions.add(start)
+            blocked_connections.update(start.exits)
+            queue = deque(blocked_connections)
+        else:
+            # only retry connections that were never evaluated or that read an item which changed since
+            queue = deque(connection for connection in blocked_connections
+                          if connection not in blocked_dependencies
+                          or not changed.isdisjoint(blocked_dependencies[connection]))
+
+        while queue:
+            connection = queue.popleft()
+            new_region = connection.connected_region
+            if new_region in reachable_regions:
+                blocked_connections.remove(connection)
+                blocked_dependencies.pop(connection, None)
+                continue
+            player_prog_items.reads = reads = set()
+            try:
+                reached = connection.can_reach(self)
+            finally:
+                player_prog_items.reads = None
+            if reached:
+                if self.allow_partial_entrances and not new_region:
+                    continue
+                assert new_region, f"tried to search through an Entrance \"{connection}\" with no connected Region"
+                reachable_regions.add(new_region)
+                region_dependencies[new_region] = (connection, reads)
+                blocked_connections.remove(connection)
+                blocked_dependencies.pop(connection, None)
+                blocked_connections.update(new_region.exits)
+                queue.extend(new_region.exits)
+                self.path[new_region] = (new_region.name, self.path.get(connection, None))
+
+                # Retry connections if the new region can unblock them
+                for new_entrance in self.multiworld.indirect_connections.get(new_region, set()):
+                    if new_entrance in blocked_connections and new_entrance not in queue:
+                        queue.append(new_entrance)
+            else:
+                blocked_dependencies[connection] = reads
+
+    def _invalidate_reachable_regions_incremental(self, player: int) -> None:
+        """
+        Drops only the reached Regions whose reachability depended on an item that changed, plus everything that was
+        reached through them, and re-blocks the Entrances into those Regions so the next update retries them.
+        """
+        reachable_regions = self.reachable_regions[player]
+        blocked_connections = self.blocked_connections[player]
+        region_dependencies = self.region_dependencies[player]
+        blocked_dependencies = self.blocked_dependencies[player]
+        player_prog_items: DependencyTrackingCounter = self.prog_items[player]
+        changed = player_prog_items.changed
+        player_prog_items.changed = set()
+        indirect_connections = self.multiworld.indirect_connections
+
+        invalid: Set[Region] = {region for region, (_, reads) in region_dependencies.items()
+                                if not changed.isdisjoint(reads)}
+        if invalid:
+            # Anything reached through an invalid Region, or through an Entrance whose rule can_reach an invalid
+            # Region, is invalid as well.
+            queue = deque(invalid)
+            while queue:
+                region = queue.popleft()
+                dependent_entrances = set(region.exits)
+                dependent_entrances.update(indirect_connections.get(region, ()))
+                for entrance in dependent_entrances:
+                    target = entrance.connected_region
+                    if target not in invalid and target in region_dependencies \
+                            and region_dependencies[target][0] is entrance:
+                        invalid.add(target)
+                        queue.append(target)
+
+            for region in invalid:
+                reachable_regions.discard(region)
+                del region_dependencies[region]
+                for exit_ in region.exits:
+                    blocked_connections.discard(exit_)
+                    blocked_dependencies.pop(exit_, None)
+            for region in invalid:
+                for entrance in region.entrances:
+                    if entrance.parent_region in reachable_regions:
+                        blocked_connections.add(entrance)
+                        blocked_dependencies.pop(entrance, None)
+            # can_reach on an invalid Region may have been true while evaluating these
+            for region in invalid:
+                for entrance in indirect_connections.get(region, ()):
+                    blocked_dependencies.pop(entrance, None)
+
+        # rules are not required to be monotonic, so blocked connections reading a changed item get retried as well
+        for connection in blocked_connections:
+            reads = blocked_dependencies.get(connection)
+            if reads is not None and not changed.isdisjoint(reads):
+                del blocked_dependencies[connection]
+
+    def copy(self, copy_on_write: bool = False) -> CollectionState:
+        """
+        Returns a copy of this state.
+
+        :param copy_on_write: If True, the copy shares each player's prog_items and region caches with this state until
+         either of them mutates that player through collect, remove, add_item, remove_item, set_item or a reachability
+         update. Anything else writing to the per-player structures of a copy-on-write state must only write values
+         that are a pure function of that player's items, as the write may be visible in the other state.
+        """
+        if copy_on_write:
+            return self._copy_on_write()
         ret = CollectionState(self.multiworld)
         ret.prog_items = {player: counter.copy() for player, counter in self.prog_items.items()}
         ret.reachable_regions = {player: region_set.copy() for player, region_set in
@@ -823,10 +1242,46 @@ class CollectionState():
         ret.path = self.path.copy()
         ret.locations_checked = self.locations_checked.copy()
         ret.allow_partial_entrances = self.allow_partial_entrances
+        ret.region_dependencies = {player: dependencies.copy() for player, dependencies in
+                                   self.region_dependencies.items()}
+        ret.blocked_dependencies = {player: dependencies.copy() for player, dependencies in
+                                    self.blocked_dependencies.items()}
         for function in self.additional_copy_functions:
             ret = function(self, ret)
         return ret
 
+    def _copy_on_write(self) -> CollectionState:
+        ret = CollectionState(self.multiworld)
+        ret.prog_items = self.prog_items.copy()
+        ret.reachable_regions = self.reachable_regions.copy()
+        ret.blocked_connections = self.blocked_connections.copy()
+        ret.region_dependencies = self.region_dependencies.copy()
+        ret.blocked_dependencies = self.blocked_dependencies.copy()
+        # unlike a full copy, the reachability of non-stale players is still valid, as they share the exact same items
+        ret.stale = self.stale.copy()
+        ret.advancements = self.advancements.copy()
+        ret.path = self.path.copy()
+        ret.locations_checked = self.locations_checked.copy()
+        ret.allow_partial_entrances = self.allow_partial_entrances
+        # whichever state mutates a player first has to copy that player's structures
+        ret.shared_players = set(self.prog_items)
+        self.shared_players.update(self.prog_items)
+        for function in self.additional_lazy_copy_functions:
+            ret = function(self, ret)
+        return ret
+
+    def materialize(self, player: int) -> None:
+        """Gives this state its own copy of a player's structures that it still shares from a copy-on-write copy."""
+        self.shared_players.discard(player)
+        self.prog_items[player] = self.prog_items[player].copy()
+        self.reachable_regions[player] = self.reachable_regions[player].copy()
+        self.blocked_connections[player] = self.blocked_connections[player].copy()
+        if player in self.incremental_players:
+            self.region_dependencies[player] = self.region_dependencies[player].copy()
+            self.blocked_dependencies[player] = self.blocked_dependencies[player].copy()
+        for function in self.additional_materialize_functions:
+            function(self, player)
+
     def can_reach(self,
                   spot: Union[Location, Entrance, Region, str],
                   resolution_hint: Optional[str] = None,
@@ -870,6 +1325,12 @@ class CollectionState():
         # under this assumption, an extra sweep iteration is performed that checks every player, to confirm that the
         # sweep is finished.
         checking_if_finished = False
+        # Rules that expose their `item_dependencies` (see worlds.generic.Rules.Rule) and failed, mapped to the counts of
+        # those items at the time, so they are only evaluated again once one of those counts changed.
+        failed_rules: Dict[Any, Tuple[int, ...]] = {}
+        # Players whose world opted into `World.indexed_sweep` only re-test locations whose inputs changed.
+        indexed_players = {player for player in all_players if self.multiworld.worlds[player].indexed_sweep}
+        sweep_indices: Dict[int, SweepDependencyIndex] = {}
         while players_to_check:
             next_advancements_per_player: List[Tuple[int, List[Location]]] = []
             next_players_to_check = set()
@@ -883,8 +1344,22 @@ class CollectionState():
                 # stale whenever one of their own items is collected into the state.
                 reachable_locations: List[Location] = []
                 unreachable_locations: List[Location] = []
+                sweep_index: Optional[SweepDependencyIndex] = None
+                changed_locations: Optional[Set[Location]] = None
+                if player in indexed_players:
+                    sweep_index = sweep_indices.get(player)
+                    if sweep_index is None:
+                        # the first pass tests everything
+                        sweep_index = sweep_indices[player] = SweepDependencyIndex(self, locations)
+                    else:
+                        changed_locations = sweep_index.get_changed_locations(self)
+                # Locations sharing a rule only evaluate it once per pass, as nothing is collected during this loop.
+                rule_results: Dict[Any, bool] = {}
                 for location in locations:
-                    if location.can_reach(self):
+                    if changed_locations is not None and location not in changed_locations:
+                        # none of its inputs changed since it was last found unreachable
+                        unreachable_locations.append(location)
+                    elif self._can_reach_location_batched(location, rule_results, failed_rules):
                         # Locations containing items that do not belong to `player` could be collected immediately
                         # because they won't stale `player`'s region accessibility cache, but, for simplicity, all the
                         # items at reachable locations are collected in a single loop.
@@ -893,6 +1368,8 @@ class CollectionState():
                         unreachable_locations.append(location)
                 if unreachable_locations:
                     next_advancements_per_player.append((player, unreachable_locations))
+                if sweep_index:
+                    sweep_index.snapshot(self)
 
                 # A previous player's locations processed in the current `while players_to_check` iteration could have
                 # collected items belonging to `player`, but now that all of `player`'s reachable locations have been
@@ -930,6 +1407,29 @@ class CollectionState():
             if yield_each_sweep:
                 yield
 
+    def _can_reach_location_batched(self, location: Location, rule_results: Dict[Any, bool],
+                                    failed_rules: Dict[Any, Tuple[int, ...]]) -> bool:
+        """Location.can_reach, reusing results of rules with known item dependencies within a sweep."""
+        rule = location.access_rule
+        dependencies = getattr(rule, "item_dependencies", None)
+        if dependencies is None or type(location).can_reach is not Location.can_reach:
+            return location.can_reach(self)
+        assert location.parent_region, f"called can_reach on a Location \"{location}\" with no parent_region"
+        if not location.parent_region.can_reach(self):
+            return False
+        result = rule_results.get(rule)
+        if result is None:
+            prog_items = self.prog_items
+            counts = tuple([prog_items[player][item] for player, item in dependencies])
+            if failed_rules.get(rule) == counts:
+                result = False
+            else:
+                result = rule(self)
+                if not result:
+                    failed_rules[rule] = counts
+            rule_results[rule] = result
+        return result
+
     @overload
     def sweep_for_advancements(self, locations: Optional[Iterable[Location]] = None, *,
                                yield_each_sweep: Literal[True],
@@ -1068,8 +1568,11 @@ class CollectionState():
     # item name group related
     def has_group(self, item_name_group: str, player: int, count: int = 1) -> bool:
         """Returns True if the state contains at least `count` items present in a specified item group."""
-        found: int = 0
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is CompactItemCounter:
+            indices = self.multiworld.worlds[player].item_name_group_indices[item_name_group]
+            return player_prog_items.count_indices(indices) >= count
+        found: int = 0
         for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]:
             found += player_prog_items[item_name]
             if found >= count:
@@ -1080,8 +1583,11 @@ class CollectionState():
         """Returns True if the state contains at least `count` items present in a specified item group.
         Ignores duplicates of the same item.
         """
-        found: int = 0
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is CompactItemCounter:
+            indices = self.multiworld.worlds[player].item_name_group_indices[item_name_group]
+            return player_prog_items.count_indices_unique(indices) >= count
+        found: int = 0
         for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]:
             found += player_prog_items[item_name] > 0
             if found >= count:
@@ -1091,6 +1597,9 @@ class CollectionState():
     def count_group(self, item_name_group: str, player: int) -> int:
         """Returns the cumulative count of items from an item group present in state."""
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is CompactItemCounter:
+            indices = self.multiworld.worlds[player].item_name_group_indices[item_name_group]
+            return player_prog_items.count_indices(indices)
         return sum(
             player_prog_items[item_name]
             for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]
@@ -1100,6 +1609,9 @@ class CollectionState():
         """Returns the cumulative count of items from an item group present in state.
         Ignores duplicates of the same item."""
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is CompactItemCounter:
+            indices = self.multiworld.worlds[player].item_name_group_indices[item_name_group]
+            return player_prog_items.count_indices_unique(indices)
         return sum(
             player_prog_items[item_name] > 0
             for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]
@@ -1110,6 +1622,8 @@ class CollectionState():
         if location:
             self.locations_checked.add(location)
 
+        if item.player in self.shared_players:
+            self.materialize(item.player)
         changed = self.multiworld.worlds[item.player].collect(self, item)
 
         self.stale[item.player] = True
@@ -1128,11 +1642,19 @@ class CollectionState():
         :param count: How many of the item to add.
         """
         assert count > 0
+        if player in self.shared_players:
+            self.materialize(player)
         self.prog_items[player][item] += count
 
     def remove(self, item: Item):
+        if item.player in self.shared_players:
+            self.materialize(item.player)
         changed = self.multiworld.worlds[item.player].remove(self, item)
-        if changed:
+        if changed and item.player in self.incremental_players:
+            # only invalidate what depended on the removed item
+            self._invalidate_reachable_regions_incremental(item.player)
+            self.stale[item.player] = True
+        elif changed:
             # invalidate caches, nothing can be trusted anymore now
             self.reachable_regions[item.player] = set()
             self.blocked_connections[item.player] = set()
@@ -1147,6 +1669,8 @@ class CollectionState():
         :param count: How many of the item to remove.
         """
         assert count > 0
+        if player in self.shared_players:
+            self.materialize(player)
         self.prog_items[player][item] -= count
         if self.prog_items[player][item] < 1:
             del (self.prog_items[player][item])
@@ -1160,6 +1684,8 @@ class CollectionState():
         :param count: How many of the item to now have.
         """
         assert count >= 0
+        if player in self.shared_players:
+            self.materialize(player)
         if count == 0:
             del (self.prog_items[player][item])
         else:
@@ -1475,6 +2001,7 @@ class Location:
     access_rule: Callable[[CollectionState], bool] = staticmethod(lambda state: True)
     item_rule: Callable[[Item], bool] = staticmethod(lambda item: True)
     item: Optional[Item] = None
+    _rule_dependencies: Optional[Tuple[Callable[[CollectionState], bool], Optional[RuleDependencies]]] = None
 
     def __init__(self, player: int, name: str = '', address: Optional[int] = None, parent: Optional[Region] = None):
         self.player = player
@@ -1482,6 +2009,31 @@ class Location:
         self.address = address
         self.parent_region = parent
 
+    def get_rule_dependencies(self) -> Optional[RuleDependencies]:
+        """
+        Returns the (player, item name)s and (player, region name)s, including the parent region, that decide whether
+        this Location can be reached, or None if that is unknown.
+        Access rules declare them through their own `get_rule_dependencies()`, like the rules in worlds.generic.Rules;
+        plain callables are unknown. The result is cached until the access rule changes.
+        """
+        rule = self.access_rule
+        cached = self._rule_dependencies
+        if cached is not None and cached[0] is rule:
+            return cached[1]
+        dependencies: Optional[RuleDependencies] = None
+        if (type(self).can_reach is Location.can_reach and self.parent_region
+                and type(self.parent_region).can_reach is Region.can_reach):
+            if rule is Location.access_rule:
+                rule_dependencies: Optional[RuleDependencies] = (frozenset(), frozenset())
+            else:
+                get_rule_dependencies = getattr(rule, "get_rule_dependencies", None)
+                rule_dependencies = get_rule_dependencies() if get_rule_dependencies else None
+            if rule_dependencies is not None:
+                dependencies = (rule_dependencies[0],
+                                rule_dependencies[1] | {(self.parent_region.player, self.parent_region.name)})
+        self._rule_dependencies = rule, dependencies
+        return dependencies
+
     def can_fill(self, state: CollectionState, item: Item, check_access: bool = True) -> bool:
         return ((
             self.always_allow(state, item)
@@ -1503,6 +2055,8 @@ class Location:
         self.item = item
         item.location = self
         self.locked = True
+        if self.parent_region and self.parent_region.multiworld:
+            self.parent_region.multiworld.playthrough_model = None
 
     def __repr__(self):
         multiworld = self.parent_region.multiworld if self.parent_region and self.parent_region.multiworld else None
@@ -1663,6 +2217,52 @@ class EntranceInfo(TypedDict, total=False):
     direction: str
 
 
+class PlaythroughModel:
+    """
+    The logical spheres of all filled locations of a MultiWorld, found by collecting every reachable location's item,
+    sphere by sphere, from the starting state. See `MultiWorld.get_playthrough_model`.
+    """
+    spheres: List[Set[Location]]
+    """the locations reached in each sphere, in collection order"""
+    sphere_of: Dict[Location, int]
+    """the number of the sphere each reachable location is in, starting at 1"""
+    unreachable: Set[Location]
+    non_advancement_logic: bool
+    """whether collecting a non-advancement item changed a state, which the playthrough does not collect"""
+    placements: Dict[Location, Item]
+    """the item of each filled location the spheres were found for"""
+
+    def __init__(self, multiworld: MultiWorld) -> None:
+        self.spheres = []
+        self.sphere_of = {}
+        self.non_advancement_logic = False
+        state = CollectionState(multiworld)
+        locations = set(multiworld.get_filled_locations())
+        self.placements = {location: location.item for location in locations}
+
+        while locations:
+            sphere = {location for location in locations if location.can_reach(state)}
+            if not sphere:
+                break
+            self.spheres.append(sphere)
+            for location in sphere:
+                self.sphere_of[location] = len(self.spheres)
+                if state.collect(location.item, True, location) and not location.item.advancement:
+                    self.non_advancement_logic = True
+            locations -= sphere
+        self.unreachable = locations
+
+    def matches(self, multiworld: MultiWorld) -> bool:
+        """Whether the placements of multiworld are still the ones the spheres were found for."""
+        filled = 0
+        for location in multiworld.get_locations():
+            if location.item:
+                if self.placements.get(location) is not location.item:
+                    return False
+                filled += 1
+        return filled == len(self.placements)
+
+
 class Spoiler:
     multiworld: MultiWorld
     hashes: Dict[int, str]
@@ -1697,13 +2297,21 @@ class Spoiler:
         collection_spheres: List[Set[Location]] = []
         state = CollectionState(multiworld)
         sphere_candidates = set(prog_locations)
+        # When the spheres are already known, the progress items' spheres are the same, unless collecting other items
+        # made a difference.
+        model = multiworld.get_current_playthrough_model()
+        known_spheres = iter(model.spheres) if model and not model.non_advancement_logic else None
         logging.debug('Building up collection spheres.')
         while sphere_candidates:
 
             # build up spheres of collection radius.
             # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
 
-            sphere = {location for location in sphere_candidates if state.can_reach(location)}
+            if known_spheres:
+                known_sphere = next(known_spheres, set())
+                sphere = {location for location in sphere_candidates if location in known_sphere}
+            else:
+                sphere = {location for location in sphere_candidates if state.can_reach(location)}
 
             for location in sphere:
                 state.collect(location.item, True, location)
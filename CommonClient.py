@@ -22,8 +22,9 @@ if __name__ == "__main__":
     Utils.init_logging("TextClient", exception_logger="Client")
 
 from MultiServer import CommandProcessor, mark_raw
-from NetUtils import (Endpoint, decode, NetworkItem, encode, JSONtoTextParser, ClientStatus, Permission, NetworkSlot,
-                      RawJSONtoTextParser, add_json_text, add_json_location, add_json_item, JSONTypes, HintStatus, SlotType)
+from NetUtils import (Endpoint, decode_frame, NetworkItem, encode, JSONtoTextParser, ClientStatus, Permission,
+                      NetworkSlot, RawJSONtoTextParser, add_json_text, add_json_location, add_json_item, JSONTypes,
+                      HintStatus, SlotType, binary_protocol_tag)
 from Utils import Version, stream_input, async_start
 from worlds import network_data_package, AutoWorldRegister
 import os
@@ -246,7 +247,7 @@ class ClientCommandProcessor(CommandProcessor):
 
 class CommonContext:
     # The following attributes are used to Connect and should be adjusted as needed in subclasses
-    tags: typing.Set[str] = {"AP"}
+    tags: typing.Set[str] = {"AP", binary_protocol_tag}
     game: typing.Optional[str] = None
     items_handling: typing.Optional[int] = None
     want_slot_data: bool = True  # should slot_data be retrieved via Connect
@@ -892,7 +893,7 @@ async def server_loop(ctx: CommonContext, address: typing.Optional[str] = None)
         ctx.current_reconnect_delay = ctx.starting_reconnect_delay
         ctx.disconnected_intentionally = False
         async for data in ctx.server.socket:
-            for msg in decode(data):
+            for msg in decode_frame(data):
                 await process_server_cmd(ctx, msg)
         logger.warning(f"Disconnected from multiworld server{reconnect_hint()}")
     except websockets.InvalidMessage:
@@ -4,7 +4,8 @@ import logging
 import typing
 from collections import Counter, deque
 
-from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock
+from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock, \
+    SweepDependencyIndex
 from Options import Accessibility
 
 from worlds.AutoWorld import call_all
@@ -26,13 +27,191 @@ def _log_fill_progress(name: str, placed: int, total_items: int) -> None:
 
 def sweep_from_pool(base_state: CollectionState, itempool: typing.Sequence[Item] = tuple(),
                     locations: typing.Optional[typing.List[Location]] = None) -> CollectionState:
-    new_state = base_state.copy()
+    new_state = base_state.copy(copy_on_write=True)
     for item in itempool:
         new_state.collect(item, True)
     new_state.sweep_for_advancements(locations=locations)
     return new_state
 
 
+class _FillLocationIndex:
+    """
+    Finds the spot for an item in `fill_restrictive` without rescanning every remaining location for every item.
+
+    Remaining locations are bucketed by player for single player placement. For each exploration state, every
+    location's reachability is checked at most once: unreachable ones are dropped from that state's candidates, so
+    following items only look at viable locations. Item rule results are shared between locations using the same
+    item rule, and locations with the default rules accept any item without a call.
+    Locations that may be filled regardless of reachability (`always_allow` or an overridden `can_fill`) are always
+    checked through `Location.can_fill`. The spot returned is always the first fitting location in the order of
+    `locations`, the same a linear scan over it finds.
+    """
+    locations: typing.List[Location]
+    single_player_placement: bool
+    remaining: typing.Dict[typing.Optional[int], typing.List[Location]]
+    """remaining locations in order, by player for single player placement, else under None"""
+    state: typing.Optional[CollectionState] = None
+    viable: typing.Dict[typing.Optional[int], typing.List[Location]]
+    """remaining locations not yet known to be unreachable in `state`"""
+    checked: typing.Dict[typing.Optional[int], int]
+    """length of the start of `viable` that is known to be reachable in `state` or filled through `can_fill`"""
+
+    def __init__(self, locations: typing.List[Location], single_player_placement: bool) -> None:
+        self.locations = locations
+        self.single_player_placement = single_player_placement
+        self.remaining = {}
+        if single_player_placement:
+            for location in locations:
+                self.remaining.setdefault(location.player, []).append(location)
+        else:
+            self.remaining[None] = locations
+        self.viable = {}
+        self.checked = {}
+
+    def find_spot(self, state: CollectionState, item: Item, check_access: bool) -> typing.Optional[Location]:
+        key = item.player if self.single_player_placement else None
+        remaining = self.remaining.get(key, [])
+        if not check_access:
+            for location in remaining:
+                if location.can_fill(state, item, False):
+                    return location
+            return None
+
+        if state is not self.state:
+            self.state = state
+            self.viable = {}
+            self.checked = {}
+        viable = self.viable.get(key)
+        if viable is None:
+            viable = self.viable[key] = remaining.copy()
+            self.checked[key] = 0
+        checked = self.checked[key]
+
+        important = item.advancement or item.useful
+        # id of item rule -> (item rule, result); holding the rule keeps its id from being reused during this search
+        rule_results: typing.Dict[int, typing.Tuple[typing.Callable[[Item], bool], bool]] = {}
+
+        def fits_reachable(location: Location) -> bool:
+            if important and location.progress_type == LocationProgressType.EXCLUDED:
+                return False
+            item_rule = location.item_rule
+            if item_rule is Location.item_rule:
+                return True
+            cached = rule_results.get(id(item_rule))
+            if cached is None:
+                cached = rule_results[id(item_rule)] = item_rule, bool(item_rule(item))
+            return cached[1]
+
+        for index in range(checked):
+            location = viable[index]
+            if (location.can_fill(state, item, True) if _fills_regardless_of_reach(location)
+                    else fits_reachable(location)):
+                return location
+
+        # check reachability of the rest, moving the viable ones to the checked start of the list
+        write = checked
+        for read in range(checked, len(viable)):
+            location = viable[read]
+            regardless_of_reach = _fills_regardless_of_reach(location)
+            if regardless_of_reach or location.can_reach(state):
+                viable[write] = location
+                write += 1
+                if (location.can_fill(state, item, True) if regardless_of_reach
+                        else fits_reachable(location)):
+                    del viable[write:read + 1]
+                    self.checked[key] = write
+                    return location
+        del viable[write:]
+        self.checked[key] = write
+        return None
+
+    def remove(self, location: Location) -> None:
+        """Removes a location that got filled."""
+        key = location.player if self.single_player_placement else None
+        if self.single_player_placement:
+            self.remaining[key].remove(location)
+        self.locations.remove(location)
+        viable = self.viable.get(key)
+        if viable is not None:
+            for index, viable_location in enumerate(viable):
+                if viable_location is location:
+                    del viable[index]
+                    if index < self.checked[key]:
+                        self.checked[key] -= 1
+                    break
+
+
+def _fills_regardless_of_reach(location: Location) -> bool:
+    return location.always_allow is not Location.always_allow or type(location).can_fill is not Location.can_fill
+
+
+class _ExplorationStateTracker:
+    """
+    Produces the state `fill_restrictive` places against, the same as `sweep_from_pool` from the base state with the
+    remaining pool would, without collecting the whole pool and sweeping every location from scratch each round.
+
+    The base state with the pool collected is kept, and items are removed from or collected into it as they leave or
+    return to the pool. Each round first sweeps only the locations the previous round's state collected plus the ones
+    placed since, which is usually nearly everything that will be collected. A single pass over the other filled
+    locations then confirms that nothing else became reachable, or the sweep is finished over all of them.
+    Every `full_rebuild_interval` rounds, the pool state is rebuilt from scratch as a safety net.
+    """
+    full_rebuild_interval: typing.ClassVar[int] = 32
+
+    multiworld: MultiWorld
+    base_state: CollectionState
+    pool_state: typing.Optional[CollectionState] = None
+    """base state with the current pool collected, not swept"""
+    last_state: typing.Optional[CollectionState] = None
+    placed_locations: typing.List[Location]
+    """locations filled since the last sweep"""
+    rounds: int = 0
+
+    def __init__(self, multiworld: MultiWorld, base_state: CollectionState) -> None:
+        self.multiworld = multiworld
+        self.base_state = base_state
+        self.placed_locations = []
+
+    def take(self, item: Item) -> None:
+        """An item left the pool."""
+        if self.pool_state is not None:
+            self.pool_state.remove(item)
+
+    def give(self, item: Item) -> None:
+        """An item returned to the pool."""
+        if self.pool_state is not None:
+            self.pool_state.collect(item, True)
+
+    def placed(self, location: Location) -> None:
+        self.placed_locations.append(location)
+
+    def sweep(self, item_pool: typing.Iterable[Item], unplaced_items: typing.Iterable[Item],
+              player: typing.Optional[int] = None) -> CollectionState:
+        """
+        Returns the base state with `item_pool` and `unplaced_items` collected and swept.
+
+        :param player: only sweep the filled locations of this player
+        """
+        self.rounds += 1
+        if self.pool_state is None or not self.rounds % self.full_rebuild_interval:
+            self.pool_state = self.base_state.copy(copy_on_write=True)
+            for item in itertools.chain(item_pool, unplaced_items):
+                self.pool_state.collect(item, True)
+        state = self.pool_state.copy(copy_on_write=True)
+        locations = self.multiworld.get_filled_locations(player)
+        if self.last_state is not None:
+            candidates = self.last_state.advancements.union(self.placed_locations)
+            state.sweep_for_advancements([location for location in locations if location in candidates])
+            if any(location.advancement and location not in state.advancements and location.can_reach(state)
+                   for location in locations):
+                state.sweep_for_advancements(locations)
+        else:
+            state.sweep_for_advancements(locations)
+        self.last_state = state
+        self.placed_locations = []
+        return state
+
+
 def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locations: typing.List[Location],
                      item_pool: typing.List[Item], single_player_placement: bool = False, lock: bool = False,
                      swap: bool = True, on_place: typing.Optional[typing.Callable[[Location], None]] = None,
@@ -59,6 +238,9 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     for item in item_pool:
         reachable_items.setdefault(item.player, deque()).append(item)
 
+    location_index = _FillLocationIndex(locations, single_player_placement)
+    exploration = _ExplorationStateTracker(multiworld, base_state)
+
     # for progress logging
     total = min(len(item_pool), len(locations))
     placed = 0
@@ -80,11 +262,11 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             for p, pool_item in enumerate(reversed(item_pool), start=1):
                 if pool_item is item:
                     del item_pool[-p]
+                    exploration.take(item)
                     break
 
-        maximum_exploration_state = sweep_from_pool(
-            base_state, item_pool + unplaced_items, multiworld.get_filled_locations(item.player)
-            if single_player_placement else None)
+        maximum_exploration_state = exploration.sweep(item_pool, unplaced_items,
+                                                      item.player if single_player_placement else None)
 
         has_beaten_game = multiworld.has_beaten_game(maximum_exploration_state)
 
@@ -92,11 +274,11 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             # if we have run out of locations to fill,break out of this loop
             if not locations:
                 unplaced_items += items_to_place
+                for unplaced_item in items_to_place:
+                    exploration.give(unplaced_item)
                 break
             item_to_place = items_to_place.pop(0)
 
-            spot_to_fill: typing.Optional[Location] = None
-
             # if minimal accessibility, only check whether location is reachable if game not beatable
             if multiworld.worlds[item_to_place.player].options.accessibility == Accessibility.option_minimal:
                 perform_access_check = not multiworld.has_beaten_game(maximum_exploration_state,
@@ -105,14 +287,10 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             else:
                 perform_access_check = True
 
-            for i, location in enumerate(locations):
-                if (not single_player_placement or location.player == item_to_place.player) \
-                        and location.can_fill(maximum_exploration_state, item_to_place, perform_access_check):
-                    # popping by index is faster than removing by content,
-                    spot_to_fill = locations.pop(i)
-                    # skipping a scan for the element
-                    break
-
+            spot_to_fill: typing.Optional[Location] = location_index.find_spot(
+                maximum_exploration_state, item_to_place, perform_access_check)
+            if spot_to_fill is not None:
+                location_index.remove(spot_to_fill)
             else:
                 # we filled all reachable spots.
                 if swap:
@@ -176,6 +354,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                             reachable_items[placed_item.player].appendleft(
                                 placed_item)
                             item_pool.append(placed_item)
+                            exploration.give(placed_item)
 
                             # cleanup at the end to hopefully get better errors
                             cleanup_required = True
@@ -189,11 +368,14 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                     if spot_to_fill is None:
                         # Can't place this item, move on to the next
                         unplaced_items.append(item_to_place)
+                        exploration.give(item_to_place)
                         continue
                 else:
                     unplaced_items.append(item_to_place)
+                    exploration.give(item_to_place)
                     continue
             multiworld.push_item(spot_to_fill, item_to_place, False)
+            exploration.placed(spot_to_fill)
             spot_to_fill.locked = lock
             placements.append(spot_to_fill)
             placed += 1
@@ -724,6 +906,60 @@ def flood_items(multiworld: MultiWorld) -> None:
                 break
 
 
+class _SphereSearch:
+    """
+    Finds the successive spheres of a set of locations against a state that only gains items, like
+    `MultiWorld.get_spheres`, for `balance_multiworld_progression`.
+
+    Locations of worlds using `World.indexed_sweep` are only tested again once one of their rule inputs changed since
+    they were last found unreachable, see `SweepDependencyIndex`. All other locations are tested for every sphere.
+    """
+    unchecked: typing.Set[Location]
+    untracked: typing.Set[Location]
+    """unchecked locations without a dependency index, tested every time"""
+    index: typing.Optional[SweepDependencyIndex] = None
+    tested: bool = False
+
+    def __init__(self, state: CollectionState, locations: typing.Iterable[Location]) -> None:
+        self.unchecked = set(locations)
+        worlds = state.multiworld.worlds
+        indexed = [location for location in self.unchecked if worlds[location.player].indexed_sweep]
+        if indexed:
+            self.index = SweepDependencyIndex(state, indexed)
+            self.untracked = self.unchecked.difference(indexed)
+        else:
+            self.untracked = self.unchecked
+
+    def copy(self) -> "_SphereSearch":
+        ret = _SphereSearch.__new__(_SphereSearch)
+        ret.unchecked = self.unchecked.copy()
+        if self.index:
+            ret.index = self.index.copy()
+            ret.untracked = self.untracked.copy()
+        else:
+            ret.untracked = ret.unchecked
+        ret.tested = self.tested
+        return ret
+
+    def next_sphere(self, state: CollectionState) -> typing.Set[Location]:
+        """Returns the unchecked locations reachable in `state`, which count as checked from now on."""
+        if self.index and self.tested:
+            candidates = self.untracked.union(self.index.get_changed_locations(state) & self.unchecked)
+        else:
+            candidates = self.unchecked
+        sphere = {location for location in candidates if location.can_reach(state)}
+        self.unchecked -= sphere
+        if self.index:
+            self.untracked -= sphere
+            self.index.snapshot(state)
+        self.tested = True
+        return sphere
+
+    def remove(self, location: Location) -> None:
+        self.unchecked.remove(location)
+        self.untracked.discard(location)
+
+
 def balance_multiworld_progression(multiworld: MultiWorld) -> None:
     # A system to reduce situations where players have no checks remaining, popularly known as "BK mode."
     # Overall progression balancing algorithm:
@@ -743,7 +979,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
         logging.debug(balanceable_players)
         state: CollectionState = CollectionState(multiworld)
         checked_locations: typing.Set[Location] = set()
-        unchecked_locations: typing.Set[Location] = set(multiworld.get_locations())
+        sphere_search = _SphereSearch(state, multiworld.get_locations())
 
         total_locations_count: typing.Counter[int] = Counter(
             location.player
@@ -778,9 +1014,8 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
             # Gather non-locked locations.
             # This ensures that only shuffled locations get counted for progression balancing,
             #   i.e. the items the players will be checking.
-            sphere_locations = get_sphere_locations(state, unchecked_locations)
+            sphere_locations = sphere_search.next_sphere(state)
             for location in sphere_locations:
-                unchecked_locations.remove(location)
                 if not location.locked:
                     reachable_locations_count[location.player] += 1
 
@@ -808,8 +1043,8 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         and item_percentage(player, reachables) < threshold_percentages[player])
                 }
                 if balancing_players:
-                    balancing_state = state.copy()
-                    balancing_unchecked_locations = unchecked_locations.copy()
+                    balancing_state = state.copy(copy_on_write=True)
+                    balancing_search = sphere_search.copy()
                     balancing_reachables = reachable_locations_count.copy()
                     balancing_sphere = sphere_locations.copy()
                     candidate_items: typing.Dict[int, typing.Set[Location]] = collections.defaultdict(set)
@@ -826,9 +1061,8 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                                         location.progress_type != LocationProgressType.PRIORITY):
                                     candidate_items[player].add(location)
                                     logging.debug(f"Candidate item: {location.name}, {location.item.name}")
-                        balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
+                        balancing_sphere = balancing_search.next_sphere(balancing_state)
                         for location in balancing_sphere:
-                            balancing_unchecked_locations.remove(location)
                             if not location.locked:
                                 balancing_reachables[location.player] += 1
                         if multiworld.has_beaten_game(balancing_state) or all(
@@ -840,8 +1074,8 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                             raise RuntimeError("Not all required items reachable. Something went terribly wrong here.")
                     # Gather a set of locations which we can swap items into
                     unlocked_locations: typing.Dict[int, typing.Set[Location]] = collections.defaultdict(set)
-                    for l in unchecked_locations:
-                        if l not in balancing_unchecked_locations:
+                    for l in sphere_search.unchecked:
+                        if l not in balancing_search.unchecked:
                             unlocked_locations[l.player].add(l)
                     items_to_replace: typing.List[Location] = []
                     for player in balancing_players:
@@ -849,25 +1083,31 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         items_to_test = list(candidate_items[player])
                         items_to_test.sort()
                         multiworld.random.shuffle(items_to_test)
+                        # Each test collects the candidates that are still kept, except the one being tested. Those are
+                        # kept in their own state, so a test is a cheap copy-on-write copy and a single removal, and a
+                        # candidate that turns out not to be needed is only removed from the kept state.
+                        kept_state = state.copy(copy_on_write=True)
+                        for location in items_to_test:
+                            kept_state.collect(location.item, True, location)
                         while items_to_test:
                             testing = items_to_test.pop()
-                            reducing_state = state.copy()
-                            for location in itertools.chain((
-                                    l for l in items_to_replace
-                                    if l.item.player == player
-                            ), items_to_test):
-                                reducing_state.collect(location.item, True, location)
+                            reducing_state = kept_state.copy(copy_on_write=True)
+                            reducing_state.remove(testing.item)
+                            reducing_state.locations_checked.discard(testing)
 
                             reducing_state.sweep_for_advancements(locations=locations_to_test)
 
                             if multiworld.has_beaten_game(balancing_state):
-                                if not multiworld.has_beaten_game(reducing_state):
-                                    items_to_replace.append(testing)
+                                needed = not multiworld.has_beaten_game(reducing_state)
                             else:
                                 reduced_sphere = get_sphere_locations(reducing_state, locations_to_test)
                                 p = item_percentage(player, reachable_locations_count[player] + len(reduced_sphere))
-                                if p < threshold_percentages[player]:
-                                    items_to_replace.append(testing)
+                                needed = p < threshold_percentages[player]
+                            if needed:
+                                items_to_replace.append(testing)
+                            else:
+                                kept_state.remove(testing.item)
+                                kept_state.locations_checked.discard(testing)
 
                     old_moved_item_count = moved_item_count
 
@@ -898,7 +1138,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         logging.debug(f"Moved {moved_item_count} items so far\n")
                         unlocked = {fresh for player in balancing_players for fresh in unlocked_locations[player]}
                         for location in get_sphere_locations(state, unlocked):
-                            unchecked_locations.remove(location)
+                            sphere_search.remove(location)
                             if not location.locked:
                                 reachable_locations_count[location.player] += 1
                             sphere_locations.add(location)
@@ -925,6 +1165,9 @@ def swap_location_item(location_1: Location, location_2: Location, check_locked:
     location_2.item, location_1.item = location_1.item, location_2.item
     location_1.item.location = location_1
     location_2.item.location = location_2
+    for location in (location_1, location_2):
+        if location.parent_region:
+            location.parent_region.multiworld.playthrough_model = None
 
 
 def parse_planned_blocks(multiworld: MultiWorld) -> dict[int, list[PlandoItemBlock]]:
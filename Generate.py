@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import contextlib
 import copy
 import logging
 import os
@@ -10,8 +12,8 @@ import sys
 import urllib.parse
 import urllib.request
 from collections import Counter
-from itertools import chain
-from typing import Any
+from itertools import chain, repeat
+from typing import Any, Callable, Iterator
 
 import ModuleUpdate
 
@@ -54,6 +56,8 @@ def mystery_argparse():
     parser.add_argument("--skip_output", action="store_true",
                         help="Skips generation assertion and output stages and skips multidata and spoiler output. "
                              "Intended for debugging and testing purposes.")
+    parser.add_argument("--roll_processes", type=lambda value: max(int(value), 1), default=defaults.roll_processes,
+                        help="Number of processes that read the player yaml files and roll their options.")
     parser.add_argument("--spoiler_only", action="store_true",
                         help="Skips generation assertion and multidata, outputting only a spoiler log. "
                              "Intended for debugging and testing purposes.")
@@ -95,6 +99,9 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
         logging.info("Race mode enabled. Using non-deterministic random source.")
         random.seed()  # reset to time-based random source
 
+    # every slot rolls its options from its own seed, so it doesn't matter in which process or order they are rolled
+    roll_seed = random.getrandbits(64)
+
     weights_cache: dict[str, tuple[Any, ...]] = {}
     if args.weights_file_path and os.path.exists(args.weights_file_path):
         try:
@@ -122,20 +129,21 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
 
     player_id = 1
     player_files = {}
-    for file in os.scandir(args.player_files_path):
-        fname = file.name
-        if file.is_file() and not fname.startswith(".") and not fname.lower().endswith(".ini") and \
-                os.path.join(args.player_files_path, fname) not in {args.meta_file_path, args.weights_file_path}:
-            path = os.path.join(args.player_files_path, fname)
+    fnames = [file.name for file in os.scandir(args.player_files_path)
+              if file.is_file() and not file.name.startswith(".") and not file.name.lower().endswith(".ini") and
+              os.path.join(args.player_files_path, file.name) not in {args.meta_file_path, args.weights_file_path}]
+    with pooled_map(args.roll_processes) as map_jobs:
+        yamls = map_jobs(read_weights_yamls, [os.path.join(args.player_files_path, fname) for fname in fnames])
+        for fname in fnames:
             try:
                 weights_for_file = []
-                for doc_idx, yaml in enumerate(read_weights_yamls(path)):
+                for doc_idx, yaml in enumerate(next(yamls)):
                     if yaml is None:
                         logging.warning(f"Ignoring empty yaml document #{doc_idx + 1} in {fname}")
                     else:
                         weights_for_file.append(yaml)
                 weights_cache[fname] = tuple(weights_for_file)
-                        
+
             except Exception as e:
                 raise ValueError(f"File {fname} is invalid. Please fix your yaml.") from e
 
@@ -180,10 +188,6 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
     erargs.name = {}
     erargs.csv_output = args.csv_output
 
-    settings_cache: dict[str, tuple[argparse.Namespace, ...]] = \
-        {fname: (tuple(roll_settings(yaml, args.plando) for yaml in yamls) if args.sameoptions else None)
-         for fname, yamls in weights_cache.items()}
-
     if meta_weights:
         for category_name, category_dict in meta_weights.items():
             for key in category_dict:
@@ -207,38 +211,56 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
     name_counter = Counter()
     erargs.player_options = {}
 
+    # the yaml document each player rolls from, every document of a file going to consecutive players
+    player_documents: dict[int, tuple[str, int]] = {}
     player = 1
     while player <= args.multi:
         path = player_path_cache[player]
-        if path:
+        if not path:
+            raise RuntimeError(f'No weights specified for player {player}')
+        for doc_idx in range(len(weights_cache[path])):
+            player_documents[player] = path, doc_idx
+            player += 1
+
+    if args.sameoptions:
+        # every document is rolled once, and shared by all players using it
+        rolls = {document: document for document in player_documents.values()}
+    else:
+        rolls = player_documents
+    with pooled_map(args.roll_processes) as map_jobs:
+        rolled_settings = map_jobs(roll_settings_seeded,
+                                   [weights_cache[path][doc_idx] for path, doc_idx in rolls.values()],
+                                   repeat(args.plando), [f"{roll_seed}-{index}" for index in range(len(rolls))])
+        settings_cache: dict[Any, argparse.Namespace] = {}
+        for key, (path, _) in rolls.items():
             try:
-                settings: tuple[argparse.Namespace, ...] = settings_cache[path] if settings_cache[path] else \
-                    tuple(roll_settings(yaml, args.plando) for yaml in weights_cache[path])
-                for settingsObject in settings:
-                    for k, v in vars(settingsObject).items():
-                        if v is not None:
-                            try:
-                                getattr(erargs, k)[player] = v
-                            except AttributeError:
-                                setattr(erargs, k, {player: v})
-                            except Exception as e:
-                                raise Exception(f"Error setting {k} to {v} for player {player}") from e
-
-                    # name was not specified
-                    if player not in erargs.name:
-                        if path == args.weights_file_path:
-                            # weights file, so we need to make the name unique
-                            erargs.name[player] = f"Player{player}"
-                        else:
-                            # use the filename
-                            erargs.name[player] = os.path.splitext(os.path.split(path)[-1])[0]
-                    erargs.name[player] = handle_name(erargs.name[player], player, name_counter)
-
-                    player += 1
+                settings_cache[key] = next(rolled_settings)
             except Exception as e:
                 raise ValueError(f"File {path} is invalid. Please fix your yaml.") from e
-        else:
-            raise RuntimeError(f'No weights specified for player {player}')
+
+    for player, (path, doc_idx) in player_documents.items():
+        try:
+            settingsObject = settings_cache[(path, doc_idx) if args.sameoptions else player]
+            for k, v in vars(settingsObject).items():
+                if v is not None:
+                    try:
+                        getattr(erargs, k)[player] = v
+                    except AttributeError:
+                        setattr(erargs, k, {player: v})
+                    except Exception as e:
+                        raise Exception(f"Error setting {k} to {v} for player {player}") from e
+
+            # name was not specified
+            if player not in erargs.name:
+                if path == args.weights_file_path:
+                    # weights file, so we need to make the name unique
+                    erargs.name[player] = f"Player{player}"
+                else:
+                    # use the filename
+                    erargs.name[player] = os.path.splitext(os.path.split(path)[-1])[0]
+            erargs.name[player] = handle_name(erargs.name[player], player, name_counter)
+        except Exception as e:
+            raise ValueError(f"File {path} is invalid. Please fix your yaml.") from e
 
     if len(set(name.lower() for name in erargs.name.values())) != len(erargs.name):
         raise Exception(f"Names have to be unique. Names: {Counter(name.lower() for name in erargs.name.values())}")
@@ -246,6 +268,30 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
     return erargs, seed
 
 
+@contextlib.contextmanager
+def pooled_map(processes: int) -> Iterator[Callable[..., Iterator[Any]]]:
+    """
+    Yields a function like `map`, that runs the calls in a pool of `processes` processes if there is more than one.
+    The results are returned in order either way.
+    """
+    if processes <= 1:
+        yield map
+        return
+
+    executor = concurrent.futures.ProcessPoolExecutor(processes)
+
+    def map_jobs(function: Callable[..., Any], *iterables) -> Iterator[Any]:
+        jobs = list(zip(*iterables))
+        # hand out several jobs at once, to not pay a round trip to the workers for every small job
+        chunksize = max(1, len(jobs) // (processes * 4))
+        return executor.map(function, *zip(*jobs), chunksize=chunksize) if jobs else iter(())
+
+    try:
+        yield map_jobs
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
 def read_weights_yamls(path) -> tuple[Any, ...]:
     try:
         if urllib.parse.urlparse(path).scheme in ('https', 'file'):
@@ -466,6 +512,12 @@ def handle_option(ret: argparse.Namespace, game_weights: dict, option_key: str,
         player_option.verify(AutoWorldRegister.world_types[ret.game], ret.name, plando_options)
 
 
+def roll_settings_seeded(weights: dict, plando_options: PlandoOptions, seed: str) -> argparse.Namespace:
+    """Seeds the random module with the seed of the slot, then rolls its options like roll_settings."""
+    random.seed(seed)
+    return roll_settings(weights, plando_options)
+
+
 def roll_settings(weights: dict, plando_options: PlandoOptions = PlandoOptions.bosses):
     """
     Roll options from specified weights, usually originating from a .yaml options file.
@@ -581,6 +633,7 @@ def roll_alttp_settings(ret: argparse.Namespace, weights):
 
 
 if __name__ == '__main__':
+    Utils.freeze_support()  # for the worker processes of roll_processes in frozen builds
     import atexit
     confirmation = atexit.register(input, "Press enter to close.")
     erargs, seed = main()
@@ -1,13 +1,13 @@
 import collections
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 import concurrent.futures
+import contextlib
 import logging
 import os
 import tempfile
 import time
 from typing import Any
 import zipfile
-import zlib
 
 import worlds
 from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld
@@ -15,7 +15,7 @@ from Fill import FillError, balance_multiworld_progression, distribute_items_res
     parse_planned_blocks, distribute_planned_blocks, resolve_early_locations_for_planned
 from NetUtils import convert_to_base_types
 from Options import StartInventoryPool
-from Utils import __version__, output_path, restricted_dumps, version_tuple
+from Utils import __version__, output_path, version_tuple
 from settings import get_settings
 from worlds import AutoWorld
 from worlds.generic.Rules import exclusion_rules, locality_rules
@@ -23,6 +23,13 @@ from worlds.generic.Rules import exclusion_rules, locality_rules
 __all__ = ["main"]
 
 
+def log_stage_times(logger: logging.Logger, stage_times: Mapping[str, float]) -> None:
+    """Logs the wall-clock time spent in each generation stage."""
+    longest_stage = max(map(len, stage_times), default=0)
+    logger.info("Time per stage:\n" + "\n".join(f" {stage:{longest_stage}}: {taken:.2f}s"
+                                                 for stage, taken in stage_times.items()))
+
+
 def main(args, seed=None, baked_server_options: dict[str, object] | None = None):
     if not baked_server_options:
         baked_server_options = get_settings().server_options.as_dict()
@@ -36,6 +43,16 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     multiworld = MultiWorld(args.multi)
 
     logger = logging.getLogger()
+    stage_times: dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def timed_stage(stage: str) -> Iterator[None]:
+        stage_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage_times[stage] = stage_times.get(stage, 0.0) + time.perf_counter() - stage_start
+
     multiworld.set_seed(seed, args.race, str(args.outputname) if args.outputname else None)
     multiworld.plando_options = args.plando_options
     multiworld.game = args.game.copy()
@@ -68,7 +85,8 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     if not args.skip_output and not args.spoiler_only:
         AutoWorld.call_stage(multiworld, "assert_generate")
 
-    AutoWorld.call_all(multiworld, "generate_early")
+    with timed_stage("generate_early"):
+        AutoWorld.call_all(multiworld, "generate_early")
 
     logger.info('')
 
@@ -104,13 +122,16 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
         multiworld.worlds[1].options.local_items.value = set()
 
     logger.info('Creating MultiWorld.')
-    AutoWorld.call_all(multiworld, "create_regions")
+    with timed_stage("create_regions"):
+        AutoWorld.call_all(multiworld, "create_regions")
 
     logger.info('Creating Items.')
-    AutoWorld.call_all(multiworld, "create_items")
+    with timed_stage("create_items"):
+        AutoWorld.call_all(multiworld, "create_items")
 
     logger.info('Calculating Access Rules.')
-    AutoWorld.call_all(multiworld, "set_rules")
+    with timed_stage("set_rules"):
+        AutoWorld.call_all(multiworld, "set_rules")
 
     for player in multiworld.player_ids:
         exclusion_rules(multiworld, player, multiworld.worlds[player].options.exclude_locations.value)
@@ -136,8 +157,10 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
 
     multiworld.plando_item_blocks = parse_planned_blocks(multiworld)
 
-    AutoWorld.call_all(multiworld, "connect_entrances")
-    AutoWorld.call_all(multiworld, "generate_basic")
+    with timed_stage("connect_entrances"):
+        AutoWorld.call_all(multiworld, "connect_entrances")
+    with timed_stage("generate_basic"):
+        AutoWorld.call_all(multiworld, "generate_basic")
 
     # remove starting inventory from pool items.
     # Because some worlds don't actually create items during create_items this has to be as late as possible.
@@ -186,19 +209,23 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
 
     logger.info('Running Pre Main Fill.')
 
-    AutoWorld.call_all(multiworld, "pre_fill")
+    with timed_stage("pre_fill"):
+        AutoWorld.call_all(multiworld, "pre_fill")
 
     logger.info(f'Filling the multiworld with {len(multiworld.itempool)} items.')
 
-    if multiworld.algorithm == 'flood':
-        flood_items(multiworld)  # different algo, biased towards early game progress items
-    elif multiworld.algorithm == 'balanced':
-        distribute_items_restrictive(multiworld, get_settings().generator.panic_method)
+    with timed_stage("fill"):
+        if multiworld.algorithm == 'flood':
+            flood_items(multiworld)  # different algo, biased towards early game progress items
+        elif multiworld.algorithm == 'balanced':
+            distribute_items_restrictive(multiworld, get_settings().generator.panic_method)
 
-    AutoWorld.call_all(multiworld, 'post_fill')
+    with timed_stage("post_fill"):
+        AutoWorld.call_all(multiworld, 'post_fill')
 
     if multiworld.players > 1 and not args.skip_prog_balancing:
-        balance_multiworld_progression(multiworld)
+        with timed_stage("progression_balancing"):
+            balance_multiworld_progression(multiworld)
     else:
         logger.info("Progression balancing skipped.")
 
@@ -206,12 +233,17 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     multiworld.random.passthrough = False
 
     if args.skip_output:
+        log_stage_times(logger, stage_times)
         logger.info('Done. Skipped output/spoiler generation. Total Time: %s', time.perf_counter() - start)
         return multiworld
 
     logger.info(f'Beginning output...')
     outfilebase = 'AP_' + multiworld.seed_name
 
+    # placements are final now, so the spoiler, the multidata and worlds' output can share the same spheres
+    with timed_stage("spheres"):
+        multiworld.get_playthrough_model()
+
     if args.spoiler_only:
         if args.spoiler > 1:
             logger.info('Calculating playthrough.')
@@ -222,7 +254,7 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
         return multiworld
 
     output = tempfile.TemporaryDirectory()
-    with output as temp_dir:
+    with output as temp_dir, timed_stage("output"):
         output_players = [player for player in multiworld.player_ids if AutoWorld.World.generate_output.__code__
                           is not multiworld.worlds[player].generate_output.__code__]
         with concurrent.futures.ThreadPoolExecutor(len(output_players) + 2) as pool:
@@ -321,7 +353,7 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                     if current_sphere:
                         spheres.append(dict(current_sphere))
 
-                multidata: NetUtils.MultiData | bytes = {
+                multidata: NetUtils.MultiData = {
                     "slot_data": slot_data,
                     "slot_info": slot_info,
                     "connect_names": {name: (0, player) for player, name in multiworld.player_name.items()},
@@ -345,11 +377,11 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                 for key in ("slot_data", "er_hint_data"):
                     multidata[key] = convert_to_base_types(multidata[key])
 
-                multidata = zlib.compress(restricted_dumps(multidata), 9)
-
-                with open(os.path.join(temp_dir, f'{outfilebase}.archipelago'), 'wb') as f:
-                    f.write(bytes([3]))  # version of format
-                    f.write(multidata)
+                # sections are pickled and compressed one at a time, instead of the whole multidata at once
+                with open(os.path.join(temp_dir, f'{outfilebase}.archipelago'), 'wb') as f, \
+                        NetUtils.MultiDataWriter(f) as writer:
+                    for key in list(multidata):
+                        writer.write_section(key, multidata.pop(key))
 
             output_file_futures.append(pool.submit(write_multidata))
             if not check_accessibility_task.result():
@@ -378,5 +410,6 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
             for file in os.scandir(temp_dir):
                 zf.write(file.path, arcname=file.name)
 
+    log_stage_times(logger, stage_times)
     logger.info('Done. Enjoy. Total Time: %s', time.perf_counter() - start)
     return multiworld
@@ -12,10 +12,12 @@ import inspect
 import itertools
 import logging
 import math
+import os
 import operator
 import pickle
 import random
 import shlex
+import struct
 import threading
 import time
 import typing
@@ -43,7 +45,8 @@ import NetUtils
 import Utils
 from Utils import version_tuple, restricted_loads, Version, async_start, get_intended_text
 from NetUtils import Endpoint, ClientStatus, NetworkItem, decode, encode, NetworkPlayer, Permission, NetworkSlot, \
-    SlotType, LocationStore, MultiData, Hint, HintStatus
+    SlotType, LocationStore, MultiData, Hint, HintStatus, SphereStore, LazyMultiData, LocationTable, \
+    multidata_format_version
 from BaseClasses import ItemClassification
 
 
@@ -124,14 +127,31 @@ def get_saving_second(seed_name: str, interval: int = 60) -> int:
     return int(hashlib.sha256(seed_name.encode()).hexdigest(), 16) % interval
 
 
+def apply_journal_record(save_data: dict, record: dict) -> None:
+    """Applies a save journal record, as written by Context._append_journal, to the save data it was written after."""
+    for section in Context.journal_full_sections:
+        save_data[section] = record[section]
+    if "random_state" in record:
+        save_data["random_state"] = record["random_state"]
+    save_data["location_checks"].update(record["location_checks"])
+    save_data["hints"].update(record["hints"])
+    save_data["stored_data"].update(record["stored_data"])
+    received_items = save_data["received_items"]
+    for key, (start, items) in record["received_items"].items():
+        received_items[key] = received_items.get(key, [])[:start] + items
+
+
 class Client(Endpoint):
     version = Version(0, 0, 0)
+    team: typing.Optional[int]
+    slot: typing.Optional[int]
     tags: typing.List[str]
     remote_items: bool
     remote_start_inventory: bool
     no_items: bool
     no_locations: bool
     no_text: bool
+    binary: bool = False  # sent binary frames instead of JSON, see NetUtils.binary_protocol_tag
 
     def __init__(self, socket: "ServerConnection", ctx: Context) -> None:
         super().__init__(socket)
@@ -168,9 +188,76 @@ class Client(Endpoint):
 team_slot = typing.Tuple[int, int]
 
 
+class GameLookups(typing.NamedTuple):
+    """Name lookups of one game, from Context.build_game_lookups."""
+    item_names: typing.Dict[int, str]
+    location_names: typing.Dict[int, str]
+    all_item_and_group_names: typing.AbstractSet[str]
+    all_location_and_group_names: typing.AbstractSet[str]
+
+
+class MessageStats:
+    """Outgoing traffic of one command type."""
+    encoded: int = 0
+    encode_time: float = 0.0
+    sent: int = 0
+    bytes: int = 0
+    frames: int = 0
+
+
+class EncodedMessage:
+    """
+    A message from Context.encode_msg, to be queued for any amount of endpoints.
+    It is encoded at most once per wire format, when the first endpoint using that format needs it.
+    """
+    __slots__ = ("cmd", "msg", "stats", "encoder", "_data", "_size", "_binary")
+
+    def __init__(self, msg: typing.Dict[str, typing.Any], stats: MessageStats,
+                 encoder: typing.Callable[[typing.Any], str] = encode) -> None:
+        self.cmd: str = msg["cmd"]
+        self.msg = msg
+        self.stats = stats
+        self.encoder = encoder
+        self._data: typing.Optional[str] = None
+        self._size: typing.Optional[int] = None
+        self._binary: typing.Optional[bytes] = None
+
+    @property
+    def data(self) -> str:
+        """JSON text of the message."""
+        if self._data is None:
+            start = time.perf_counter()
+            self._data = self.encoder(self.msg)
+            self.stats.encode_time += time.perf_counter() - start
+            self.stats.encoded += 1
+        return self._data
+
+    @property
+    def size(self) -> int:
+        """Size of the JSON text in bytes."""
+        if self._size is None:
+            self._size = len(self.data.encode())
+        return self._size
+
+    @property
+    def binary(self) -> bytes:
+        """Binary encoding of the message, for clients that connected with the binary protocol tag."""
+        if self._binary is None:
+            start = time.perf_counter()
+            self._binary = NetUtils.encode_binary_value(self.msg)
+            self.stats.encode_time += time.perf_counter() - start
+            self.stats.encoded += 1
+        return self._binary
+
+
 class Context:
     dumper = staticmethod(encode)
     loader = staticmethod(decode)
+    max_frame_size = 64 * 1024  # coalesced messages are split into frames close to the compression window
+    binary_compress_size = 1024  # binary frames at least this big get compressed without permessage-deflate
+    # packets mostly made of numbers, the others encode and decode faster as JSON even for binary clients
+    binary_cmds: typing.ClassVar[typing.FrozenSet[str]] = frozenset({"ReceivedItems", "Connected", "LocationInfo",
+                                                                     "RoomUpdate"})
 
     simple_options = {"hint_cost": int,
                       "location_check_points": int,
@@ -199,11 +286,12 @@ class Context:
     item_name_groups: typing.Dict[str, typing.Dict[str, typing.Set[str]]]
     location_names: typing.Dict[str, typing.Dict[int, str]]
     location_name_groups: typing.Dict[str, typing.Dict[str, typing.Set[str]]]
-    all_item_and_group_names: typing.Dict[str, typing.Set[str]]
-    all_location_and_group_names: typing.Dict[str, typing.Set[str]]
+    all_item_and_group_names: typing.Dict[str, typing.AbstractSet[str]]
+    all_location_and_group_names: typing.Dict[str, typing.AbstractSet[str]]
     non_hintable_names: typing.Dict[str, typing.AbstractSet[str]]
     spheres: typing.List[typing.Dict[int, typing.Set[int]]]
     """ each sphere is { player: { location_id, ... } } """
+    sphere_store: SphereStore
     logger: logging.Logger
 
     def __init__(self, host: str, port: int, server_password: str, password: str, location_check_points: int,
@@ -219,7 +307,7 @@ class Context:
         self.compatibility: int = compatibility
         self.shutdown_task = None
         self.data_filename = None
-        self.save_filename = None
+        self.save_filename: typing.Optional[str] = None
         self.saving = False
         self.player_names: typing.Dict[team_slot, str] = {}
         self.player_name_lookup: typing.Dict[str, team_slot] = {}
@@ -232,6 +320,7 @@ class Context:
         self.server = None
         self.countdown_timer = 0
         self.received_items = {}
+        self.pending_item_receivers: typing.Set[team_slot] = set()  # received items not yet delivered to clients
         self.start_inventory = {}
         self.name_aliases: typing.Dict[team_slot, str] = {}
         self.location_checks = collections.defaultdict(set)
@@ -239,6 +328,8 @@ class Context:
         self.location_check_points = location_check_points
         self.hints_used = collections.defaultdict(int)
         self.hints: typing.Dict[team_slot, typing.Set[Hint]] = collections.defaultdict(set)
+        # (team, finding_player, location) -> the hints about that location, to recheck only those on a check
+        self.location_hints: typing.Dict[typing.Tuple[int, int, int], typing.Set[Hint]] = collections.defaultdict(set)
         self.release_mode: str = release_mode
         self.remaining_mode: str = remaining_mode
         self.collect_mode: str = collect_mode
@@ -257,6 +348,20 @@ class Context:
         self.auto_save_interval = 60  # in seconds
         self.auto_saver_thread: typing.Optional[threading.Thread] = None
         self.save_dirty = False
+        self.outgoing: typing.Dict[Endpoint, typing.List[EncodedMessage]] = {}  # sent at the end of the tick
+        self.outgoing_flush: typing.Optional[asyncio.Handle] = None
+        self.message_stats: typing.Dict[str, MessageStats] = collections.defaultdict(MessageStats)
+        self.encoded_items: typing.Dict[NetworkItem, str] = {}
+        # journaled saving, see _save_journal
+        self.journal_save = False
+        self.journal_sequence = 0  # of the last journal record written or replayed
+        self.journal_changes: typing.Dict[str, typing.Set[typing.Any]] = collections.defaultdict(set)
+        self.journal_item_counts: typing.Dict[typing.Tuple[int, int, bool], int] = {}
+        self.journal_random_state: typing.Optional[tuple] = None
+        self.journal_lock = threading.Lock()
+        self.journal_compact = True  # next journaled save has to write a snapshot
+        self.journal_size = 0
+        self.snapshot_size = 0
         self.tags = ['AP']
         self.games: typing.Dict[int, str] = {}
         self.minimum_client_versions: typing.Dict[int, Version] = {}
@@ -268,6 +373,7 @@ class Context:
         self.stored_data_notification_clients = collections.defaultdict(weakref.WeakSet)
         self.read_data = {}
         self.spheres = []
+        self.sphere_store = SphereStore(self.spheres)
 
         # init empty to satisfy linter, I suppose
         self.gamespackage = {}
@@ -297,29 +403,40 @@ class Context:
             self.non_hintable_names[world_name] = world.hint_blacklist
 
         for game_package in self.gamespackage.values():
-            # remove groups from data sent to clients
-            del game_package["item_name_groups"]
-            del game_package["location_name_groups"]
+            # remove groups from data sent to clients, which an earlier Context in this process may have done already
+            game_package.pop("item_name_groups", None)
+            game_package.pop("location_name_groups", None)
 
     def _init_game_data(self):
         for game_name, game_package in self.gamespackage.items():
             if "checksum" in game_package:
                 self.checksums[game_name] = game_package["checksum"]
-            for item_name, item_id in game_package["item_name_to_id"].items():
-                self.item_names[game_name][item_id] = item_name
-            for location_name, location_id in game_package["location_name_to_id"].items():
-                self.location_names[game_name][location_id] = location_name
-            self.all_item_and_group_names[game_name] = \
-                set(game_package["item_name_to_id"]) | set(self.item_name_groups[game_name])
-            self.all_location_and_group_names[game_name] = \
-                set(game_package["location_name_to_id"]) | set(self.location_name_groups.get(game_name, []))
-
-        archipelago_item_names = self.item_names["Archipelago"]
-        archipelago_location_names = self.location_names["Archipelago"]
-        for game in [game_name for game_name in self.gamespackage if game_name != "Archipelago"]:
+            lookups = self.build_game_lookups(game_name)
+            self.item_names[game_name] = lookups.item_names
+            self.location_names[game_name] = lookups.location_names
+            self.all_item_and_group_names[game_name] = lookups.all_item_and_group_names
+            self.all_location_and_group_names[game_name] = lookups.all_location_and_group_names
+
+    def build_game_lookups(self, game_name: str) -> GameLookups:
+        """Builds the name lookups of a loaded game, which include the Archipelago items and locations."""
+        game_package = self.gamespackage[game_name]
+        item_names = Utils.KeyedDefaultDict(lambda code: f'Unknown item (ID:{code})')
+        location_names = Utils.KeyedDefaultDict(lambda code: f'Unknown location (ID:{code})')
+        for item_name, item_id in game_package["item_name_to_id"].items():
+            item_names[item_id] = item_name
+        for location_name, location_id in game_package["location_name_to_id"].items():
+            location_names[location_id] = location_name
+        if game_name != "Archipelago" and "Archipelago" in self.gamespackage:
             # Add Archipelago items and locations to each data package.
-            self.item_names[game].update(archipelago_item_names)
-            self.location_names[game].update(archipelago_location_names)
+            archipelago_package = self.gamespackage["Archipelago"]
+            for item_name, item_id in archipelago_package["item_name_to_id"].items():
+                item_names[item_id] = item_name
+            for location_name, location_id in archipelago_package["location_name_to_id"].items():
+                location_names[location_id] = location_name
+        return GameLookups(
+            item_names, location_names,
+            set(game_package["item_name_to_id"]) | set(self.item_name_groups[game_name]),
+            set(game_package["location_name_to_id"]) | set(self.location_name_groups.get(game_name, [])))
 
     def item_names_for_game(self, game: str) -> typing.Optional[typing.Dict[str, int]]:
         return self.gamespackage[game]["item_name_to_id"] if game in self.gamespackage else None
@@ -328,24 +445,122 @@ class Context:
         return self.gamespackage[game]["location_name_to_id"] if game in self.gamespackage else None
 
     # General networking
-    async def send_msgs(self, endpoint: Endpoint, msgs: typing.Iterable[dict]) -> bool:
+    def encode_msg(self, msg: typing.Dict[str, typing.Any]) -> EncodedMessage:
+        """Prepares a single message to be encoded once, to be sent to any amount of endpoints."""
+        return EncodedMessage(msg, self.message_stats[msg["cmd"]], self.dumper)
+
+    def encode_received_items(self, index: int, items: typing.Sequence[NetworkItem]) -> EncodedMessage:
+        """Prepares a ReceivedItems message, which reuses the JSON of items that were sent before."""
+        def encoder(msg: dict) -> str:
+            encoded_items = self.encoded_items
+            parts = []
+            for item in msg["items"]:
+                encoded_item = encoded_items.get(item)
+                if encoded_item is None:
+                    encoded_item = encoded_items[item] = self.dumper(item)
+                parts.append(encoded_item)
+            return f'{{"cmd":"ReceivedItems","index":{msg["index"]},"items":[{",".join(parts)}]}}'
+
+        return EncodedMessage({"cmd": "ReceivedItems", "index": index, "items": items},
+                              self.message_stats["ReceivedItems"], encoder)
+
+    def build_frames(self, msgs: typing.Sequence[EncodedMessage], binary: bool = False,
+                     compress: bool = False) -> typing.List[typing.Union[str, bytes]]:
+        """
+        Joins encoded messages into as few frames as max_frame_size allows, and counts them as sent.
+        Frames are JSON text, with binary_cmds in binary frames for clients that connected with the binary protocol
+        tag. Binary frames are compressed if they are big and compress is set.
+        """
+        frames: typing.List[typing.Union[str, bytes]] = []
+        frame: typing.List[EncodedMessage] = []
+        frame_size = 0
+        frame_binary = False
+        for msg in msgs:
+            msg_binary = binary and msg.cmd in self.binary_cmds
+            size = len(msg.binary) if msg_binary else msg.size
+            if frame and (msg_binary != frame_binary or frame_size + size > self.max_frame_size):
+                frames.append(self._build_frame(frame, frame_binary, compress))
+                frame = []
+                frame_size = 0
+            frame_binary = msg_binary
+            frame.append(msg)
+            frame_size += size + 1
+        if frame:
+            frames.append(self._build_frame(frame, frame_binary, compress))
+        return frames
+
+    def _build_frame(self, msgs: typing.List[EncodedMessage], binary: bool,
+                     compress: bool) -> typing.Union[str, bytes]:
+        for msg in msgs:
+            msg.stats.sent += 1
+            msg.stats.bytes += len(msg.binary) if binary else msg.size
+        for stats in {id(msg.stats): msg.stats for msg in msgs}.values():
+            stats.frames += 1
+        if binary:
+            values = [msg.binary for msg in msgs]
+            return NetUtils.build_binary_frame(values, compress and sum(map(len, values)) >= self.binary_compress_size)
+        return "[" + ",".join(msg.data for msg in msgs) + "]"
+
+    def build_endpoint_frames(self, endpoint: Endpoint,
+                              msgs: typing.Sequence[EncodedMessage]) -> typing.List[typing.Union[str, bytes]]:
+        """Builds the frames of msgs in the wire format of endpoint."""
+        binary = getattr(endpoint, "binary", False)
+        return self.build_frames(msgs, binary, binary and not getattr(endpoint.socket, "extensions", None))
+
+    def queue_msgs(self, endpoints: typing.Iterable[Endpoint],
+                   msgs: typing.Sequence[typing.Union[typing.Dict[str, typing.Any], EncodedMessage]]) -> None:
+        """
+        Encodes msgs once and queues them for every endpoint.
+        All messages queued for an endpoint within one tick of the event loop are sent together.
+        """
+        msgs = [msg if isinstance(msg, EncodedMessage) else self.encode_msg(msg) for msg in msgs]
+        if not msgs:
+            return
+        for endpoint in endpoints:
+            self.outgoing.setdefault(endpoint, []).extend(msgs)
+        if self.outgoing and not self.outgoing_flush:
+            self.outgoing_flush = asyncio.get_running_loop().call_soon(self.flush_outgoing)
+
+    def flush_outgoing(self) -> None:
+        """Sends the queued messages of every endpoint."""
+        self.outgoing_flush = None
+        outgoing, self.outgoing = self.outgoing, {}
+        for endpoint, msgs in outgoing.items():
+            if not endpoint.socket or not endpoint.socket.open:
+                continue
+            for frame in self.build_endpoint_frames(endpoint, msgs):
+                try:
+                    websockets.broadcast([endpoint.socket], frame)
+                except RuntimeError:
+                    self.logger.exception("Exception during flush_outgoing")
+                    break
+                if self.log_network:
+                    self.logger.info(f"Outgoing message: {frame}")
+
+    async def send_msgs(self, endpoint: Endpoint,
+                        msgs: typing.Iterable[typing.Union[typing.Dict[str, typing.Any], EncodedMessage]]) -> bool:
+        """Sends msgs right away, after the messages still queued for endpoint."""
         if not endpoint.socket or not endpoint.socket.open:
             return False
-        msg = self.dumper(msgs)
-        try:
-            await endpoint.socket.send(msg)
-        except websockets.ConnectionClosed:
-            self.logger.exception(f"Exception during send_msgs, could not send {msg}")
-            await self.disconnect(endpoint)
-            return False
-        else:
-            if self.log_network:
-                self.logger.info(f"Outgoing message: {msg}")
-            return True
+        msgs = self.outgoing.pop(endpoint, []) + \
+            [msg if isinstance(msg, EncodedMessage) else self.encode_msg(msg) for msg in msgs]
+        for msg in self.build_endpoint_frames(endpoint, msgs):
+            try:
+                await endpoint.socket.send(msg)
+            except websockets.ConnectionClosed:
+                self.logger.exception(f"Exception during send_msgs, could not send {msg}")
+                await self.disconnect(endpoint)
+                return False
+            else:
+                if self.log_network:
+                    self.logger.info(f"Outgoing message: {msg}")
+        return True
 
     async def send_encoded_msgs(self, endpoint: Endpoint, msg: str) -> bool:
         if not endpoint.socket or not endpoint.socket.open:
             return False
+        if endpoint in self.outgoing:
+            await self.send_msgs(endpoint, [])
         try:
             await endpoint.socket.send(msg)
         except websockets.ConnectionClosed:
@@ -372,53 +587,55 @@ class Context:
                 self.logger.info(f"Outgoing broadcast: {msg}")
             return True
 
-    def broadcast_all(self, msgs: typing.List[dict]):
-        msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
-        data = self.dumper(msgs)
+    def broadcast_all(self, msgs: typing.List[typing.Union[dict, EncodedMessage]]):
+        msg_is_text = all(msg["cmd"] == "PrintJSON" if isinstance(msg, dict) else msg.cmd == "PrintJSON"
+                          for msg in msgs)
         endpoints = (
             endpoint
             for endpoint in self.endpoints
             if endpoint.auth and not (msg_is_text and endpoint.no_text)
         )
-        async_start(self.broadcast_send_encoded_msgs(endpoints, data))
+        self.queue_msgs(endpoints, msgs)
 
     def broadcast_text_all(self, text: str, additional_arguments: dict = {}):
         self.logger.info("Notice (all): %s" % text)
         self.broadcast_all([{**{"cmd": "PrintJSON", "data": [{ "text": text }]}, **additional_arguments}])
 
-    def broadcast_team(self, team: int, msgs: typing.List[dict]):
-        msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
-        data = self.dumper(msgs)
+    def broadcast_team(self, team: int,
+                       msgs: typing.Sequence[typing.Union[typing.Dict[str, typing.Any], EncodedMessage]]) -> None:
+        msg_is_text = all(msg["cmd"] == "PrintJSON" if isinstance(msg, dict) else msg.cmd == "PrintJSON"
+                          for msg in msgs)
         endpoints = (
             endpoint
             for endpoint in itertools.chain.from_iterable(self.clients[team].values())
             if not (msg_is_text and endpoint.no_text)
         )
-        async_start(self.broadcast_send_encoded_msgs(endpoints, data))
+        self.queue_msgs(endpoints, msgs)
 
-    def broadcast(self, endpoints: typing.Iterable[Client], msgs: typing.List[dict]):
-        msgs = self.dumper(msgs)
-        async_start(self.broadcast_send_encoded_msgs(endpoints, msgs))
+    def broadcast(self, endpoints: typing.Iterable[Client],
+                  msgs: typing.Sequence[typing.Union[typing.Dict[str, typing.Any], EncodedMessage]]) -> None:
+        self.queue_msgs(endpoints, msgs)
 
     async def disconnect(self, endpoint: Client):
+        self.outgoing.pop(endpoint, None)
         if endpoint in self.endpoints:
             self.endpoints.remove(endpoint)
         if endpoint.slot and endpoint in self.clients[endpoint.team][endpoint.slot]:
             self.clients[endpoint.team][endpoint.slot].remove(endpoint)
         await on_client_disconnected(self, endpoint)
 
-    def notify_client(self, client: Client, text: str, additional_arguments: dict = {}):
+    def notify_client(self, client: Client, text: str, additional_arguments: typing.Dict[str, typing.Any] = {}) -> None:
         if not client.auth or client.no_text:
             return
         self.logger.info("Notice (Player %s in team %d): %s" % (client.name, client.team + 1, text))
-        async_start(self.send_msgs(client, [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}]))
+        self.queue_msgs([client], [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}])
 
-    def notify_client_multiple(self, client: Client, texts: typing.List[str], additional_arguments: dict = {}):
+    def notify_client_multiple(self, client: Client, texts: typing.List[str],
+                               additional_arguments: typing.Dict[str, typing.Any] = {}) -> None:
         if not client.auth or client.no_text:
             return
-        async_start(self.send_msgs(client,
-                                   [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}
-                                    for text in texts]))
+        self.queue_msgs([client], [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}
+                                   for text in texts])
 
     # loading
     def load(self, multidatapath: str, use_embedded_server_options: bool = False):
@@ -439,14 +656,16 @@ class Context:
         self.data_filename = multidatapath
 
     @staticmethod
-    def decompress(data: bytes) -> dict:
+    def decompress(data: bytes) -> typing.Union[MultiData, LazyMultiData]:
         format_version = data[0]
-        if format_version > 3:
+        if format_version > multidata_format_version:
             raise Utils.VersionException("Incompatible multidata.")
+        if format_version == multidata_format_version:
+            return LazyMultiData(data)
         return restricted_loads(zlib.decompress(data[1:]))
 
-    def _load(self, decoded_obj: MultiData, game_data_packages: typing.Dict[str, typing.Any],
-              use_embedded_server_options: bool):
+    def _load(self, decoded_obj: typing.Union[MultiData, LazyMultiData],
+              game_data_packages: typing.Dict[str, typing.Any], use_embedded_server_options: bool):
 
         self.read_data = {}
         # there might be a better place to put this.
@@ -487,7 +706,12 @@ class Context:
         self.seed_name = decoded_obj["seed_name"]
         self.random.seed(self.seed_name)
         self.connect_names = decoded_obj['connect_names']
-        self.locations = LocationStore(decoded_obj.pop("locations"))  # pre-emptively free memory
+        locations = decoded_obj.pop("locations")  # pre-emptively free memory
+        if isinstance(locations, LocationTable):
+            self.locations = LocationStore.from_columns(*locations.columns)
+        else:
+            self.locations = LocationStore(locations)
+        del locations
         self.slot_data = decoded_obj['slot_data']
         for slot, data in self.slot_data.items():
             self.read_data[f"slot_data_{slot}"] = lambda data=data: data
@@ -500,6 +724,7 @@ class Context:
 
         for slot, hints in decoded_obj["precollected_hints"].items():
             self.hints[0, slot].update(hints)
+        self.index_location_hints()
 
         # declare slots that aren't players as done
         for slot, slot_info in self.slot_info.items():
@@ -530,10 +755,11 @@ class Context:
 
         # sorted access spheres
         self.spheres = decoded_obj.get("spheres", [])
+        self.sphere_store = SphereStore(self.spheres)
 
     # saving
 
-    def save(self, now=False) -> bool:
+    def save(self, now: bool = False) -> bool:
         if self.saving:
             if now:
                 self.save_dirty = False
@@ -545,6 +771,8 @@ class Context:
         return False
 
     def _save(self, exit_save: bool = False) -> bool:
+        if self.journal_save:
+            return self._save_journal(exit_save)
         try:
             # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
             encoded_save = pickle.dumps(self.get_save())
@@ -556,6 +784,122 @@ class Context:
         else:
             return True
 
+    # sections of the save that are small enough to be written completely in every journal record
+    journal_full_sections: typing.ClassVar[typing.Tuple[str, ...]] = (
+        "hints_used", "name_aliases", "client_game_state", "client_activity_timers", "client_connection_timers",
+        "group_collected", "game_options")
+
+    @property
+    def journal_filename(self) -> str:
+        return self.save_filename + ".journal"
+
+    def journal_change(self, section: str, key: typing.Any) -> None:
+        """Remembers that an entry of location_checks, hints or stored_data changed, for the next journal record."""
+        if self.journal_save:
+            with self.journal_lock:
+                self.journal_changes[section].add(key)
+
+    def _save_journal(self, exit_save: bool = False) -> bool:
+        """
+        Appends the changes since the last save to the journal next to the save file.
+        Writes a full snapshot instead, which empties the journal, for the first save, on exit, after a failed save
+        and once the journal has grown larger than the snapshot.
+        """
+        with self.journal_lock:
+            changes, self.journal_changes = self.journal_changes, collections.defaultdict(set)
+        try:
+            if self.journal_compact or exit_save or self.journal_size > self.snapshot_size:
+                self._write_snapshot()
+            else:
+                self._append_journal(changes)
+        except Exception as e:
+            self.logger.exception(e)
+            self.journal_compact = True  # the changes did not make it to disk
+            return False
+        else:
+            return True
+
+    def _write_snapshot(self) -> None:
+        save = self.get_save()
+        item_counts = {key: len(items) for key, items in save["received_items"].items()}
+        data = zlib.compress(pickle.dumps(save))
+        temp_filename = self.save_filename + ".tmp"
+        with open(temp_filename, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, self.save_filename)
+        # the snapshot holds journal_sequence, so replaying skips the old records even if this does not happen
+        with open(self.journal_filename, "wb"):
+            pass
+        self.snapshot_size = len(data)
+        self.journal_size = 0
+        self.journal_item_counts = item_counts
+        self.journal_random_state = save["random_state"]
+        self.journal_compact = False
+
+    def _append_journal(self, changes: typing.Dict[str, typing.Set[typing.Any]]) -> None:
+        save = self.get_save()
+        received_items = {}
+        for key, items in save["received_items"].items():
+            start = self.journal_item_counts.get(key, 0)
+            if len(items) > start:
+                received_items[key] = (start, items[start:])
+        record = {section: save[section] for section in self.journal_full_sections}
+        if save["random_state"] != self.journal_random_state:
+            record["random_state"] = save["random_state"]
+        record.update({
+            "sequence": self.journal_sequence + 1,
+            "received_items": received_items,
+            "location_checks": {key: self.location_checks[key] for key in changes["location_checks"]},
+            "hints": {key: self.hints[key] for key in changes["hints"]},
+            "stored_data": {key: self.stored_data[key] for key in changes["stored_data"]},
+        })
+        data = zlib.compress(pickle.dumps(record))
+        with open(self.journal_filename, "ab") as f:
+            f.write(struct.pack("<II", len(data), zlib.crc32(data)) + data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_sequence += 1
+        self.journal_size += 8 + len(data)
+        for key, (start, items) in received_items.items():
+            self.journal_item_counts[key] = start + len(items)
+        self.journal_random_state = save["random_state"]
+
+    def read_save_file(self) -> typing.Dict[str, typing.Any]:
+        """Reads the save file and replays the journal records written after it. Drops a torn record at the end."""
+        with open(self.save_filename, "rb") as f:
+            data = f.read()
+        save_data = restricted_loads(zlib.decompress(data))
+        self.snapshot_size = len(data)
+        sequence = save_data.get("journal_sequence", 0)
+        try:
+            with open(self.journal_filename, "rb") as f:
+                journal = f.read()
+        except FileNotFoundError:
+            journal = b""
+        position = 0
+        while position + 8 <= len(journal):
+            length, checksum = struct.unpack_from("<II", journal, position)
+            data = journal[position + 8:position + 8 + length]
+            if len(data) != length or zlib.crc32(data) != checksum:
+                break
+            record = restricted_loads(zlib.decompress(data))
+            position += 8 + length
+            if record["sequence"] > sequence:
+                sequence = record["sequence"]
+                apply_journal_record(save_data, record)
+        if position < len(journal):
+            self.logger.warning(f"Dropping {len(journal) - position} bytes of an incomplete save journal record.")
+            with open(self.journal_filename, "r+b") as f:
+                f.truncate(position)
+        self.journal_sequence = sequence
+        self.journal_size = position
+        self.journal_item_counts = {key: len(items) for key, items in save_data["received_items"].items()}
+        self.journal_random_state = save_data["random_state"]
+        self.journal_compact = False
+        return save_data
+
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
@@ -565,9 +909,7 @@ class Context:
                 self.save_filename = name + '.apsave' if ext.lower() in ('.archipelago', '.zip') \
                     else self.data_filename + '_' + 'apsave'
             try:
-                with open(self.save_filename, 'rb') as f:
-                    save_data = restricted_loads(zlib.decompress(f.read()))
-                    self.set_save(save_data)
+                self.set_save(self.read_save_file())
             except FileNotFoundError:
                 self.logger.error('No save data found, starting a new game')
             except Exception as e:
@@ -605,8 +947,7 @@ class Context:
                 import atexit
                 atexit.register(self._save, True)  # make sure we save on exit too
 
-    def get_save(self) -> dict:
-        self.recheck_hints()
+    def get_save(self) -> typing.Dict[str, typing.Any]:
         d = {
             "version": self.save_version,
             "connect_names": self.connect_names,
@@ -623,6 +964,7 @@ class Context:
             "random_state": self.random.getstate(),
             "group_collected": dict(self.group_collected),
             "stored_data": self.stored_data,
+            "journal_sequence": self.journal_sequence,
             "game_options": {"hint_cost": self.hint_cost, "location_check_points": self.location_check_points,
                              "server_password": self.server_password, "password": self.password,
                              "release_mode": self.release_mode,
@@ -633,7 +975,7 @@ class Context:
 
         return d
 
-    def set_save(self, savedata: dict):
+    def set_save(self, savedata: typing.Dict[str, typing.Any]):
         if self.connect_names != savedata["connect_names"]:
             raise Exception("This savegame does not appear to match the loaded multiworld.")
         if savedata["version"] > self.save_version:
@@ -641,6 +983,9 @@ class Context:
         self.received_items = savedata["received_items"]
         self.hints_used.update(savedata["hints_used"])
         self.hints.update(savedata["hints"])
+        self.location_checks.update(savedata["location_checks"])
+        self.recheck_hints()
+        self.index_location_hints()
 
         self.name_aliases.update(savedata["name_aliases"])
         self.client_game_state.update(savedata["client_game_state"])
@@ -650,7 +995,6 @@ class Context:
         self.client_activity_timers.update(
             {tuple(key): datetime.datetime.fromtimestamp(value, datetime.timezone.utc) for key, value
              in savedata["client_activity_timers"]})
-        self.location_checks.update(savedata["location_checks"])
         self.random.setstate(savedata["random_state"])
 
         if "game_options" in savedata:
@@ -698,6 +1042,10 @@ class Context:
                 new_hints.add(new_hint)
                 if hint == new_hint:
                     continue
+                self.journal_change("hints", (hint_team, hint_slot))
+                location_hints = self.location_hints[hint_team, hint.finding_player, hint.location]
+                location_hints.discard(hint)
+                location_hints.add(new_hint)
                 for player in self.slot_set(hint.receiving_player) | {hint.finding_player}:
                     if changed is not None:
                         changed.add((hint_team,player))
@@ -705,20 +1053,43 @@ class Context:
                         self.replace_hint(hint_team, player, hint, new_hint)
             self.hints[hint_team, hint_slot] = new_hints
 
+    def recheck_location_hints(self, team: int, finding_player: int, locations: typing.Iterable[int],
+                               changed: typing.Optional[typing.Set[team_slot]] = None) -> None:
+        """Refreshes only the hints about the specified locations of finding_player, in every slot holding them.
+        If a set is passed for 'changed', each (team,slot) pair that has at least one hint modified will be added."""
+        for location in locations:
+            for hint in tuple(self.location_hints.get((team, finding_player, location), ())):
+                new_hint = hint.re_check(self, team)
+                if hint == new_hint:
+                    continue
+                for player in self.slot_set(hint.receiving_player) | {hint.finding_player}:
+                    if changed is not None:
+                        changed.add((team, player))
+                    self.replace_hint(team, player, hint, new_hint)
+
+    def index_location_hints(self) -> None:
+        """Rebuilds location_hints from hints, after hints were replaced wholesale."""
+        self.location_hints.clear()
+        for (team, _), hints in self.hints.items():
+            for hint in hints:
+                self.location_hints[team, hint.finding_player, hint.location].add(hint)
+
     def get_rechecked_hints(self, team: int, slot: int):
-        self.recheck_hints(team, slot)
+        # hints are rechecked as their locations get checked
         return self.hints[team, slot]
 
     def get_sphere(self, player: int, location_id: int) -> int:
         """Get sphere of a location, -1 if spheres are not available."""
         if self.spheres:
-            for i, sphere in enumerate(self.spheres):
-                if location_id in sphere.get(player, set()):
-                    return i
-            raise KeyError(f"No Sphere found for location ID {location_id} belonging to player {player}. "
-                           f"Location or player may not exist.")
+            return self.sphere_store.get_sphere(player, location_id)
         return -1
 
+    def get_spheres(self, locations: typing.Iterable[typing.Tuple[int, int]]) -> typing.List[int]:
+        """Get spheres of many (player, location_id) pairs, -1 for each if spheres are not available."""
+        if self.spheres:
+            return self.sphere_store.get_spheres(locations)
+        return [-1 for _ in locations]
+
     def get_players_package(self):
         return [NetworkPlayer(t, p, self.get_aliased_name(t, p), n) for (t, p), n in self.player_names.items()]
 
@@ -762,7 +1133,7 @@ class Context:
         new_hint_events: typing.Set[int] = set()
         concerns = collections.defaultdict(list)
         for hint in sorted(hints, key=operator.attrgetter('found'), reverse=True):
-            data = (hint, hint.as_network_message())
+            data = (hint, self.encode_msg(hint.as_network_message()))
             for player in self.slot_set(hint.receiving_player):
                 concerns[player].append(data)
             if not hint.local and data not in concerns[hint.finding_player]:
@@ -775,9 +1146,12 @@ class Context:
                 # we can check once if hint already exists
                 if hint not in self.hints[team, hint.finding_player]:
                     self.hints[team, hint.finding_player].add(hint)
+                    self.location_hints[team, hint.finding_player, hint.location].add(hint)
+                    self.journal_change("hints", (team, hint.finding_player))
                     new_hint_events.add(hint.finding_player)
                     for player in self.slot_set(hint.receiving_player):
                         self.hints[team, player].add(hint)
+                        self.journal_change("hints", (team, player))
                         new_hint_events.add(player)
 
             self.logger.info("Notice (Team #%d): %s" % (team + 1, format_hint(self, team, hint)))
@@ -789,8 +1163,7 @@ class Context:
                 if not clients:
                     continue
                 client_hints = [datum[1] for datum in sorted(hint_data, key=lambda x: x[0].finding_player != slot)]
-                for client in clients:
-                    async_start(self.send_msgs(client, client_hints))
+                self.queue_msgs(clients, client_hints)
 
     def get_hint(self, team: int, finding_player: int, seeked_location: int) -> typing.Optional[Hint]:
         for hint in self.hints[team, finding_player]:
@@ -802,6 +1175,10 @@ class Context:
         if old_hint in self.hints[team, slot]:
             self.hints[team, slot].remove(old_hint)
             self.hints[team, slot].add(new_hint)
+            self.journal_change("hints", (team, slot))
+            location_hints = self.location_hints[team, old_hint.finding_player, old_hint.location]
+            location_hints.discard(old_hint)
+            location_hints.add(new_hint)
     
     # "events"
 
@@ -836,12 +1213,7 @@ class Context:
 
 
 def update_aliases(ctx: Context, team: int):
-    cmd = ctx.dumper([{"cmd": "RoomUpdate",
-                       "players": ctx.get_players_package()}])
-
-    for clients in ctx.clients[team].values():
-        for client in clients:
-            async_start(ctx.send_encoded_msgs(client, cmd))
+    ctx.broadcast_team(team, [{"cmd": "RoomUpdate", "players": ctx.get_players_package()}])
 
 
 async def server(websocket: "ServerConnection", path: str = "/", ctx: Context = None) -> None:
@@ -857,7 +1229,7 @@ async def server(websocket: "ServerConnection", path: str = "/", ctx: Context =
         async for data in websocket:
             if ctx.log_network:
                 ctx.logger.info(f"Incoming message: {data}")
-            for msg in decode(data):
+            for msg in NetUtils.decode_frame(data, client.binary):
                 await process_client_cmd(ctx, client, msg)
     except Exception as e:
         if not isinstance(e, websockets.WebSocketException):
@@ -1024,20 +1396,22 @@ def get_start_inventory(ctx: Context, player: int, remote_start_inventory: bool)
 
 
 def send_new_items(ctx: Context):
-    for team, clients in ctx.clients.items():
-        for slot, clients in clients.items():
-            for client in clients:
-                if client.no_items:
-                    continue
-                start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
-                items = get_received_items(ctx, team, slot, client.remote_items)
-                if len(start_inventory) + len(items) > client.send_index:
-                    first_new_item = max(0, client.send_index - len(start_inventory))
-                    async_start(ctx.send_msgs(client, [{
-                        "cmd": "ReceivedItems",
-                        "index": client.send_index,
-                        "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
-                    client.send_index = len(start_inventory) + len(items)
+    """Delivers new items to the clients of every slot in ctx.pending_item_receivers, one ReceivedItems per client."""
+    pending, ctx.pending_item_receivers = ctx.pending_item_receivers, set()
+    for team, slot in pending:
+        clients = ctx.clients.get(team, {}).get(slot)
+        if not clients:
+            continue
+        for client in clients:
+            if client.no_items:
+                continue
+            start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
+            items = get_received_items(ctx, team, slot, client.remote_items)
+            if len(start_inventory) + len(items) > client.send_index:
+                first_new_item = max(0, client.send_index - len(start_inventory))
+                ctx.queue_msgs([client], [ctx.encode_received_items(
+                    client.send_index, start_inventory[client.send_index:] + items[first_new_item:])])
+                client.send_index = len(start_inventory) + len(items)
 
 
 def update_checked_locations(ctx: Context, team: int, slot: int):
@@ -1063,8 +1437,10 @@ def collect_player(ctx: Context, team: int, slot: int, is_group: bool = False):
                            % (ctx.player_names[(team, slot)], team + 1),
                            {"type": "Collect", "team": team, "slot": slot})
     for source_player, location_ids in all_locations.items():
-        register_location_checks(ctx, team, source_player, location_ids, count_activity=False)
+        register_location_checks(ctx, team, source_player, location_ids, count_activity=False, deliver_items=False)
         update_checked_locations(ctx, team, source_player)
+    # one ReceivedItems per client for the whole collect
+    send_new_items(ctx)
 
     if not is_group:
         for group, group_players in ctx.groups.items():
@@ -1080,7 +1456,9 @@ def get_remaining(ctx: Context, team: int, slot: int) -> typing.List[typing.Tupl
 
 
 def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem):
+    """Queues items for target_slot, and every member if it is a group. Call send_new_items to deliver them."""
     for target in ctx.slot_set(target_slot):
+        ctx.pending_item_receivers.add((team, target))
         for item in items:
             if item.player != target_slot:
                 get_received_items(ctx, team, target, False).append(item)
@@ -1088,7 +1466,7 @@ def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem
 
 
 def register_location_checks(ctx: Context, team: int, slot: int, locations: typing.Iterable[int],
-                             count_activity: bool = True):
+                             count_activity: bool = True, deliver_items: bool = True):
     slot_locations = ctx.locations[slot]
     new_locations = set(locations) - ctx.location_checks[team, slot]
     new_locations.intersection_update(slot_locations)  # ignore location IDs unknown to this multidata
@@ -1103,7 +1481,7 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             # sort/group by receiver and item
             sortable.append((target_player, item_id, location, flags))
 
-        info_texts: list[dict[str, typing.Any]] = []
+        info_texts: list[EncodedMessage] = []
         for target_player, item_id, location, flags in sorted(sortable):
             new_item = NetworkItem(item_id, location, slot, flags)
             send_items_to(ctx, team, target_player, new_item)
@@ -1111,25 +1489,22 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             ctx.logger.info('(Team #%d) %s sent %s to %s (%s)' % (
                 team + 1, ctx.player_names[(team, slot)], ctx.item_names[ctx.slot_info[target_player].game][item_id],
                 ctx.player_names[(team, target_player)], ctx.location_names[ctx.slot_info[slot].game][location]))
-            if len(info_texts) >= 140:
-                # split into chunks that are close to compression window of 64K but not too big on the wire
-                # (roughly 1300-2600 bytes after compression depending on repetitiveness)
-                ctx.broadcast_team(team, info_texts)
-                info_texts.clear()
-            info_texts.append(json_format_send_event(new_item, target_player))
+            info_texts.append(ctx.encode_msg(json_format_send_event(new_item, target_player)))
         ctx.broadcast_team(team, info_texts)
         del info_texts
         del sortable
 
         ctx.location_checks[team, slot] |= new_locations
-        send_new_items(ctx)
+        ctx.journal_change("location_checks", (team, slot))
+        if deliver_items:
+            send_new_items(ctx)
         ctx.broadcast(ctx.clients[team][slot], [{
             "cmd": "RoomUpdate",
             "hint_points": get_slot_points(ctx, team, slot),
             "checked_locations": new_locations,  # send back new checks only
         }])
         updated_slots: typing.Set[tuple[int, int]] = set()
-        ctx.recheck_hints(team, slot, updated_slots)
+        ctx.recheck_location_hints(team, slot, new_locations, updated_slots)
         for hint_team, hint_slot in updated_slots:
             ctx.on_changed_hints(hint_team, hint_slot)
         ctx.save()
@@ -1594,6 +1969,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
                 get_received_items(self.ctx, self.client.team, self.client.slot, False).append(new_item)
                 get_received_items(self.ctx, self.client.team, self.client.slot, True).append(new_item)
+                self.ctx.pending_item_receivers.add((self.client.team, self.client.slot))
                 self.ctx.broadcast_text_all(
                     'Cheat console: sending "' + item_name + '" to ' + self.ctx.get_aliased_name(self.client.team,
                                                                                                  self.client.slot),
@@ -1612,9 +1988,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
         cost = self.ctx.get_hint_cost(self.client.slot)
         auto_status = HintStatus.HINT_UNSPECIFIED if for_location else HintStatus.HINT_PRIORITY
         if not input_text:
-            hints = {hint.re_check(self.ctx, self.client.team) for hint in
-                     self.ctx.hints[self.client.team, self.client.slot]}
-            self.ctx.hints[self.client.team, self.client.slot] = hints
+            hints = self.ctx.hints[self.client.team, self.client.slot]
             self.ctx.notify_hints(self.client.team, list(hints), recipients=(self.client.slot,))
             self.output(f"A hint costs {self.ctx.get_hint_cost(self.client.slot)} points. "
                         f"You have {points_available} points.")
@@ -1693,8 +2067,9 @@ class ClientMessageProcessor(CommonCommandProcessor):
                 # By popular vote, make hints prefer non-local placements
                 not_found_hints.sort(key=lambda hint: int(hint.receiving_player != hint.finding_player))
                 # By another popular vote, prefer early sphere
-                not_found_hints.sort(key=lambda hint: self.ctx.get_sphere(hint.finding_player, hint.location),
-                                     reverse=True)
+                hint_spheres = self.ctx.get_spheres([(hint.finding_player, hint.location) for hint in not_found_hints])
+                order = sorted(range(len(not_found_hints)), key=hint_spheres.__getitem__, reverse=True)
+                not_found_hints = [not_found_hints[index] for index in order]
 
                 hints = found_hints + old_hints
                 while can_pay > 0:
@@ -1770,7 +2145,7 @@ def get_slot_points(ctx: Context, team: int, slot: int) -> int:
             ctx.get_hint_cost(slot) * ctx.hints_used[team, slot])
 
 
-async def process_client_cmd(ctx: Context, client: Client, args: dict):
+async def process_client_cmd(ctx: Context, client: Client, args: typing.Dict[str, typing.Any]) -> None:
     try:
         cmd: str = args["cmd"]
     except:
@@ -1835,6 +2210,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             client.no_locations = bool(client.tags & _non_game_messages.keys())
             # set NoText for old PopTracker clients that predate the tag to save traffic
             client.no_text = "NoText" in client.tags or ("PopTracker" in client.tags and client.version < (0, 5, 1))
+            client.binary = NetUtils.binary_protocol_tag in client.tags
             connected_packet = {
                 "cmd": "Connected",
                 "team": client.team, "slot": client.slot,
@@ -1848,14 +2224,16 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
             items = get_received_items(ctx, client.team, client.slot, client.remote_items)
             if (start_inventory or items) and not client.no_items:
-                reply.append({"cmd": 'ReceivedItems', "index": 0, "items": start_inventory + items})
+                reply.append(ctx.encode_received_items(0, start_inventory + items))
                 client.send_index = len(start_inventory) + len(items)
-            if not client.auth:  # if this was a Re-Connect, don't print to console
-                client.auth = True
-                await on_client_joined(ctx, client)
+            joined = not client.auth  # if this was a Re-Connect, don't print to console
+            client.auth = True
             if args.get("slot_data", True):
                 connected_packet["slot_data"] = ctx.slot_data[client.slot]
             await ctx.send_msgs(client, reply)
+            if joined:
+                # after Connected, as send_msgs does not overtake the join messages queued for this client
+                await on_client_joined(ctx, client)
 
     elif cmd == "GetDataPackage":
         exclusions = args.get("exclusions", [])
@@ -1892,8 +2270,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                     items = get_received_items(ctx, client.team, client.slot, client.remote_items)
                     if (items or start_inventory) and not client.no_items:
                         client.send_index = len(start_inventory) + len(items)
-                        await ctx.send_msgs(client, [{"cmd": "ReceivedItems", "index": 0,
-                                                      "items": start_inventory + items}])
+                        await ctx.send_msgs(client, [ctx.encode_received_items(0, start_inventory + items)])
                     else:
                         client.send_index = 0
                 except (ValueError, TypeError) as err:
@@ -1910,6 +2287,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                     client.no_text = "NoText" in client.tags or (
                         "PopTracker" in client.tags and client.version < (0, 5, 1)
                     )
+                    client.binary = NetUtils.binary_protocol_tag in client.tags
                     ctx.broadcast_text_all(
                         f"{ctx.get_aliased_name(client.team, client.slot)} (Team #{client.team + 1}) has changed tags "
                         f"from {old_tags} to {client.tags}.",
@@ -1920,8 +2298,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             items = get_received_items(ctx, client.team, client.slot, client.remote_items)
             if (start_inventory or items) and not client.no_items:
                 client.send_index = len(start_inventory) + len(items)
-                await ctx.send_msgs(client, [{"cmd": "ReceivedItems", "index": 0,
-                                              "items": start_inventory + items}])
+                await ctx.send_msgs(client, [ctx.encode_received_items(0, start_inventory + items)])
 
         elif cmd == 'LocationChecks':
             if client.no_locations:
@@ -2060,13 +2437,11 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             tags = set(args.get("tags", []))
             slots = set(args.get("slots", []))
             args["cmd"] = "Bounced"
-            msg = ctx.dumper([args])
-
-            for bounceclient in ctx.endpoints:
-                if client.team == bounceclient.team and (ctx.games[bounceclient.slot] in games or
-                                                         set(bounceclient.tags) & tags or
-                                                         bounceclient.slot in slots):
-                    await ctx.send_encoded_msgs(bounceclient, msg)
+            ctx.queue_msgs((bounceclient for bounceclient in ctx.endpoints
+                            if client.team == bounceclient.team and (ctx.games[bounceclient.slot] in games or
+                                                                     set(bounceclient.tags) & tags or
+                                                                     bounceclient.slot in slots)),
+                           [args])
 
         elif cmd == "Get":
             if "keys" not in args or type(args["keys"]) != list:
@@ -2096,6 +2471,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 func = modify_functions[operation["operation"]]
                 value = func(value, operation["value"])
             ctx.stored_data[args["key"]] = args["value"] = value
+            ctx.journal_change("stored_data", args["key"])
             targets = set(ctx.stored_data_notification_clients[args["key"]])
             if args.get("want_reply", False):
                 targets.add(client)
@@ -2450,6 +2826,16 @@ class ServerCommandProcessor(CommonCommandProcessor):
                         f"approximately totaling {Utils.format_SI_prefix(total, power=1024)}B")
         self.output("\n".join(texts))
 
+    def _cmd_networkstats(self):
+        """Debug Tool: list the outgoing messages by command, with their size on the wire and time spent encoding."""
+        texts = []
+        for cmd, stats in sorted(self.ctx.message_stats.items(), key=lambda item: item[1].bytes, reverse=True):
+            texts.append(f"{cmd}: encoded {stats.encoded} in {stats.encode_time * 1000:.1f}ms | "
+                         f"sent {stats.sent} in {stats.frames} frames | "
+                         f"{Utils.format_SI_prefix(stats.bytes, power=1024)}B")
+        texts.insert(0, f"Sent {sum(stats.sent for stats in self.ctx.message_stats.values())} messages.")
+        self.output("\n".join(texts))
+
 
 async def console(ctx: Context):
     import sys
@@ -2483,6 +2869,9 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--password', default=defaults["password"])
     parser.add_argument('--savefile', default=defaults["savefile"])
     parser.add_argument('--disable_save', default=defaults["disable_save"], action='store_true')
+    parser.add_argument('--journal_save', default=defaults["journal_save"], action='store_true',
+                        help="Save changes to a journal next to the save file and rewrite the full save file only "
+                             "once the journal has grown larger than it.")
     parser.add_argument('--cert', help="Path to a SSL Certificate for encryption.")
     parser.add_argument('--cert_key', help="Path to SSL Certificate Key file")
     parser.add_argument('--loglevel', default=defaults["loglevel"],
@@ -2606,6 +2995,7 @@ async def main(args: argparse.Namespace):
         logging.exception(f"Failed to read multiworld data ({e})")
         raise
 
+    ctx.journal_save = args.journal_save
     ctx.init_save(not args.disable_save)
 
     ssl_context = load_server_cert(args.cert, args.cert_key) if args.cert else None
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+from array import array
+from bisect import bisect_left
+from collections.abc import Collection, Iterable, Mapping, Sequence
 import typing
 import enum
+import io
+import pickle
+import struct
+import sys
 import warnings
+import zlib
 from json import JSONEncoder, JSONDecoder
 
 if typing.TYPE_CHECKING:
     from websockets import WebSocketServerProtocol as ServerConnection
 
-from Utils import ByValue, Version
+from Utils import ByValue, Version, restricted_loads
 
 
 class HintStatus(ByValue, enum.IntEnum):
@@ -172,6 +179,241 @@ def _object_hook(o: typing.Any) -> typing.Any:
 
 decode = JSONDecoder(object_hook=_object_hook).decode
 
+binary_protocol_tag = "BinaryProtocol"
+"""Connect tag of clients that accept binary frames from build_binary_frame, instead of JSON text."""
+max_binary_size = 16 * 1024 * 1024
+"""The most bytes a compressed binary frame may decompress to."""
+max_binary_depth = 64
+"""The deepest lists and dicts may be nested in a binary frame."""
+
+_BINARY_FRAME = 0x01
+_BINARY_FRAME_COMPRESSED = 0x02
+_NONE, _FALSE, _TRUE, _INT8, _INT32, _INT64, _BIG_INT, _FLOAT, _STR, _LIST, _DICT, _INTS32, _INTS64, _ITEMS = range(14)
+_uint32 = struct.Struct("<I")
+_int8 = struct.Struct("<b")
+_int32 = struct.Struct("<i")
+_int64 = struct.Struct("<q")
+_float = struct.Struct("<d")
+_typecode_int32 = next(code for code in "il" if array(code).itemsize == 4)
+_typecode_int64 = next(code for code in "lq" if array(code).itemsize == 8)
+_little_endian = sys.byteorder == "little"
+_json_keys = {None: "null", True: "true", False: "false"}
+
+
+def _pack_length(length: int) -> bytes:
+    # lengths below 255 take a single byte
+    return bytes((length,)) if length < 0xFF else b"\xff" + _uint32.pack(length)
+
+
+def _unpack_length(data: bytes, position: int) -> typing.Tuple[int, int]:
+    length = data[position]
+    if length < 0xFF:
+        return length, position + 1
+    return _uint32.unpack_from(data, position + 1)[0], position + 5
+
+
+def _pack_ints(typecode: str, values: Iterable[int]) -> bytes:
+    packed = array(typecode, values)
+    if not _little_endian:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_ints(typecode: str, data: bytes) -> array:
+    unpacked = array(typecode)
+    unpacked.frombytes(data)
+    if not _little_endian:
+        unpacked.byteswap()
+    return unpacked
+
+
+def _encode_binary(obj: typing.Any, buffer: bytearray) -> None:
+    # follows the JSON encoding of encode, so that decode_binary returns the same as decode
+    if obj is None:
+        buffer.append(_NONE)
+    elif obj is True:
+        buffer.append(_TRUE)
+    elif obj is False:
+        buffer.append(_FALSE)
+    elif isinstance(obj, str):
+        data = obj.encode()
+        buffer.append(_STR)
+        buffer += _pack_length(len(data))
+        buffer += data
+    elif isinstance(obj, int):
+        if -0x80 <= obj < 0x80:
+            buffer.append(_INT8)
+            buffer += _int8.pack(obj)
+        elif -0x8000_0000 <= obj < 0x8000_0000:
+            buffer.append(_INT32)
+            buffer += _int32.pack(obj)
+        elif -0x8000_0000_0000_0000 <= obj < 0x8000_0000_0000_0000:
+            buffer.append(_INT64)
+            buffer += _int64.pack(obj)
+        else:
+            data = int(obj).to_bytes((obj.bit_length() + 8) // 8, "little", signed=True)
+            buffer.append(_BIG_INT)
+            buffer += _pack_length(len(data))
+            buffer += data
+    elif isinstance(obj, float):
+        buffer.append(_FLOAT)
+        buffer += _float.pack(obj)
+    elif isinstance(obj, tuple) and hasattr(obj, "_fields"):
+        data = obj._asdict()
+        data["class"] = obj.__class__.__name__
+        _encode_binary(data, buffer)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        if obj and all(type(o) is NetworkItem for o in obj):
+            buffer.append(_ITEMS)
+            buffer += _pack_length(len(obj))
+            buffer += _pack_ints(_typecode_int64, (value for item in obj for value in item))
+            return
+        if obj and all(type(o) is int for o in obj):
+            if -0x8000_0000 <= min(obj) and max(obj) < 0x8000_0000:
+                buffer.append(_INTS32)
+                buffer += _pack_length(len(obj))
+                buffer += _pack_ints(_typecode_int32, obj)
+                return
+            if -0x8000_0000_0000_0000 <= min(obj) and max(obj) < 0x8000_0000_0000_0000:
+                buffer.append(_INTS64)
+                buffer += _pack_length(len(obj))
+                buffer += _pack_ints(_typecode_int64, obj)
+                return
+        buffer.append(_LIST)
+        buffer += _pack_length(len(obj))
+        for o in obj:
+            _encode_binary(o, buffer)
+    elif isinstance(obj, dict):
+        buffer.append(_DICT)
+        buffer += _pack_length(len(obj))
+        for key, value in obj.items():
+            if not isinstance(key, str):
+                key = _json_keys.get(key) if key is None or isinstance(key, bool) else \
+                    repr(float(key)) if isinstance(key, float) else str(int(key))
+            _encode_binary(key, buffer)
+            _encode_binary(value, buffer)
+    else:
+        raise TypeError(f"Object of type {obj.__class__.__name__} is not binary serializable")
+
+
+def encode_binary_value(obj: typing.Any) -> bytes:
+    """Encodes obj without a frame header, to be sent with build_binary_frame."""
+    buffer = bytearray()
+    _encode_binary(obj, buffer)
+    return bytes(buffer)
+
+
+def build_binary_frame(values: Sequence[bytes], compress: bool = False) -> bytes:
+    """Builds a binary frame holding a list of values from encode_binary_value."""
+    data = b"".join((bytes((_LIST,)), _pack_length(len(values)), *values))
+    if compress:
+        return bytes((_BINARY_FRAME_COMPRESSED,)) + zlib.compress(data, 1)
+    return bytes((_BINARY_FRAME,)) + data
+
+
+def _decode_binary(data: bytes, position: int, depth: int) -> typing.Tuple[typing.Any, int]:
+    tag = data[position]
+    position += 1
+    if tag == _STR:
+        length = data[position]
+        if length < 0xFF:
+            position += 1
+        else:
+            length, = _uint32.unpack_from(data, position + 1)
+            position += 5
+        return data[position:position + length].decode(), position + length
+    if tag == _INT8:
+        return _int8.unpack_from(data, position)[0], position + 1
+    if tag == _INT32:
+        return _int32.unpack_from(data, position)[0], position + 4
+    if tag == _DICT:
+        if depth >= max_binary_depth:
+            raise ValueError(f"Binary frame nested deeper than {max_binary_depth}")
+        length, position = _unpack_length(data, position)
+        obj = {}
+        for _ in range(length):
+            key, position = _decode_binary(data, position, depth + 1)
+            obj[key], position = _decode_binary(data, position, depth + 1)
+        return _object_hook(obj) if "class" in obj else obj, position
+    if tag == _LIST:
+        if depth >= max_binary_depth:
+            raise ValueError(f"Binary frame nested deeper than {max_binary_depth}")
+        length, position = _unpack_length(data, position)
+        obj = []
+        for _ in range(length):
+            value, position = _decode_binary(data, position, depth + 1)
+            obj.append(value)
+        return obj, position
+    if tag == _ITEMS:
+        length, position = _unpack_length(data, position)
+        end = position + length * 4 * 8
+        values = iter(_unpack_ints(_typecode_int64, data[position:end]))
+        return [NetworkItem(*fields) for fields in zip(values, values, values, values)], end
+    if tag == _INTS32:
+        length, position = _unpack_length(data, position)
+        end = position + length * 4
+        return _unpack_ints(_typecode_int32, data[position:end]).tolist(), end
+    if tag == _INTS64:
+        length, position = _unpack_length(data, position)
+        end = position + length * 8
+        return _unpack_ints(_typecode_int64, data[position:end]).tolist(), end
+    if tag == _NONE:
+        return None, position
+    if tag == _TRUE:
+        return True, position
+    if tag == _FALSE:
+        return False, position
+    if tag == _INT64:
+        return _int64.unpack_from(data, position)[0], position + 8
+    if tag == _FLOAT:
+        return _float.unpack_from(data, position)[0], position + 8
+    if tag == _BIG_INT:
+        length, position = _unpack_length(data, position)
+        return int.from_bytes(data[position:position + length], "little", signed=True), position + length
+    raise ValueError(f"Unknown binary tag {tag} at {position - 1}")
+
+
+def decode_binary(frame: bytes) -> typing.Any:
+    """Decodes a frame of build_binary_frame."""
+    if not frame:
+        raise ValueError("Empty binary frame")
+    if frame[0] == _BINARY_FRAME_COMPRESSED:
+        decompressor = zlib.decompressobj()
+        try:
+            data = decompressor.decompress(memoryview(frame)[1:], max_binary_size)
+        except zlib.error as error:
+            raise ValueError("Invalid compressed binary frame") from error
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Binary frame decompresses to more than {max_binary_size} bytes")
+        if not decompressor.eof or decompressor.unused_data:
+            raise ValueError("Invalid compressed binary frame")
+        position = 0
+    elif frame[0] == _BINARY_FRAME:
+        data = bytes(frame)
+        position = 1
+    else:
+        raise ValueError(f"Unknown binary frame type {frame[0]}")
+    try:
+        obj, position = _decode_binary(data, position, 0)
+    except (IndexError, struct.error) as error:
+        raise ValueError("Truncated binary frame") from error
+    if position != len(data):
+        raise ValueError(f"{len(data) - position} bytes of trailing data in binary frame")
+    return obj
+
+
+def decode_frame(frame: typing.Union[str, bytes], binary: bool = True) -> typing.Any:
+    """
+    Decodes a websocket frame, which is JSON text or binary from build_binary_frame.
+
+    :param binary: if binary frames are accepted, which is only the case for peers that sent binary_protocol_tag
+    """
+    if isinstance(frame, str):
+        return decode(frame)
+    if not binary:
+        raise ValueError("Binary frame from a peer that did not send the binary protocol tag")
+    return decode_binary(frame)
+
 
 class Endpoint:
     socket: "ServerConnection"
@@ -425,6 +667,22 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
         if len(self.get(0, {})):
             raise ValueError("Invalid player id 0 for location")
 
+    @classmethod
+    def from_columns(cls, senders: Sequence[int], counts: Sequence[int], locations: Sequence[int],
+                     items: Sequence[int], receivers: Sequence[int], flags: Sequence[int]) -> _LocationStore:
+        if len(counts) != len(senders):
+            raise ValueError("Senders and counts differ in length")
+        if not len(locations) == len(items) == len(receivers) == len(flags) == sum(counts):
+            raise ValueError("Location columns differ in length")
+        values: typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]] = {}
+        start = 0
+        for sender, count in zip(senders, counts):
+            end = start + count
+            values[sender] = dict(zip(locations[start:end],
+                                      zip(items[start:end], receivers[start:end], flags[start:end])))
+            start = end
+        return cls(values)
+
     def find_item(self, slots: typing.Set[int], seeked_item_id: int
                   ) -> typing.Generator[typing.Tuple[int, int, int, int, int], None, None]:
         for finding_player, check_data in self.items():
@@ -472,6 +730,131 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
                         location_id not in checked])
 
 
+class LocationTable(Mapping[int, typing.Dict[int, typing.Tuple[int, int, int]]]):
+    """
+    The locations of a multidata as parallel columns, sorted by sending player and location ID.
+    Reads like the nested dicts it stands in for, building the dict of a player on first access,
+    while LocationStore.from_columns loads it without building any of them.
+    """
+    senders: array
+    counts: array
+    location_ids: array
+    item_ids: array
+    receivers: array
+    flags: array
+    _ranges: typing.Dict[int, typing.Tuple[int, int]]
+    _players: typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]]
+
+    def __init__(self, senders: array, counts: array, location_ids: array, item_ids: array, receivers: array,
+                 flags: array):
+        self.senders = senders
+        self.counts = counts
+        self.location_ids = location_ids
+        self.item_ids = item_ids
+        self.receivers = receivers
+        self.flags = flags
+        self._ranges = {}
+        self._players = {}
+        start = 0
+        for sender, count in zip(senders, counts):
+            self._ranges[sender] = start, start + count
+            start += count
+
+    @classmethod
+    def from_dict(cls, locations: Mapping[int, Mapping[int, Sequence[int]]]) -> LocationTable:
+        senders = sorted(locations)
+        counts = array(_typecode_int32)
+        location_ids = array(_typecode_int64)
+        item_ids = array(_typecode_int64)
+        receivers = array(_typecode_int32)
+        flags = array(_typecode_int32)
+        for sender in senders:
+            sender_locations = sorted(locations[sender].items())
+            counts.append(len(sender_locations))
+            location_ids.extend(location_id for location_id, _ in sender_locations)
+            item_ids.extend(data[0] for _, data in sender_locations)
+            receivers.extend(data[1] for _, data in sender_locations)
+            flags.extend(data[2] for _, data in sender_locations)
+        return cls(array(_typecode_int32, senders), counts, location_ids, item_ids, receivers, flags)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> LocationTable:
+        sender_count, = _uint32.unpack_from(data)
+        location_count, = _uint32.unpack_from(data, 4)
+        columns: typing.List[array] = []
+        position = 8
+        for typecode, length in ((_typecode_int32, sender_count), (_typecode_int32, sender_count),
+                                 (_typecode_int64, location_count), (_typecode_int64, location_count),
+                                 (_typecode_int32, location_count), (_typecode_int32, location_count)):
+            size = array(typecode).itemsize * length
+            columns.append(_unpack_ints(typecode, data[position:position + size]))
+            position += size
+        return cls(*columns)
+
+    def to_bytes(self) -> bytes:
+        return b"".join((_uint32.pack(len(self.senders)), _uint32.pack(len(self.location_ids)),
+                         *(_pack_ints(column.typecode, column) for column in self.columns)))
+
+    @property
+    def columns(self) -> typing.Tuple[array, array, array, array, array, array]:
+        return self.senders, self.counts, self.location_ids, self.item_ids, self.receivers, self.flags
+
+    def __getitem__(self, player: int) -> typing.Dict[int, typing.Tuple[int, int, int]]:
+        player_locations = self._players.get(player)
+        if player_locations is None:
+            start, end = self._ranges[player]
+            player_locations = dict(zip(self.location_ids[start:end], zip(self.item_ids[start:end],
+                                                                          self.receivers[start:end],
+                                                                          self.flags[start:end])))
+            self._players[player] = player_locations
+        return player_locations
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self._ranges)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+
+class SphereStore:
+    """
+    Maps (player, location_id) to the index of the sphere the location is in.
+    Keeps the sorted location IDs of each player and their spheres in two parallel arrays,
+    which take a fraction of the memory nested dicts or the sets of the multidata spheres would.
+    """
+    _location_ids: typing.Dict[int, array]
+    _spheres: typing.Dict[int, array]
+
+    def __init__(self, spheres: Sequence[Mapping[int, Collection[int]]]):
+        player_locations: typing.Dict[int, typing.List[typing.Tuple[int, int]]] = {}
+        for sphere_index, sphere in enumerate(spheres):
+            for player, location_ids in sphere.items():
+                player_locations.setdefault(player, []).extend(
+                    (location_id, sphere_index) for location_id in location_ids)
+        self._location_ids = {}
+        self._spheres = {}
+        for player, locations in player_locations.items():
+            locations.sort()
+            self._location_ids[player] = array("q", [location_id for location_id, _ in locations])
+            self._spheres[player] = array("I", [sphere_index for _, sphere_index in locations])
+
+    def __len__(self) -> int:
+        return sum(len(location_ids) for location_ids in self._location_ids.values())
+
+    def get_sphere(self, player: int, location_id: int) -> int:
+        location_ids = self._location_ids.get(player)
+        if location_ids is not None:
+            index = bisect_left(location_ids, location_id)
+            if index < len(location_ids) and location_ids[index] == location_id:
+                return self._spheres[player][index]
+        raise KeyError(f"No Sphere found for location ID {location_id} belonging to player {player}. "
+                       f"Location or player may not exist.")
+
+    def get_spheres(self, locations: Iterable[typing.Tuple[int, int]]) -> typing.List[int]:
+        """Resolves many (player, location_id) pairs at once, in order."""
+        return [self.get_sphere(player, location_id) for player, location_id in locations]
+
+
 class MinimumVersions(typing.TypedDict):
     server: tuple[int, int, int]
     clients: dict[int, tuple[int, int, int]]
@@ -508,6 +891,152 @@ class MultiData(typing.TypedDict):
     race_mode: int
 
 
+multidata_format_version = 4
+_index_offset = struct.Struct("<Q")
+
+
+class _CompressingWriter:
+    """Compresses what a pickler writes to it as it goes, so the uncompressed pickle never exists as a whole."""
+    def __init__(self) -> None:
+        self.compressor = zlib.compressobj(9)
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.data += self.compressor.compress(data)
+        return len(data)
+
+    def finish(self) -> bytes:
+        self.data += self.compressor.flush()
+        return bytes(self.data)
+
+
+def encode_multidata_section(name: str, value: typing.Any) -> bytes:
+    """Compresses a single section of a multidata, like restricted_dumps asserting that it can be loaded again."""
+    if name == "locations":
+        if not isinstance(value, LocationTable):
+            value = LocationTable.from_dict(value)
+        # level 9 takes ten times as long on packed integers, for a few percent
+        return zlib.compress(value.to_bytes())
+    writer = _CompressingWriter()
+    pickle.Pickler(writer).dump(value)
+    data = writer.finish()
+    try:
+        decode_multidata_section(name, data)
+    except pickle.UnpicklingError as e:
+        raise pickle.PicklingError(e) from e
+    return data
+
+
+def decode_multidata_section(name: str, data: bytes) -> typing.Any:
+    if name == "locations":
+        return LocationTable.from_bytes(zlib.decompress(data))
+    return restricted_loads(zlib.decompress(data))
+
+
+class MultiDataWriter:
+    """
+    Writes a multidata of format 4 to a binary file one section at a time, so only one of them has to be encoded at
+    a time. After the format byte follow the separately compressed sections, an index of where they are and the
+    offset of that index, so writing never needs to seek back and works on zip entries opened for writing as well.
+    """
+    file: typing.BinaryIO
+    index: typing.Dict[str, typing.Tuple[int, int]]
+    offset: int
+
+    def __init__(self, file: typing.BinaryIO):
+        self.file = file
+        self.index = {}
+        self.offset = 0
+        self._write(bytes((multidata_format_version,)))
+
+    def _write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.offset += len(data)
+
+    def write_section(self, name: str, value: typing.Any) -> None:
+        self.write_raw_section(name, encode_multidata_section(name, value))
+
+    def write_raw_section(self, name: str, data: bytes) -> None:
+        """Writes an already compressed section, like one copied from another multidata."""
+        if name in self.index:
+            raise KeyError(f"Section {name} was already written.")
+        self.index[name] = self.offset, len(data)
+        self._write(data)
+
+    def close(self) -> None:
+        index_offset = self.offset
+        self._write(pickle.dumps(self.index))
+        self._write(_index_offset.pack(index_offset))
+
+    def __enter__(self) -> MultiDataWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+
+
+class LazyMultiData(typing.MutableMapping[str, typing.Any]):
+    """
+    A multidata of format 4, which decodes each of its sections on first access, so a consumer only pays for the
+    sections it uses. Its locations are a LocationTable. Sections that were never accessed are written back as they
+    are by write.
+    """
+    _sections: typing.Dict[str, memoryview]
+    _decoded: typing.Dict[str, typing.Any]
+
+    def __init__(self, data: bytes):
+        view = memoryview(data)
+        if view[0] != multidata_format_version:
+            raise ValueError(f"Expected multidata of format {multidata_format_version}, got {view[0]}.")
+        index_end = len(view) - _index_offset.size
+        index_offset, = _index_offset.unpack_from(view, index_end)
+        index: typing.Dict[str, typing.Tuple[int, int]] = restricted_loads(view[index_offset:index_end])
+        self._sections = {name: view[offset:offset + length] for name, (offset, length) in index.items()}
+        self._decoded = {}
+
+    def __getitem__(self, name: str) -> typing.Any:
+        try:
+            return self._decoded[name]
+        except KeyError:
+            pass
+        # raw sections are kept, so concurrent readers at worst decode a section twice
+        return self._decoded.setdefault(name, decode_multidata_section(name, self._sections[name]))
+
+    def __setitem__(self, name: str, value: typing.Any) -> None:
+        self._decoded[name] = value
+        self._sections.pop(name, None)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._decoded.pop(name, None)
+        self._sections.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._sections or name in self._decoded
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(dict.fromkeys([*self._sections, *self._decoded]))
+
+    def __len__(self) -> int:
+        return len(self._sections.keys() | self._decoded.keys())
+
+    def write(self, file: typing.BinaryIO) -> None:
+        """Writes the multidata, re-encoding only the sections that were accessed, as they may have changed."""
+        with MultiDataWriter(file) as writer:
+            for name in self:
+                if name in self._decoded:
+                    writer.write_section(name, self._decoded[name])
+                else:
+                    writer.write_raw_section(name, self._sections[name])
+
+    def to_bytes(self) -> bytes:
+        data = io.BytesIO()
+        self.write(data)
+        return data.getvalue()
+
+
 if typing.TYPE_CHECKING:  # type-check with pure python implementation until we have a typing stub
     LocationStore = _LocationStore
 else:
@@ -7,6 +7,7 @@ import multiprocessing
 import os
 import subprocess
 import base64
+import bisect
 import logging
 import asyncio
 import enum
@@ -515,7 +516,29 @@ async def snes_recv_loop(ctx: SNIContext) -> None:
             ctx.snes_autoreconnect_task = asyncio.create_task(snes_autoreconnect(ctx), name="snes auto-reconnect")
 
 
-async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional[bytes]:
+def merge_snes_ranges(ranges: typing.Iterable[typing.Tuple[int, int]]) -> typing.List[typing.Tuple[int, int]]:
+    """Sorts (address, size) ranges and merges the ones that overlap or are adjacent."""
+    merged: typing.List[typing.Tuple[int, int]] = []
+    for address, size in sorted(ranges):
+        if merged and address <= merged[-1][0] + merged[-1][1]:
+            merged_address, merged_size = merged[-1]
+            merged[-1] = (merged_address, max(merged_size, address + size - merged_address))
+        else:
+            merged.append((address, size))
+    return merged
+
+
+async def snes_read_ranges(ctx: SNIContext, ranges: typing.Sequence[typing.Tuple[int, int]]) \
+        -> typing.Optional[typing.List[bytes]]:
+    """
+    Reads several (address, size) ranges with a single GetAddress request.
+    Overlapping and adjacent ranges are merged into one operand pair, and the reply is split back into the data of
+    each requested range, in the order they were given. Returns None if the read failed.
+    """
+    if not ranges:
+        return []
+    merged = merge_snes_ranges(ranges)
+    total_size = sum(size for _, size in merged)
     try:
         await ctx.snes_request_lock.acquire()
 
@@ -530,7 +553,7 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
         GetAddress_Request: SNESRequest = {
             "Opcode": "GetAddress",
             "Space": "SNES",
-            "Operands": [hex(address)[2:], hex(size)[2:]]
+            "Operands": [operand for address, size in merged for operand in (hex(address)[2:], hex(size)[2:])]
         }
         try:
             await ctx.snes_socket.send(dumps(GetAddress_Request))
@@ -538,25 +561,43 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
             return None
 
         data: bytes = bytes()
-        while len(data) < size:
+        while len(data) < total_size:
             try:
                 data += await asyncio.wait_for(ctx.snes_recv_queue.get(), 5)
             except asyncio.TimeoutError:
                 break
 
-        if len(data) != size:
-            snes_logger.error('Error reading %s, requested %d bytes, received %d' % (hex(address), size, len(data)))
+        if len(data) != total_size:
+            snes_logger.error('Error reading %s, requested %d bytes, received %d' % (
+                ", ".join(hex(address) for address, _ in merged), total_size, len(data)))
             if len(data):
                 snes_logger.error(str(data))
                 snes_logger.warning('Communication Failure with SNI')
             if ctx.snes_socket is not None and not ctx.snes_socket.closed:
                 await ctx.snes_socket.close()
             return None
-
-        return data
     finally:
         ctx.snes_request_lock.release()
 
+    # the data of every merged range starts at the sum of the sizes of the merged ranges before it
+    offsets: typing.List[int] = []
+    offset = 0
+    for _, size in merged:
+        offsets.append(offset)
+        offset += size
+    merged_starts = [address for address, _ in merged]
+    results: typing.List[bytes] = []
+    for address, size in ranges:
+        index = bisect.bisect_right(merged_starts, address) - 1
+        start = offsets[index] + address - merged_starts[index]
+        results.append(data[start:start + size])
+    return results
+
+
+async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional[bytes]:
+    data = await snes_read_ranges(ctx, [(address, size)])
+    return data[0] if data is not None else None
+
 
 async def snes_write(ctx: SNIContext, write_list: typing.List[typing.Tuple[int, bytes]]) -> bool:
     try:
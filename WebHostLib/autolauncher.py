@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import heapq
 import json
 import logging
 import multiprocessing
+import queue
 import typing
 from datetime import timedelta, datetime
 from threading import Event, Thread
@@ -99,6 +101,65 @@ def cleanup():
         logging.info(f"{rooms} Rooms, {seeds} Seeds and {slots} Slots have been deleted.")
 
 
+class RoomScheduler:
+    """
+    Starts the rooms that had activity within their timeout, each on the hoster hosting the fewest rooms.
+    Every tick only queries the rooms whose last_activity changed since the previous tick, and the rooms that shut
+    down. The deadlines of the rooms that want to be hosted are tracked in a heap.
+    """
+    start_grace = timedelta(seconds=5)  # rooms are started until this long after their timeout
+    query_overlap = timedelta(seconds=10)  # catches activity that was committed after a tick queried it
+    max_query_rooms = 500  # rooms per query, to stay below the parameter limit of the database
+
+    def __init__(self, hosters: typing.Sequence[MultiworldInstance]):
+        self.hosters = hosters
+        self.hosted: dict[UUID, MultiworldInstance] = {}
+        self.deadlines: dict[UUID, datetime] = {}
+        self.deadline_heap: list[tuple[datetime, UUID]] = []
+        self.last_query: datetime | None = None
+
+    @db_session
+    def tick(self, now: datetime | None = None) -> None:
+        now = now or datetime.utcnow()
+        since = now - timedelta(days=3) if self.last_query is None else self.last_query - self.query_overlap
+        self.last_query = now
+        rooms = list(select(room for room in Room if room.last_activity >= since))
+        shut_down = self.collect_shut_down_rooms()
+        for start in range(0, len(shut_down), self.max_query_rooms):
+            # rooms that shut down while they were wanted have to be started again
+            query_room_ids = shut_down[start:start + self.max_query_rooms]
+            rooms.extend(select(room for room in Room if room.id in query_room_ids))
+        for room in rooms:
+            # the per-room timeout can't currently be PonyORM transpiled.
+            self.update_room(room.id, room.last_activity + timedelta(seconds=room.timeout) + self.start_grace, now)
+        while self.deadline_heap and self.deadline_heap[0][0] <= now:
+            deadline, room_id = heapq.heappop(self.deadline_heap)
+            if self.deadlines.get(room_id) == deadline:
+                del self.deadlines[room_id]
+
+    def collect_shut_down_rooms(self) -> list[UUID]:
+        shut_down = []
+        for hoster in self.hosters:
+            for room_id in hoster.collect_shut_down_rooms():
+                if self.hosted.get(room_id) is hoster:
+                    del self.hosted[room_id]
+                shut_down.append(room_id)
+        return shut_down
+
+    def update_room(self, room_id: UUID, deadline: datetime, now: datetime) -> None:
+        """Starts the room if it is wanted until deadline and not hosted yet."""
+        if deadline <= now:
+            self.deadlines.pop(room_id, None)
+            return
+        if self.deadlines.get(room_id) != deadline:
+            self.deadlines[room_id] = deadline
+            heapq.heappush(self.deadline_heap, (deadline, room_id))
+        if room_id not in self.hosted:
+            hoster = min(self.hosters, key=lambda hoster: len(hoster.room_ids))
+            self.hosted[room_id] = hoster
+            hoster.start_room(room_id)
+
+
 def autohost(config: dict):
     def keep_running():
         stop_event = _stop_event
@@ -111,15 +172,9 @@ def autohost(config: dict):
                     hosters.append(hoster)
                     hoster.start()
 
+                scheduler = RoomScheduler(hosters)
                 while not stop_event.wait(0.1):
-                    with db_session:
-                        rooms = select(
-                            room for room in Room if
-                            room.last_activity >= datetime.utcnow() - timedelta(days=3))
-                        for room in rooms:
-                            # we have to filter twice, as the per-room timeout can't currently be PonyORM transpiled.
-                            if room.last_activity >= datetime.utcnow() - timedelta(seconds=room.timeout + 5):
-                                hosters[room.id.int % len(hosters)].start_room(room.id)
+                    scheduler.tick()
 
         except AlreadyRunningException:
             logging.info("Autohost reports as already running, not starting another.")
@@ -189,14 +244,23 @@ class MultiworldInstance():
         self.process = process
 
     def start_room(self, room_id):
-        while not self.rooms_shutting_down.empty():
-            self.room_ids.remove(self.rooms_shutting_down.get(block=True, timeout=None))
         if room_id in self.room_ids:
             pass  # should already be hosted currently.
         else:
             self.room_ids.add(room_id)
             self.rooms_to_start.put(room_id)
 
+    def collect_shut_down_rooms(self) -> list[UUID]:
+        """Returns the rooms that shut down since the last call, which are no longer hosted."""
+        shut_down = []
+        while True:
+            try:
+                room_id = self.rooms_shutting_down.get_nowait()
+            except queue.Empty:
+                return shut_down
+            self.room_ids.discard(room_id)
+            shut_down.append(room_id)
+
     def stop(self):
         if self.process:
             self.process.terminate()
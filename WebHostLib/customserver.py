@@ -19,7 +19,8 @@ from pony.orm import commit, db_session, select
 
 import Utils
 
-from MultiServer import Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, load_server_cert
+from MultiServer import Context, GameLookups, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, \
+    load_server_cert
 from Utils import restricted_loads, cache_argsless
 from .locker import Locker
 from .models import Command, GameDataPackage, Room, db
@@ -52,11 +53,144 @@ MultiServer.client_message_processor = CustomClientMessageProcessor
 del MultiServer
 
 
+class SharedNames(dict):
+    """Name lookup shared between rooms, which names unknown ids without adding them."""
+    __slots__ = ("kind",)
+
+    def __init__(self, kind: str, names: typing.Mapping[int, str]):
+        super().__init__(names)
+        self.kind = kind
+
+    def __missing__(self, key: int) -> str:
+        return f"Unknown {self.kind} (ID:{key})"
+
+
+def approximate_size(obj: typing.Any, deep: bool) -> int:
+    """Approximates the memory used by obj's containers, and by everything they hold if deep is set."""
+    seen: typing.Set[int] = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, dict):
+            size += sys.getsizeof(obj)
+            stack.extend(obj.values())
+            if deep:
+                stack.extend(obj)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sys.getsizeof(obj)
+            if deep or isinstance(obj, tuple):
+                stack.extend(obj)
+        elif deep:
+            size += sys.getsizeof(obj)
+    return size
+
+
+class GameDataCache:
+    """
+    Game data of the rooms of a hosting process, by checksum, shared by reference between all of them.
+    Entries must not be modified. The least recently used entries are dropped once more than max_size are cached.
+    """
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self.entries: collections.OrderedDict[typing.Hashable, typing.Tuple[typing.Any, int]] = \
+            collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: typing.Hashable, build: typing.Callable[[], typing.Any],
+            deep: bool = False) -> typing.Tuple[typing.Any, int, bool]:
+        """
+        Returns the entry of key, building it if it is not cached, along with its approximate size in bytes and
+        whether it was cached. None is returned, but not cached, if build returns None.
+        """
+        entry = self.entries.get(key, None)
+        if entry:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1], True
+        value = build()
+        if value is None:
+            return None, 0, False
+        size = approximate_size(value, deep)
+        self.entries[key] = value, size
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        self.misses += 1
+        return value, size, False
+
+
+game_data_cache = GameDataCache()
+
+
+def load_game_data_package(checksum: str) -> typing.Optional[typing.Tuple[dict, dict, typing.Optional[dict]]]:
+    """Loads a custom data package, without its groups, and its item and location name groups from the database."""
+    row = GameDataPackage.get(checksum=checksum)
+    if not row:
+        return None
+    game_data = restricted_loads(row.data)
+    return game_data, game_data.pop("item_name_groups"), game_data.pop("location_name_groups", None)
+
+
 class DBCommandProcessor(ServerCommandProcessor):
     def output(self, text: str):
         self.ctx.logger.info(text)
 
 
+class DBCommandDispatcher:
+    """
+    Delivers the Commands of all rooms hosted by a process, with one query per interval instead of one per room,
+    to the command processor of each room, on the room's event loop.
+    """
+    max_query_rooms = 500  # rooms per query, to stay below the parameter limit of the database
+
+    def __init__(self, interval: float = 1):
+        self.interval = interval
+        self.rooms: typing.Dict[typing.Any, typing.Tuple[asyncio.AbstractEventLoop, typing.Callable[[str], None]]] = {}
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        threading.Thread(target=self.run, name="DBCommandDispatcher", daemon=True).start()
+
+    def add_room(self, room_id, loop: asyncio.AbstractEventLoop, processor: typing.Callable[[str], None]) -> None:
+        with self.lock:
+            self.rooms[room_id] = loop, processor
+
+    def remove_room(self, room_id) -> None:
+        with self.lock:
+            self.rooms.pop(room_id, None)
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.dispatch()
+            except Exception as e:
+                logging.exception(e)
+
+    @db_session
+    def dispatch(self) -> None:
+        """Routes the Commands of all added rooms to their processor and deletes them."""
+        with self.lock:
+            rooms = dict(self.rooms)
+        room_ids = list(rooms)
+        for start in range(0, len(room_ids), self.max_query_rooms):
+            query_room_ids = room_ids[start:start + self.max_query_rooms]
+            commands = select(command for command in Command if command.room.id in query_room_ids)
+            if commands:
+                for command in commands:
+                    loop, processor = rooms[command.room.id]
+                    loop.call_soon_threadsafe(processor, command.commandtext)
+                    command.delete()
+                commit()
+
+
+db_command_dispatcher = DBCommandDispatcher()
+
+
 class WebHostContext(Context):
     room_id: int
 
@@ -68,6 +202,7 @@ class WebHostContext(Context):
                                              40, True, "enabled", "enabled",
                                              "enabled", 0, 2, logger=logger)
         del self.static_server_data
+        self.shared_game_data_size = 0
         self.main_loop = asyncio.get_running_loop()
         self.video = {}
         self.tags = ["AP", "WebHost"]
@@ -84,20 +219,25 @@ class WebHostContext(Context):
         for key, value in self.static_server_data.items():
             # NOTE: attributes are mutable and shared, so they will have to be copied before being modified
             setattr(self, key, value)
-        self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
-
-    def listen_to_db_commands(self):
-        cmdprocessor = DBCommandProcessor(self)
-
-        while not self.exit_event.is_set():
-            with db_session:
-                commands = select(command for command in Command if command.room.id == self.room_id)
-                if commands:
-                    for command in commands:
-                        self.main_loop.call_soon_threadsafe(cmdprocessor, command.commandtext)
-                        command.delete()
-                    commit()
-            time.sleep(5)
+        self.non_hintable_names = game_data_cache.get(
+            "non_hintable_names", lambda: collections.defaultdict(frozenset, self.non_hintable_names))[0]
+
+    def build_game_lookups(self, game_name: str) -> GameLookups:
+        checksum = self.gamespackage[game_name].get("checksum", None)
+        if not checksum:
+            return super().build_game_lookups(game_name)
+
+        def build() -> GameLookups:
+            lookups = super(WebHostContext, self).build_game_lookups(game_name)
+            return GameLookups(SharedNames("item", lookups.item_names), SharedNames("location", lookups.location_names),
+                               frozenset(lookups.all_item_and_group_names),
+                               frozenset(lookups.all_location_and_group_names))
+
+        archipelago_checksum = self.gamespackage.get("Archipelago", {}).get("checksum", None)
+        lookups, size, cached = game_data_cache.get(("lookups", game_name, checksum, archipelago_checksum), build)
+        if cached:
+            self.shared_game_data_size += size
+        return lookups
 
     @db_session
     def load(self, room_id: int):
@@ -127,9 +267,18 @@ class WebHostContext(Context):
                     # games package could be dropped from static data once all rooms embed data package
                     del multidata["datapackage"][game]
                 else:
-                    row = GameDataPackage.get(checksum=game_data["checksum"])
-                    if row:  # None if rolled on >= 0.3.9 but uploaded to <= 0.3.8. multidata should be complete
-                        game_data_packages[game] = restricted_loads(row.data)
+                    package, size, cached = game_data_cache.get(
+                        ("package", game_data["checksum"]),
+                        functools.partial(load_game_data_package, game_data["checksum"]), deep=True)
+                    # None if rolled on >= 0.3.9 but uploaded to <= 0.3.8. multidata should be complete
+                    if package:
+                        if cached:
+                            self.shared_game_data_size += size
+                        game_data, item_name_groups, location_name_groups = package
+                        # _load removes the groups from the package, so it gets a copy
+                        game_data_packages[game] = {**game_data, "item_name_groups": item_name_groups}
+                        if location_name_groups is not None:
+                            game_data_packages[game]["location_name_groups"] = location_name_groups
                         continue
                     else:
                         self.logger.warning(f"Did not find game_data_package for {game}: {game_data['checksum']}")
@@ -144,7 +293,16 @@ class WebHostContext(Context):
             self.gamespackage = static_gamespackage
             self.item_name_groups = static_item_name_groups
             self.location_name_groups = static_location_name_groups
-        return self._load(multidata, game_data_packages, True)
+        loaded = self._load(multidata, game_data_packages, True)
+        try:
+            import psutil
+            memory = f", Mem: {Utils.format_SI_prefix(psutil.Process().memory_info().rss, 1024)}iB"
+        except ImportError:
+            memory = ""
+        self.logger.debug(f"Context loaded, sharing about {Utils.format_SI_prefix(self.shared_game_data_size, 1024)}B "
+                          f"of game data with other rooms, game data cache has {len(game_data_cache.entries)} entries, "
+                          f"{game_data_cache.hits} hits and {game_data_cache.misses} misses{memory}")
+        return loaded
 
     @db_session
     def init_save(self, enabled: bool = True):
@@ -154,7 +312,7 @@ class WebHostContext(Context):
             if savegame_data:
                 self.set_save(restricted_loads(Room.get(id=self.room_id).multisave))
             self._start_async_saving(atexit_save=False)
-        threading.Thread(target=self.listen_to_db_commands, daemon=True).start()
+        db_command_dispatcher.add_room(self.room_id, self.main_loop, DBCommandProcessor(self))
 
     @db_session
     def _save(self, exit_save: bool = False) -> bool:
@@ -270,6 +428,8 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
     del ponyconfig
     gc.collect()  # free intermediate objects used during setup
 
+    db_command_dispatcher.start()
+
     loop = asyncio.get_event_loop()
 
     async def start_room(room_id):
@@ -332,6 +492,7 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                 try:
                     ctx.save_dirty = False  # make sure the saving thread does not write to DB after final wakeup
                     ctx.exit_event.set()  # make sure the saving thread stops at some point
+                    db_command_dispatcher.remove_room(room_id)
                     # NOTE: async saving should probably be an async task and could be merged with shutdown_task
                     with (db_session):
                         # ensure the Room does not spin up again on its own, minute of safety buffer
@@ -1,7 +1,8 @@
 import datetime
 import collections
+import threading
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, NamedTuple, Counter
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Set, Tuple, NamedTuple, Counter
 from uuid import UUID
 from email.utils import parsedate_to_datetime
 
@@ -17,7 +18,6 @@ from .models import GameDataPackage, Room
 # Multisave is currently updated, at most, every minute.
 TRACKER_CACHE_TIMEOUT_IN_SECONDS = 60
 
-_multidata_cache = {}
 _multiworld_trackers: Dict[str, Callable] = {}
 _player_trackers: Dict[str, Callable] = {}
 
@@ -25,6 +25,60 @@ TeamPlayer = Tuple[int, int]
 ItemMetadata = Tuple[int, int, int]
 
 
+class TrackerDataCache:
+    """
+    Process-wide cache of data loaded for trackers, shared by all requests and threads. Entries must not be modified.
+    The least recently used entries are dropped once more than max_size are cached.
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: collections.OrderedDict[Hashable, Any] = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Returns the entry of key, building it outside the lock if it is not cached."""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        value = build()
+        with self.lock:
+            self.entries[key] = value
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return value
+
+
+# decompressed multidata by seed id, which never changes
+_multidata_cache = TrackerDataCache(16)
+# id to name lookups by data package checksum
+_data_package_cache = TrackerDataCache(256)
+# unpickled multisave by room id and last activity, which is updated by every save
+_multisave_cache = TrackerDataCache(64)
+
+
+class SharedIdNames(dict):
+    """Id to name lookup shared between requests, which names unknown ids without adding them."""
+    __slots__ = ("kind",)
+
+    def __init__(self, kind: str, names: Mapping[int, str]):
+        super().__init__(names)
+        self.kind = kind
+
+    def __missing__(self, key: int) -> str:
+        return f"Unknown {self.kind} (ID: {key})"
+
+
+def _load_data_package_lookups(checksum: str) -> Tuple[Dict[int, str], Dict[int, str], Dict[str, int], Dict[str, int]]:
+    game_package = restricted_loads(GameDataPackage.get(checksum=checksum).data)
+    return (
+        SharedIdNames("Item", {id: name for name, id in game_package["item_name_to_id"].items()}),
+        SharedIdNames("Location", {id: name for name, id in game_package["location_name_to_id"].items()}),
+        game_package["item_name_to_id"],
+        game_package["location_name_to_id"],
+    )
+
+
 def _cache_results(func: Callable) -> Callable:
     """Stores the results of any computationally expensive methods after the initial call in TrackerData.
     If called again, returns the cached result instead, as results will not change for the lifetime of TrackerData.
@@ -46,18 +100,20 @@ class TrackerData:
     """A helper dataclass that is instantiated each time an HTTP request comes in for tracker data.
 
     Provides helper methods to lazily load necessary data that each tracker require and caches any results so any
-    subsequent helper method calls do not need to recompute results during the lifetime of this instance.
+    subsequent helper method calls do not need to recompute results during the lifetime of this instance. The loaded
+    multidata, multisave and data package lookups are shared between requests until the room saves again.
     """
     room: Room
-    _multidata: Dict[str, Any]
+    _multidata: Mapping[str, Any]
     _multisave: Dict[str, Any]
     _tracker_cache: Dict[str, Any]
 
     def __init__(self, room: Room):
         """Initialize a new RoomMultidata object for the current room."""
         self.room = room
-        self._multidata = Context.decompress(room.seed.multidata)
-        self._multisave = restricted_loads(room.multisave) if room.multisave else {}
+        self._multidata = _multidata_cache.get(room.seed.id, lambda: Context.decompress(room.seed.multidata))
+        self._multisave = _multisave_cache.get(
+            (room.id, room.last_activity), lambda: restricted_loads(room.multisave) if room.multisave else {})
         self._tracker_cache = {}
 
         self.item_name_to_id: Dict[str, Dict[str, int]] = {}
@@ -71,15 +127,11 @@ class TrackerData:
             game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Location (ID: {code})")
         })
         for game, game_package in self._multidata["datapackage"].items():
-            game_package = restricted_loads(GameDataPackage.get(checksum=game_package["checksum"]).data)
-            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", {
-                id: name for name, id in game_package["item_name_to_id"].items()})
-            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})", {
-                id: name for name, id in game_package["location_name_to_id"].items()})
-
-            # Normal lookup tables as well.
-            self.item_name_to_id[game] = game_package["item_name_to_id"]
-            self.location_name_to_id[game] = game_package["location_name_to_id"]
+            checksum = game_package["checksum"]
+            (self.item_id_to_name[game], self.location_id_to_name[game],
+             # Normal lookup tables as well.
+             self.item_name_to_id[game], self.location_name_to_id[game]) = \
+                _data_package_cache.get(checksum, lambda: _load_data_package_lookups(checksum))
 
     def get_seed_name(self) -> str:
         """Retrieves the seed name."""
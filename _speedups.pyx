@@ -110,7 +110,6 @@ cdef class LocationStore:
 
     def __init__(self, locations_dict: Dict[int, Dict[int, Sequence[int]]]) -> None:
         self._mem = Pool()
-        cdef object key
         self._keys = []
         self._items = []
         self._proxies = []
@@ -144,16 +143,7 @@ cdef class LocationStore:
         if not count:
             warnings.warn("Game has no locations")
 
-        # allocate the arrays and invalidate index (0xff...)
-        if count:
-            # leaving entries as NULL if there are none, makes potential memory errors more visible
-            self.entries = <LocationEntry*>self._mem.alloc(count, sizeof(LocationEntry))
-        self.sender_index = <IndexEntry*>self._mem.alloc(max_sender + 1, sizeof(IndexEntry))
-        self._raw_proxies = <PyObject**>self._mem.alloc(max_sender + 1, sizeof(PyObject*))
-
-        assert (not self.entries) == (not count)
-        assert self.sender_index
-        assert self._raw_proxies
+        self._allocate(max_sender, count)
 
         # build entries and index
         cdef size_t i = 0
@@ -172,6 +162,79 @@ cdef class LocationStore:
                 self.sender_index[sender].count += 1
                 i += 1
 
+        self._build_caches(max_sender, sender_count, count)
+
+    @staticmethod
+    def from_columns(senders: Sequence[int], counts: Sequence[int], locations: Sequence[int], items: Sequence[int],
+                     receivers: Sequence[int], flags: Sequence[int]) -> LocationStore:
+        """
+        Creates a store from parallel columns, like NetUtils.LocationTable has them, without creating any dicts.
+        Senders have to be sorted, and the location IDs of each of them have to be sorted as well.
+        """
+        cdef LocationStore store = LocationStore.__new__(LocationStore)
+        store._mem = Pool()
+        store._keys = []
+        store._items = []
+        store._proxies = []
+
+        cdef size_t sender_count = len(senders)
+        cdef size_t count = len(locations)
+        if not sender_count:
+            raise ValueError(f"Rejecting game with 0 players")
+        if len(counts) != sender_count:
+            raise ValueError("Senders and counts differ in length")
+        if len(items) != count or len(receivers) != count or len(flags) != count or sum(counts) != count:
+            raise ValueError("Location columns differ in length")
+        if any(sender != index for index, sender in enumerate(senders, 1)):
+            if min(senders) < 1:
+                raise ValueError(f"Invalid player id {min(senders)} for location")
+            raise ValueError("Player IDs not continuous")
+        if sender_count > MAX_PLAYER_ID:
+            raise ValueError(f"Invalid player id {sender_count} for location")
+        cdef size_t max_sender = sender_count
+        if not count:
+            warnings.warn("Game has no locations")
+
+        store._allocate(max_sender, count)
+
+        cdef size_t i = 0
+        cdef size_t end
+        cdef ap_player_t receiver
+        for sender, sender_locations in zip(senders, counts):
+            store.sender_index[sender].start = i
+            store.sender_index[sender].count = sender_locations
+            end = i + sender_locations
+            while i < end:
+                receiver = receivers[i]
+                if receiver < 1 or receiver > MAX_PLAYER_ID:
+                    raise ValueError(f"Invalid player id {receiver} for item")
+                store.entries[i].sender = sender
+                store.entries[i].location = locations[i]
+                store.entries[i].item = items[i]
+                store.entries[i].receiver = receiver
+                store.entries[i].flags = flags[i]
+                if i > store.sender_index[sender].start and store.entries[i - 1].location >= store.entries[i].location:
+                    raise ValueError(f"Locations of player {sender} not sorted")
+                i += 1
+
+        store._build_caches(max_sender, sender_count, count)
+        return store
+
+    cdef _allocate(self, size_t max_sender, size_t count):
+        # allocate the arrays and invalidate index (0xff...)
+        if count:
+            # leaving entries as NULL if there are none, makes potential memory errors more visible
+            self.entries = <LocationEntry*>self._mem.alloc(count, sizeof(LocationEntry))
+        self.sender_index = <IndexEntry*>self._mem.alloc(max_sender + 1, sizeof(IndexEntry))
+        self._raw_proxies = <PyObject**>self._mem.alloc(max_sender + 1, sizeof(PyObject*))
+
+        assert (not self.entries) == (not count)
+        assert self.sender_index
+        assert self._raw_proxies
+
+    cdef _build_caches(self, size_t max_sender, size_t sender_count, size_t count):
+        cdef object key
+        cdef size_t i
         # build pyobject caches
         self._proxies.append(None)  # player 0
         assert self.sender_index[0].count == 0
@@ -20,7 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 ]]
 
-local SCRIPT_VERSION = 1
+local SCRIPT_VERSION = 3
 
 -- Set to log incoming requests
 -- Will cause lag due to large console output
@@ -37,6 +37,51 @@ field `type`. The value of `type` determines what other fields may exist.
 To get the script version, instead of JSON, send "VERSION" to get the script
 version directly (e.g. "2").
 
+Clients that know the script version is 2 or newer may instead send pipelined
+messages, without waiting for the response to the previous one. Every message
+that arrived by the end of a frame is processed on that frame, in order. A
+pipelined message is a JSON object on one line, followed by `size` bytes of
+raw binary payload:
+
+`{"id": 7, "requests": [...], "size": 2}\n` followed by 2 bytes
+
+Its response has the same shape and `id`, with `responses` instead of
+`requests`. The data of `GUARD` and `WRITE` requests and of `READ_RESPONSE`s
+can be left out of the JSON and given a `data_size` field instead, in which
+case it is taken from, or appended to, the payload in the order of the
+requests and responses.
+
+#### Ex. 5
+
+Request:
+
+```
+{"id": 3, "requests": [
+    {"type": "WRITE", "address": 100, "data_size": 2, "domain": "System Bus"},
+    {"type": "READ", "address": 500, "size": 4, "domain": "ROM"}
+], "size": 2}
+```
+followed by the 2 bytes to write
+
+Response:
+
+```
+{"id": 3, "responses": [
+    {"type": "WRITE_RESPONSE"},
+    {"type": "READ_RESPONSE", "data_size": 4}
+], "size": 4}
+```
+followed by the 4 bytes read
+
+---
+
+From version 3 on, memory ranges registered with `WATCH` are compared at the
+end of every frame, and the ranges that changed are pushed to the client in a
+message without an `id`, whose `changes` are `WATCH_RESPONSE`s:
+
+`{"changes": [{"type": "WATCH_RESPONSE", "watch_id": 1, "data_size": 2}], "size": 2}\n`
+followed by the 2 changed bytes
+
 #### Ex. 1
 
 Request: `[{"type": "PING"}]`
@@ -139,7 +184,8 @@ Response:
 
     Additional Fields:
     - `address` (`int`): The address of the memory to check
-    - `expected_data` (string): A base64 string of contiguous data
+    - `expected_data` (string): A base64 string of contiguous data, or
+    `data_size` (`int`) in pipelined messages
     - `domain` (`string`): The name of the memory domain the address
     corresponds to
 
@@ -174,10 +220,33 @@ Response:
 
     Additional Fields:
     - `address` (`int`): The address of the memory to write to
-    - `value` (`string`): A base64 string representing the data to write
+    - `value` (`string`): A base64 string representing the data to write, or
+    `data_size` (`int`) in pipelined messages
+    - `domain` (`string`): The name of the memory domain the address
+    corresponds to
+
+- `WATCH`  
+    Watches an array of bytes at the provided address, and responds with its
+    current data. Only for pipelined messages. Whenever the data changed at
+    the end of a frame, it is pushed to the client.
+
+    Expected Response Type: `WATCH_RESPONSE`
+
+    Additional Fields:
+    - `watch_id` (`int`): The id pushed changes will refer to
+    - `address` (`int`): The address of the memory to watch
+    - `size` (`int`): The number of bytes to watch
     - `domain` (`string`): The name of the memory domain the address
     corresponds to
 
+- `UNWATCH`  
+    Stops watching the memory of a `WATCH` request.
+
+    Expected Response Type: `UNWATCH_RESPONSE`
+
+    Additional Fields:
+    - `watch_id` (`int`): The id the memory was watched with
+
 - `DISPLAY_MESSAGE`  
     Adds a message to the message queue which will be displayed using
     `gui.addmessage` according to the message interval.
@@ -249,11 +318,23 @@ Response:
     Contains the result of a `READ` request.
 
     Additional Fields:
-    - `value` (`string`): A base64 string representing the read data
+    - `value` (`string`): A base64 string representing the read data, or
+    `data_size` (`int`) in pipelined messages
 
 - `WRITE_RESPONSE`  
     Acknowledges `WRITE`.
 
+- `WATCH_RESPONSE`  
+    Contains the data of a watched array of bytes, when it started being
+    watched or changed.
+
+    Additional Fields:
+    - `watch_id` (`int`): The id the memory is watched with
+    - `data_size` (`int`): The number of bytes of payload holding the data
+
+- `UNWATCH_RESPONSE`  
+    Acknowledges `UNWATCH`.
+
 - `DISPLAY_MESSAGE_RESPONSE`  
     Acknowledges `DISPLAY_MESSAGE`.
 
@@ -296,6 +377,9 @@ local SOCKET_PORT_LAST = SOCKET_PORT_FIRST + SOCKET_PORT_RANGE_SIZE
 local STATE_NOT_CONNECTED = 0
 local STATE_CONNECTED = 1
 
+-- Messages handled per frame while unlocked, so a client sending faster than they are handled can't stall emulation
+local MAX_MESSAGES_PER_FRAME = 64
+
 local server = nil
 local client_socket = nil
 
@@ -311,6 +395,18 @@ local locked = false
 
 local rom_hash = nil
 
+-- Data of a line or payload that did not completely arrive yet
+local receive_prefix = ""
+-- Header of the pipelined message whose payload is being received
+local pending_header = nil
+-- Data that could not be sent yet without blocking
+local send_buffer = ""
+-- Memory ranges whose changes are pushed to the client, by watch id
+local watches = {}
+
+local unpack = table.unpack or unpack
+local BYTE_CHUNK_SIZE = 4096
+
 function queue_push (self, value)
     self[self.right] = value
     self.right = self.right + 1
@@ -334,6 +430,25 @@ end
 
 local message_queue = new_queue()
 
+function bytes_to_string (bytes)
+    local chunks = {}
+    for i = 1, #bytes, BYTE_CHUNK_SIZE do
+        chunks[#chunks + 1] = string.char(unpack(bytes, i, math.min(i + BYTE_CHUNK_SIZE - 1, #bytes)))
+    end
+    return table.concat(chunks)
+end
+
+function string_to_bytes (str, first, last)
+    local bytes = {}
+    for i = first, last, BYTE_CHUNK_SIZE do
+        local chunk = {string.byte(str, i, math.min(i + BYTE_CHUNK_SIZE - 1, last))}
+        for j = 1, #chunk do
+            bytes[#bytes + 1] = chunk[j]
+        end
+    end
+    return bytes
+end
+
 function lock ()
     locked = true
     client_socket:settimeout(2)
@@ -397,7 +512,7 @@ request_handlers = {
 
     ["GUARD"] = function (req)
         local res = {}
-        local expected_data = base64.decode(req["expected_data"])
+        local expected_data = req["data"] or base64.decode(req["expected_data"])
         local actual_data = memory.read_bytes_as_array(req["address"], #expected_data, req["domain"])
 
         local data_is_validated = true
@@ -437,7 +552,11 @@ request_handlers = {
         local res = {}
 
         res["type"] = "READ_RESPONSE"
-        res["value"] = base64.encode(memory.read_bytes_as_array(req["address"], req["size"], req["domain"]))
+        if req["pipelined"] then
+            res["data"] = memory.read_bytes_as_array(req["address"], req["size"], req["domain"])
+        else
+            res["value"] = base64.encode(memory.read_bytes_as_array(req["address"], req["size"], req["domain"]))
+        end
 
         return res
     end,
@@ -446,7 +565,34 @@ request_handlers = {
         local res = {}
 
         res["type"] = "WRITE_RESPONSE"
-        memory.write_bytes_as_array(req["address"], base64.decode(req["value"]), req["domain"])
+        memory.write_bytes_as_array(req["address"], req["data"] or base64.decode(req["value"]), req["domain"])
+
+        return res
+    end,
+
+    ["WATCH"] = function (req)
+        local res = {}
+        local data = memory.read_bytes_as_array(req["address"], req["size"], req["domain"])
+
+        watches[req["watch_id"]] = {
+            address = req["address"],
+            size = req["size"],
+            domain = req["domain"],
+            data = bytes_to_string(data),
+        }
+
+        res["type"] = "WATCH_RESPONSE"
+        res["watch_id"] = req["watch_id"]
+        res["data"] = data
+
+        return res
+    end,
+
+    ["UNWATCH"] = function (req)
+        local res = {}
+
+        res["type"] = "UNWATCH_RESPONSE"
+        watches[req["watch_id"]] = nil
 
         return res
     end,
@@ -487,9 +633,124 @@ function process_request (req)
     end
 end
 
+function process_requests (data)
+    local res = {}
+    local failed_guard_response = nil
+    for i, req in ipairs(data) do
+        if failed_guard_response ~= nil then
+            res[i] = failed_guard_response
+        else
+            -- An error is more likely to cause an NLua exception than to return an error here
+            local status, response = pcall(process_request, req)
+            if status then
+                res[i] = response
+
+                -- If the GUARD validation failed, skip the remaining commands
+                if response["type"] == "GUARD_RESPONSE" and not response["value"] then
+                    failed_guard_response = response
+                end
+            else
+                if type(response) ~= "string" then response = "Unknown error" end
+                res[i] = {type = "ERROR", err = response}
+            end
+        end
+    end
+    return res
+end
+
+-- Processes a pipelined message and returns its response, including the payload
+function process_pipelined_message (header, payload)
+    local requests = header["requests"]
+    local offset = 1
+    for _, req in ipairs(requests) do
+        req["pipelined"] = true
+        if req["data_size"] ~= nil then
+            req["data"] = string_to_bytes(payload, offset, offset + req["data_size"] - 1)
+            offset = offset + req["data_size"]
+        end
+    end
+
+    local responses = process_requests(requests)
+    local chunks = {}
+    for _, res in ipairs(responses) do
+        if res["data"] ~= nil then
+            chunks[#chunks + 1] = bytes_to_string(res["data"])
+            res["data_size"] = #res["data"]
+            res["data"] = nil
+        end
+    end
+
+    local response_payload = table.concat(chunks)
+    local response_header = {id = header["id"], responses = responses, size = #response_payload}
+    return json.encode(response_header).."\n"..response_payload
+end
+
+-- Receives a line, or size bytes if given, keeping partially received data for the next call
+function receive (size)
+    local data, err, partial = client_socket:receive(size or "*l", receive_prefix)
+    if data == nil then
+        receive_prefix = partial or ""
+    else
+        receive_prefix = ""
+    end
+    return data, err
+end
+
+-- Sends data, keeping what could not be sent without blocking for flush_send_buffer
+function send (data)
+    send_buffer = send_buffer..data
+    flush_send_buffer()
+end
+
+function flush_send_buffer ()
+    if send_buffer == "" then
+        return
+    end
+
+    local last, err, last_partial = client_socket:send(send_buffer)
+    if last ~= nil or err ~= "timeout" then
+        send_buffer = ""
+    else
+        send_buffer = send_buffer:sub(last_partial + 1)
+    end
+end
+
+function reset_connection ()
+    receive_prefix = ""
+    pending_header = nil
+    send_buffer = ""
+    locked = false
+    watches = {}
+end
+
+-- Pushes the data of every watched memory range that changed since it was last sent
+function push_watch_changes ()
+    local changes = {}
+    local chunks = {}
+    for watch_id, watch in pairs(watches) do
+        local data = bytes_to_string(memory.read_bytes_as_array(watch.address, watch.size, watch.domain))
+        if data ~= watch.data then
+            watch.data = data
+            changes[#changes + 1] = {type = "WATCH_RESPONSE", watch_id = watch_id, data_size = #data}
+            chunks[#chunks + 1] = data
+        end
+    end
+
+    if #changes > 0 then
+        local payload = table.concat(chunks)
+        send(json.encode({changes = changes, size = #payload}).."\n"..payload)
+    end
+end
+
 -- Receive data from AP client and send message back
+-- Returns true if a message (or the header of a pipelined message) was received
 function send_receive ()
-    local message, err = client_socket:receive()
+    local message, err
+    if pending_header ~= nil then
+        message, err = receive(pending_header["size"])
+    else
+        message, err = receive()
+    end
 
     -- Handle errors
     if err == "closed" then
@@ -497,53 +758,48 @@ function send_receive ()
             print("Connection to client closed")
         end
         current_state = STATE_NOT_CONNECTED
-        return
+        locked = false
+        return false
     elseif err == "timeout" then
         unlock()
-        return
+        return false
     elseif err ~= nil then
         print(err)
         current_state = STATE_NOT_CONNECTED
         unlock()
-        return
+        return false
     end
 
     -- Reset timeout timer
     timeout_timer = 5
 
+    if pending_header ~= nil then
+        local header = pending_header
+        pending_header = nil
+        send(process_pipelined_message(header, message))
+        return true
+    end
+
     -- Process received data
     if DEBUG then
         print("Received Message ["..emu.framecount().."]: "..'"'..message..'"')
     end
 
     if message == "VERSION" then
-        client_socket:send(tostring(SCRIPT_VERSION).."\n")
-    else
-        local res = {}
-        local data = json.decode(message)
-        local failed_guard_response = nil
-        for i, req in ipairs(data) do
-            if failed_guard_response ~= nil then
-                res[i] = failed_guard_response
-            else
-                -- An error is more likely to cause an NLua exception than to return an error here
-                local status, response = pcall(process_request, req)
-                if status then
-                    res[i] = response
-
-                    -- If the GUARD validation failed, skip the remaining commands
-                    if response["type"] == "GUARD_RESPONSE" and not response["value"] then
-                        failed_guard_response = response
-                    end
-                else
-                    if type(response) ~= "string" then response = "Unknown error" end
-                    res[i] = {type = "ERROR", err = response}
-                end
-            end
+        send(tostring(SCRIPT_VERSION).."\n")
+    elseif message:sub(1, 1) == "{" then
+        local header = json.decode(message)
+        if header["size"] > 0 then
+            -- The payload is received by the next call
+            pending_header = header
+        else
+            send(process_pipelined_message(header, ""))
         end
-
-        client_socket:send(json.encode(res).."\n")
+    else
+        send(json.encode(process_requests(json.decode(message))).."\n")
     end
+
+    return true
 end
 
 function initialize_server ()
@@ -603,15 +859,25 @@ function main ()
                     print("Client connected")
                     current_state = STATE_CONNECTED
                     client_socket = client
+                    reset_connection()
                     server:close()
                     server = nil
                     client_socket:settimeout(0)
                 end
             end
         else
+            flush_send_buffer()
+
+            -- Handle the messages that arrived, up to MAX_MESSAGES_PER_FRAME, and keep handling messages while locked
+            local handled = 0
             repeat
-                send_receive()
-            until not locked
+                local received = send_receive()
+                handled = handled + 1
+            until not locked and (not received or handled >= MAX_MESSAGES_PER_FRAME)
+
+            if current_state == STATE_CONNECTED then
+                push_watch_changes()
+            end
 
             if timeout_timer <= 0 then
                 print("Client timed out")
@@ -535,6 +535,12 @@ class ServerOptions(Group):
     class DisableItemCheat(Bool):
         """Disallow !getitem"""
 
+    class JournalSave(Bool):
+        """
+        Save only the changes since the last save to a .journal file next to the save file,
+        and rewrite the full save file only once the journal has grown larger than it
+        """
+
     class LocationCheckPoints(int):
         """
         Client hint system
@@ -604,6 +610,7 @@ class ServerOptions(Group):
     multidata: str | None = None
     savefile: str | None = None
     disable_save: bool = False
+    journal_save: JournalSave | bool = False
     loglevel: str = "info"
     logtime: bool = False
     server_password: ServerPassword | None = None
@@ -667,6 +674,12 @@ class GeneratorOptions(Group):
         OFF = 0
         ON = 1
 
+    class RollProcesses(int):
+        """
+        Number of processes that read the player yaml files and roll their options.
+        1 does both in the generating process. Every slot rolls from its own seed, so the result is the same either way.
+        """
+
     class PanicMethod(str):
         """
         What to do if the current item placements appear unsolvable.
@@ -684,6 +697,7 @@ class GeneratorOptions(Group):
     race: Race = Race(0)
     plando_options: PlandoOptions = PlandoOptions("bosses, connections, texts")
     panic_method: PanicMethod = PanicMethod("swap")
+    roll_processes: RollProcesses = RollProcesses(1)
     loglevel: str = "info"
     logtime: bool = False
 
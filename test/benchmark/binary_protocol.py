@@ -0,0 +1,77 @@
+def run_binary_protocol_benchmark():
+    """
+    Compares the size on the wire and the time to encode and decode the biggest packets of the server, as JSON text
+    and as binary frames, each uncompressed and deflated like permessage-deflate would.
+    """
+    import logging
+    import random
+    import time
+    import zlib
+
+    from Utils import init_logging
+    from NetUtils import NetworkItem, NetworkPlayer, NetworkSlot, SlotType, build_binary_frame, decode, decode_binary, \
+        encode, encode_binary_value
+    from worlds import network_data_package
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    rng = random.Random(0)
+    players = 100
+    packets = {
+        "ReceivedItems": [{
+            "cmd": "ReceivedItems", "index": 0,
+            "items": [NetworkItem(rng.randrange(1 << 20), rng.randrange(1 << 30), rng.randrange(1, players + 1),
+                                  rng.choice((0, 0, 1, 2, 4))) for _ in range(5000)],
+        }],
+        "Connected": [{
+            "cmd": "Connected", "team": 0, "slot": 1,
+            "players": [NetworkPlayer(0, slot, f"Player{slot}", f"Player{slot}") for slot in range(1, players + 1)],
+            "missing_locations": sorted(rng.sample(range(1 << 30), 3000)),
+            "checked_locations": sorted(rng.sample(range(1 << 30), 2000)),
+            "slot_info": {slot: NetworkSlot(f"Player{slot}", "Game", SlotType.player)
+                          for slot in range(1, players + 1)},
+            "hint_points": 0, "slot_data": {},
+        }],
+        "DataPackage": [{"cmd": "DataPackage", "data": network_data_package}],
+        "PrintJSON": [{
+            "cmd": "PrintJSON", "type": "ItemSend", "receiving": rng.randrange(1, players + 1),
+            "item": NetworkItem(rng.randrange(1 << 20), rng.randrange(1 << 30), 1, 1),
+            "data": [{"type": "player_id", "text": "1"}, {"text": " sent "},
+                     {"type": "item_id", "text": str(rng.randrange(1 << 20)), "player": 2, "flags": 1},
+                     {"text": " to "}, {"type": "player_id", "text": "2"},
+                     {"text": " ("}, {"type": "location_id", "text": str(rng.randrange(1 << 30)), "player": 1},
+                     {"text": ")"}],
+        } for _ in range(140)],
+    }
+
+    def encode_binary(packet) -> bytes:
+        # the way the server builds frames
+        return build_binary_frame([encode_binary_value(msg) for msg in packet])
+
+    def timed(function, *args) -> float:
+        repetitions = 0
+        start = time.perf_counter()
+        while True:
+            function(*args)
+            repetitions += 1
+            elapsed = time.perf_counter() - start
+            if elapsed > 0.5:
+                return elapsed / repetitions
+
+    for name, packet in packets.items():
+        text = encode(packet)
+        binary = encode_binary(packet)
+        if decode(text) != decode_binary(binary):
+            logger.error(f"{name} decodes differently from binary.")
+        logger.info(
+            f"{name}: JSON {len(text.encode()) / 1024:.1f} KiB, deflated {len(zlib.compress(text.encode())) / 1024:.1f} "
+            f"KiB, encode {timed(encode, packet) * 1000:.2f} ms, decode {timed(decode, text) * 1000:.2f} ms | "
+            f"binary {len(binary) / 1024:.1f} KiB, deflated {len(zlib.compress(binary)) / 1024:.1f} KiB, "
+            f"encode {timed(encode_binary, packet) * 1000:.2f} ms, decode {timed(decode_binary, binary) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_binary_protocol_benchmark()
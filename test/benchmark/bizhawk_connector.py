@@ -0,0 +1,264 @@
+import asyncio
+import base64
+import json
+from typing import Any
+
+
+class FakeConnector:
+    """
+    Imitates connector_bizhawk_generic.lua on a local socket. Every message that arrived by the end of a frame is
+    handled on that frame, pipelined messages are only understood from script version 2 on, and changes of watched
+    memory are pushed at the end of every frame from version 3 on.
+    """
+    def __init__(self, script_version: int, frame_time: float = 1 / 60):
+        self.script_version = script_version
+        self.frame_time = frame_time
+        self.memory: dict[str, bytearray] = {"RAM": bytearray(0x1000)}
+        self.locked = False
+        self.frames = 0
+        self.messages = 0
+        self.most_messages_per_frame = 0
+        self.watches: dict[int, tuple[int, int, str, bytes]] = {}
+        self.server: asyncio.Server | None = None
+        self.writers: list[asyncio.StreamWriter] = []
+        self.handlers: list[asyncio.Task] = []
+
+    async def start(self) -> int:
+        """Starts listening and returns the port"""
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        assert self.server
+        self.server.close()
+        for writer in self.writers:
+            writer.close()
+        if self.handlers:
+            await asyncio.wait(self.handlers)
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.writers.append(writer)
+        self.handlers.append(asyncio.current_task())
+        messages: asyncio.Queue[tuple[Any, bytes | None]] = asyncio.Queue()
+        reading = asyncio.create_task(self.read_messages(reader, messages))
+        try:
+            while not reading.done():
+                await asyncio.wait([reading], timeout=self.frame_time)
+                self.frames += 1
+                handled = 0
+                while not messages.empty() or self.locked:
+                    if self.locked:
+                        try:
+                            message = await asyncio.wait_for(messages.get(), 2)
+                        except asyncio.TimeoutError:
+                            self.locked = False
+                            break
+                    else:
+                        message = messages.get_nowait()
+                    writer.write(self.process_message(*message))
+                    handled += 1
+                self.messages += handled
+                self.most_messages_per_frame = max(self.most_messages_per_frame, handled)
+                if self.script_version >= 3:
+                    writer.write(self.push_watch_changes())
+                await writer.drain()
+        except ConnectionResetError:
+            pass
+        finally:
+            reading.cancel()
+            writer.close()
+
+    async def read_messages(self, reader: asyncio.StreamReader, messages: asyncio.Queue) -> None:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.startswith(b"{") and self.script_version >= 2:
+                header = json.loads(line)
+                await messages.put((header, await reader.readexactly(header["size"])))
+            else:
+                await messages.put((line.decode().rstrip("\n"), None))
+
+    def push_watch_changes(self) -> bytes:
+        changes = []
+        data = []
+        for watch_id, (address, size, domain, watched_data) in self.watches.items():
+            current_data = bytes(self.memory[domain][address:address + size])
+            if current_data != watched_data:
+                self.watches[watch_id] = address, size, domain, current_data
+                changes.append({"type": "WATCH_RESPONSE", "watch_id": watch_id, "data_size": size})
+                data.append(current_data)
+        if not changes:
+            return b""
+        payload = b"".join(data)
+        return json.dumps({"changes": changes, "size": len(payload)}).encode() + b"\n" + payload
+
+    def process_message(self, message: Any, payload: bytes | None) -> bytes:
+        if payload is None:
+            if message == "VERSION":
+                return f"{self.script_version}\n".encode()
+            return json.dumps(self.process_requests(json.loads(message), None)).encode() + b"\n"
+
+        responses = self.process_requests(message["requests"], payload)
+        data = []
+        for response in responses:
+            if "data" in response:
+                data.append(response.pop("data"))
+                response["data_size"] = len(data[-1])
+        response_payload = b"".join(data)
+        header = {"id": message["id"], "responses": responses, "size": len(response_payload)}
+        return json.dumps(header).encode() + b"\n" + response_payload
+
+    def process_requests(self, requests: list[dict[str, Any]], payload: bytes | None) -> list[dict[str, Any]]:
+        responses = []
+        offset = 0
+        failed_guard_response = None
+        for req in requests:
+            data = None
+            if "data_size" in req:
+                data = payload[offset:offset + req["data_size"]]
+                offset += req["data_size"]
+            if failed_guard_response:
+                responses.append(failed_guard_response)
+                continue
+            response = self.process_request(req, data, payload is not None)
+            if response["type"] == "GUARD_RESPONSE" and not response["value"]:
+                failed_guard_response = response
+            responses.append(response)
+        return responses
+
+    def process_request(self, req: dict[str, Any], data: bytes | None, pipelined: bool) -> dict[str, Any]:
+        if req["type"] == "PING":
+            return {"type": "PONG"}
+        if req["type"] == "HASH":
+            return {"type": "HASH_RESPONSE", "value": "FAKEHASH"}
+        if req["type"] == "SYSTEM":
+            return {"type": "SYSTEM_RESPONSE", "value": "GBA"}
+        if req["type"] == "MEMORY_SIZE":
+            return {"type": "MEMORY_SIZE_RESPONSE", "value": len(self.memory[req["domain"]])}
+        if req["type"] == "LOCK":
+            self.locked = True
+            return {"type": "LOCKED"}
+        if req["type"] == "UNLOCK":
+            self.locked = False
+            return {"type": "UNLOCKED"}
+        if req["type"] == "GUARD":
+            expected = data if data is not None else base64.b64decode(req["expected_data"])
+            actual = self.memory[req["domain"]][req["address"]:req["address"] + len(expected)]
+            return {"type": "GUARD_RESPONSE", "value": actual == expected, "address": req["address"]}
+        if req["type"] == "READ":
+            value = bytes(self.memory[req["domain"]][req["address"]:req["address"] + req["size"]])
+            if pipelined:
+                return {"type": "READ_RESPONSE", "data": value}
+            return {"type": "READ_RESPONSE", "value": base64.b64encode(value).decode("ascii")}
+        if req["type"] == "WATCH" and self.script_version >= 3:
+            value = bytes(self.memory[req["domain"]][req["address"]:req["address"] + req["size"]])
+            self.watches[req["watch_id"]] = req["address"], req["size"], req["domain"], value
+            return {"type": "WATCH_RESPONSE", "watch_id": req["watch_id"], "data": value}
+        if req["type"] == "UNWATCH" and self.script_version >= 3:
+            self.watches.pop(req["watch_id"], None)
+            return {"type": "UNWATCH_RESPONSE"}
+        if req["type"] == "WRITE":
+            value = data if data is not None else base64.b64decode(req["value"])
+            self.memory[req["domain"]][req["address"]:req["address"] + len(value)] = value
+            return {"type": "WRITE_RESPONSE"}
+        return {"type": "ERROR", "err": f"Unknown command: {req['type']}"}
+
+
+async def connect(ctx, port: int) -> None:
+    """Connects a BizHawkContext like `_bizhawk.connect`, but to the port of a FakeConnector"""
+    from worlds import _bizhawk
+
+    ctx.streams = await asyncio.open_connection("127.0.0.1", port)
+    ctx.connection_status = _bizhawk.ConnectionStatus.TENTATIVE
+    await _bizhawk.get_script_version(ctx)
+
+
+def run_bizhawk_connector_benchmark():
+    """
+    Measures the requests per second the BizHawk client gets through to a fake connector script over a local socket,
+    for the legacy protocol and the pipelined one, with a single task and with several tasks reading at the same time.
+    Once at 60 frames per second, where round trips dominate, and once without frame pacing, where encoding dominates.
+    Then measures how long it takes to notice changes of watched memory, polled every 0.5s like the game watcher does
+    without pushed changes, or pushed by the connector.
+    """
+    import logging
+    import time
+
+    from Utils import init_logging
+    from worlds import _bizhawk
+    from worlds._bizhawk import BizHawkContext, PIPELINED_SCRIPT_VERSION, WATCH_SCRIPT_VERSION
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    duration = 2
+    read_size = 4096
+
+    async def reader(ctx: BizHawkContext, deadline: float) -> int:
+        requests = 0
+        while time.perf_counter() < deadline:
+            await _bizhawk.read(ctx, [(0, read_size, "RAM")])
+            requests += 1
+        return requests
+
+    async def run(script_version: int, tasks: int, frame_time: float) -> float:
+        connector = FakeConnector(script_version, frame_time)
+        connector.memory["RAM"] = bytearray(range(256)) * (read_size // 256)
+        ctx = BizHawkContext()
+        await connect(ctx, await connector.start())
+        start = time.perf_counter()
+        requests = sum(await asyncio.gather(*(reader(ctx, start + duration) for _ in range(tasks))))
+        requests_per_second = requests / (time.perf_counter() - start)
+        _bizhawk.disconnect(ctx)
+        await connector.stop()
+        return requests_per_second
+
+    async def notice_changes(script_version: int, changes: int) -> tuple[float, float]:
+        """Returns the average time until a change was noticed, and the messages per second the connector handled"""
+        connector = FakeConnector(script_version)
+        ctx = BizHawkContext()
+        await connect(ctx, await connector.start())
+        await _bizhawk.watch(ctx, [(0, 4, "RAM")])
+
+        async def poll():
+            while True:
+                await asyncio.sleep(0.5)
+                await _bizhawk.update_watches(ctx)
+
+        poller = None if ctx.pushes_changes else asyncio.create_task(poll())
+        start = time.perf_counter()
+        messages = connector.messages
+        latency = 0.
+        for change in range(changes):
+            await asyncio.sleep(0.3)
+            ctx.watch_event.clear()
+            connector.memory["RAM"][0] = change + 1
+            changed = time.perf_counter()
+            await ctx.watch_event.wait()
+            latency += time.perf_counter() - changed
+        messages_per_second = (connector.messages - messages) / (time.perf_counter() - start)
+        if poller:
+            poller.cancel()
+        _bizhawk.disconnect(ctx)
+        await connector.stop()
+        return latency / changes, messages_per_second
+
+    for frame_time, pacing in ((1 / 60, "60 frames per second"), (0, "no frame pacing")):
+        for script_version, protocol in ((1, "legacy"), (PIPELINED_SCRIPT_VERSION, "pipelined")):
+            for tasks in (1, 8):
+                requests_per_second = asyncio.run(run(script_version, tasks, frame_time))
+                logger.info(f"{protocol:>9} protocol, {tasks} task(s), {pacing}: "
+                            f"{requests_per_second:.0f} reads of {read_size} bytes per second")
+
+    for script_version, watching in ((PIPELINED_SCRIPT_VERSION, "polled"), (WATCH_SCRIPT_VERSION, "pushed")):
+        latency, messages_per_second = asyncio.run(notice_changes(script_version, 10))
+        logger.info(f"{watching:>6} watches: changes noticed after {latency * 1000:.0f}ms on average, "
+                    f"{messages_per_second:.1f} messages per second")
+
+
+if __name__ == "__main__":
+    import path_change
+    path_change.change_home()
+    run_bizhawk_connector_benchmark()
@@ -0,0 +1,147 @@
+def run_multiserver_load_benchmark():
+    """
+    Floods a local MultiServer with single location checks, sent by the game clients of random slots, while every slot
+    has a game client and a tracker connected, both without text messages. Times how long it takes until every client
+    got all of its items, once queueing every slot after every check, like the former full client scan, and once
+    queueing only the receivers.
+    """
+    import asyncio
+    import functools
+    import logging
+    import random
+    import uuid
+
+    import websockets
+
+    from time_it import TimeIt
+
+    from Utils import init_logging, version_tuple
+    from NetUtils import NetworkSlot, SlotType, decode, encode
+    import MultiServer
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+    server_logger = logging.getLogger("Benchmark Server")
+    server_logger.setLevel(logging.WARNING)
+    logging.getLogger("websockets").setLevel(logging.WARNING)
+
+    players = 200
+    locations_per_player = 30
+    checks_per_second = 2000
+    game = "Archipelago"
+
+    def create_multidata() -> dict:
+        rng = random.Random(0)
+        slots = range(1, players + 1)
+        return {
+            "minimum_versions": {"server": (0, 0, 0), "clients": {slot: (0, 0, 0) for slot in slots}},
+            "version": version_tuple,
+            "slot_info": {slot: NetworkSlot(f"Player{slot}", game, SlotType.player) for slot in slots},
+            "seed_name": "Benchmark",
+            "connect_names": {f"Player{slot}": (0, slot) for slot in slots},
+            "locations": {slot: {location: (1, rng.choice(slots), 0)
+                                 for location in range(slot * 1000, slot * 1000 + locations_per_player)}
+                          for slot in slots},
+            "slot_data": {slot: {} for slot in slots},
+            "er_hint_data": {},
+            "precollected_items": {slot: [] for slot in slots},
+            "precollected_hints": {slot: set() for slot in slots},
+            "server_options": {},
+        }
+
+    class Receiver:
+        def __init__(self, socket, expected: int, done: asyncio.Event):
+            self.socket = socket
+            self.expected = expected
+            self.items = 0
+            self.messages = 0
+            self.done = done
+
+        async def run(self):
+            try:
+                async for data in self.socket:
+                    for msg in decode(data):
+                        if msg["cmd"] == "ReceivedItems":
+                            self.messages += 1
+                            self.items += len(msg["items"])
+                            if self.items >= self.expected:
+                                self.done.set()
+            except websockets.ConnectionClosed:
+                pass
+
+    async def connect(port: int, slot: int, tags: list):
+        socket = await websockets.connect(f"ws://127.0.0.1:{port}", ping_timeout=None, ping_interval=None,
+                                          max_size=None)
+        decode(await socket.recv())  # RoomInfo
+        await socket.send(encode([{
+            "cmd": "Connect", "password": None, "name": f"Player{slot}", "game": "" if "Tracker" in tags else game,
+            "version": version_tuple, "uuid": uuid.uuid4().int, "tags": tags, "items_handling": 0b111,
+            "slot_data": False,
+        }]))
+        return socket
+
+    async def run() -> int:
+        ctx = MultiServer.Context("127.0.0.1", 0, "", "", 1, 0, False, logger=server_logger)
+        multidata = create_multidata()
+        expected = {slot: 0 for slot in range(1, players + 1)}
+        for locations in multidata["locations"].values():
+            for _, target, _ in locations.values():
+                expected[target] += 1
+        checks = [(slot, location) for slot, locations in multidata["locations"].items() for location in locations]
+        random.Random(1).shuffle(checks)
+        ctx._load(multidata, {}, False)
+        server = await websockets.serve(functools.partial(MultiServer.server, ctx=ctx), "127.0.0.1", 0,
+                                        ping_timeout=None, ping_interval=None, max_size=None)
+        port = server.sockets[0].getsockname()[1]
+
+        receivers = []
+        tasks = []
+        for slot in range(1, players + 1):
+            for tags in (["NoText"], ["Tracker", "NoText"]):
+                socket = await connect(port, slot, tags)
+                receiver = Receiver(socket, expected[slot], asyncio.Event())
+                if not expected[slot]:
+                    receiver.done.set()
+                receivers.append(receiver)
+        for receiver in receivers:
+            tasks.append(asyncio.create_task(receiver.run()))
+        await asyncio.sleep(0.5)  # let the Connected replies settle
+
+        mode = "every slot" if MultiServer.send_items_to is send_items_to_every_slot else "receivers"
+        with TimeIt(f"{len(checks)} checks at up to {checks_per_second}/s to {len(receivers)} clients, "
+                    f"queueing {mode}", logger):
+            for index, (slot, location) in enumerate(checks):
+                sender = receivers[(slot - 1) * 2].socket  # the game client of the sending slot
+                await sender.send(encode([{"cmd": "LocationChecks", "locations": [location]}]))
+                if index % (checks_per_second // 100) == 0:
+                    await asyncio.sleep(0.01)
+            await asyncio.gather(*(receiver.done.wait() for receiver in receivers))
+        messages = sum(receiver.messages for receiver in receivers)
+
+        for receiver in receivers:
+            await receiver.socket.close()
+        for task in tasks:
+            task.cancel()
+        server.close()
+        await server.wait_closed()
+        return messages
+
+    send_items_to = MultiServer.send_items_to
+
+    def send_items_to_every_slot(ctx: MultiServer.Context, team: int, target_slot: int, *items) -> None:
+        send_items_to(ctx, team, target_slot, *items)
+        ctx.pending_item_receivers.update((team, slot) for slot in ctx.clients[team])
+
+    for scan_every_slot in (True, False):
+        MultiServer.send_items_to = send_items_to_every_slot if scan_every_slot else send_items_to
+        try:
+            messages = asyncio.run(run())
+        finally:
+            MultiServer.send_items_to = send_items_to
+        logger.info(f"{messages} ReceivedItems messages delivered.")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_multiserver_load_benchmark()
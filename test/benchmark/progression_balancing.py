@@ -0,0 +1,100 @@
+def run_progression_balancing_benchmark():
+    """
+    Times progression balancing on a large synthetic multiworld, once testing every unchecked location for every sphere
+    and once only testing the locations whose rule inputs changed, through `World.indexed_sweep`.
+    """
+    import argparse
+    import gc
+    import logging
+    import random
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld, Region
+    from worlds.AutoWorld import WebWorld, World
+    from Fill import balance_multiworld_progression
+    from worlds.generic.Rules import Has
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    class BenchmarkWebWorld(WebWorld):
+        tutorials = []
+
+    class BenchmarkWorld(World):
+        game = "Progression Balancing Benchmark"
+        item_name_to_id = {}
+        location_name_to_id = {}
+        hidden = True
+        web = BenchmarkWebWorld()
+
+    players = 150
+    regions_per_player = 50
+    locations_per_region = 5
+
+    def create_multiworld(indexed_sweep: bool) -> MultiWorld:
+        """
+        Every player has a chain of regions, each behind a key of that player. Keys are scattered over earlier regions
+        of all players, so the multiworld is beatable but unbalanced.
+        """
+        multiworld = MultiWorld(players)
+        multiworld.game = {player: BenchmarkWorld.game for player in multiworld.player_ids}
+        multiworld.player_name = {player: f"Tester{player}" for player in multiworld.player_ids}
+        multiworld.set_seed(0)
+        args = argparse.Namespace()
+        for name, option in BenchmarkWorld.options_dataclass.type_hints.items():
+            setattr(args, name, {player: option.from_any(option.default) for player in multiworld.player_ids})
+        multiworld.set_options(args)
+        multiworld.state = CollectionState(multiworld)
+
+        rng = random.Random(0)
+        open_locations = []
+        for player in multiworld.player_ids:
+            multiworld.worlds[player].indexed_sweep = indexed_sweep
+            regions = [Region("Menu", player, multiworld)]
+            regions += [Region(f"Region {index}", player, multiworld) for index in range(1, regions_per_player)]
+            multiworld.regions += regions
+            for index, region in enumerate(regions):
+                if index:
+                    regions[index - 1].connect(region, f"Door {index}", Has(f"Key {index}", player))
+                region.locations += [Location(player, f"Region {index} Location {number}", None, region)
+                                     for number in range(locations_per_region)]
+                open_locations.append(list(region.locations))
+            victory = Location(player, "Victory", None, regions[-1])
+            regions[-1].locations.append(victory)
+            victory.place_locked_item(Item("Victory", ItemClassification.progression, None, player))
+            multiworld.completion_condition[player] = Has("Victory", player)
+
+        # Key `index` goes into a region of any player that is at most `index - 1` keys deep.
+        for index in range(1, regions_per_player):
+            for player in multiworld.player_ids:
+                candidates = []
+                while not candidates:
+                    candidates = open_locations[rng.randrange(players) * regions_per_player + rng.randrange(index)]
+                location = candidates.pop(rng.randrange(len(candidates)))
+                multiworld.push_item(location, Item(f"Key {index}", ItemClassification.progression, None, player),
+                                     False)
+        for player_locations in open_locations:
+            for location in player_locations:
+                multiworld.push_item(location, Item("Filler", ItemClassification.filler, None, location.player),
+                                     False)
+        return multiworld
+
+    results = []
+    for indexed_sweep in (False, True):
+        multiworld = create_multiworld(indexed_sweep)
+        mode = "changed locations" if indexed_sweep else "all locations"
+        gc.collect()
+        with TimeIt(f"{players} player progression balancing testing {mode} per sphere", logger):
+            balance_multiworld_progression(multiworld)
+        results.append([(location.player, location.name, location.item.player, location.item.name)
+                        for location in multiworld.get_locations()])
+    if results[0] != results[1]:
+        logger.error("Progression balancing moved different items.")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_progression_balancing_benchmark()
@@ -0,0 +1,69 @@
+def run_sphere_store_benchmark():
+    """
+    Measures the memory a SphereStore adds for a 100k location seed and times resolving the sphere of every location,
+    by walking the multidata spheres like Context.get_sphere used to and through the SphereStore.
+    """
+    import gc
+    import logging
+    import random
+    import tracemalloc
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from NetUtils import SphereStore
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    players = 100
+    locations_per_player = 1000
+    sphere_count = 100
+
+    rng = random.Random(0)
+    spheres = [{} for _ in range(sphere_count)]
+    locations = []
+    for player in range(1, players + 1):
+        for location_id in range(player * 100_000, player * 100_000 + locations_per_player):
+            spheres[rng.randrange(sphere_count)].setdefault(player, set()).add(location_id)
+            locations.append((player, location_id))
+    rng.shuffle(locations)
+
+    gc.collect()
+    tracemalloc.start()
+    store = SphereStore(spheres)
+    gc.collect()
+    store_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    logger.info(f"SphereStore of {len(store)} locations uses {store_size / 1024 ** 2:.2f} MiB.")
+
+    gc.collect()
+    tracemalloc.start()
+    nested_dicts = {player: {} for player in range(1, players + 1)}
+    for sphere_index, sphere in enumerate(spheres):
+        for player, location_ids in sphere.items():
+            nested_dicts[player].update(dict.fromkeys(location_ids, sphere_index))
+    gc.collect()
+    nested_dicts_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    logger.info(f"Nested dicts of {len(locations)} locations would use {nested_dicts_size / 1024 ** 2:.2f} MiB.")
+    del nested_dicts
+
+    def walk_spheres(player: int, location_id: int) -> int:
+        for i, sphere in enumerate(spheres):
+            if location_id in sphere.get(player, set()):
+                return i
+        raise KeyError(location_id)
+
+    with TimeIt(f"resolving {len(locations)} locations walking {sphere_count} spheres", logger):
+        walked = [walk_spheres(player, location_id) for player, location_id in locations]
+    with TimeIt(f"resolving {len(locations)} locations through SphereStore.get_spheres", logger):
+        stored = store.get_spheres(locations)
+    if walked != stored:
+        logger.error("SphereStore returned different spheres.")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_sphere_store_benchmark()
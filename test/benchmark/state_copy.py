@@ -0,0 +1,78 @@
+def run_state_copy_benchmark():
+    """Compares time and memory of full CollectionState copies against copy-on-write copies on a large multiworld."""
+    import argparse
+    import gc
+    import logging
+    import tracemalloc
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from BaseClasses import MultiWorld, CollectionState
+    from worlds import AutoWorld
+    from worlds.AutoWorld import call_all
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    games = ("A Link to the Past", "Hollow Knight", "Timespinner", "Stardew Valley", "The Witness")
+    players = 100
+    copies = 200
+    gen_steps = (
+        "generate_early",
+        "create_regions",
+        "create_items",
+        "set_rules",
+        "connect_entrances",
+        "generate_basic",
+        "pre_fill",
+    )
+
+    multiworld = MultiWorld(players)
+    multiworld.game = {player: games[(player - 1) % len(games)] for player in multiworld.player_ids}
+    multiworld.player_name = {player: f"Tester{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(0)
+    args = argparse.Namespace()
+    for player in multiworld.player_ids:
+        world_type = AutoWorld.AutoWorldRegister.world_types[multiworld.game[player]]
+        for name, option in world_type.options_dataclass.type_hints.items():
+            getattr(args, name, None) or setattr(args, name, {})
+            getattr(args, name)[player] = option.from_any(option.default)
+    multiworld.set_options(args)
+    multiworld.state = CollectionState(multiworld)
+    with TimeIt(f"{players} player generation steps", logger):
+        for step in gen_steps:
+            call_all(multiworld, step)
+
+    all_state = multiworld.get_all_state(False)
+    # one item for a single player, as happens per placement in fill
+    item = next(item for item in multiworld.itempool if item.advancement)
+
+    for copy_on_write in (False, True):
+        mode = "copy-on-write" if copy_on_write else "full"
+        gc.collect()
+        with TimeIt(f"{copies} {mode} copies", logger):
+            for _ in range(copies):
+                all_state.copy(copy_on_write)
+
+        gc.collect()
+        with TimeIt(f"{copies} {mode} copies with a single collect and sweep", logger):
+            for _ in range(copies):
+                state = all_state.copy(copy_on_write)
+                state.collect(item, True)
+                state.sweep_for_advancements()
+
+        gc.collect()
+        tracemalloc.start()
+        kept = [all_state.copy(copy_on_write) for _ in range(copies)]
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        logger.info(f"{copies} {mode} copies held {current / 1024 / 1024:.2f} MiB "
+                    f"(peak {peak / 1024 / 1024:.2f} MiB).")
+        del kept
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_state_copy_benchmark()
@@ -0,0 +1,99 @@
+import sys
+import unittest
+from collections import Counter
+
+from BaseClasses import CollectionState, CompactItemCounter
+from worlds.AutoWorld import AutoWorldRegister
+from . import setup_solo_multiworld
+
+
+class TestCompactItemCounter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = {"Sword": 0, "Shield": 1, "Bow": 2}
+        self.counter = CompactItemCounter(self.index)
+
+    def test_counter_behaviour(self) -> None:
+        """Tests that the compact counter behaves like a Counter for the operations used on prog_items"""
+        counter = self.counter
+        self.assertEqual(0, counter["Sword"])
+        self.assertNotIn("Sword", counter)
+        self.assertIsNone(counter.get("Sword"))
+        counter["Sword"] += 2
+        counter.update(["Bow"])
+        counter.update({"Bow": 2})
+        self.assertEqual(2, counter["Sword"])
+        self.assertEqual(3, counter.get("Bow", 0))
+        self.assertEqual(Counter({"Sword": 2, "Bow": 3}), Counter(counter))
+        self.assertEqual(2, len(counter))
+        self.assertEqual(5, counter.total())
+        self.assertEqual([("Bow", 3)], counter.most_common(1))
+        counter.subtract({"Bow": 3})
+        self.assertNotIn("Bow", counter)
+        del counter["Sword"]
+        del counter["Missing"]
+        self.assertEqual(0, len(counter))
+
+    def test_new_names_are_interned(self) -> None:
+        """Tests that names unknown at registration, like events, get appended to the index on write"""
+        self.counter["Victory"] = 1
+        self.assertEqual(3, self.index["Victory"])
+        self.assertEqual(1, self.counter["Victory"])
+        other = CompactItemCounter(self.index)
+        self.assertEqual(0, other["Victory"])
+        self.assertEqual({"Victory": 1}, dict(self.counter))
+
+    def test_copy(self) -> None:
+        """Tests that copies do not share counts"""
+        self.counter["Shield"] = 1
+        copy = self.counter.copy()
+        copy["Shield"] += 1
+        self.assertEqual(1, self.counter["Shield"])
+        self.assertEqual(2, copy["Shield"])
+
+    def test_count_indices(self) -> None:
+        """Tests counting through precomputed indices"""
+        self.counter.update({"Sword": 2, "Bow": 1})
+        self.assertEqual(3, self.counter.count_indices((0, 1, 2)))
+        self.assertEqual(2, self.counter.count_indices_unique((0, 1, 2)))
+
+
+class TestCompactProgItems(unittest.TestCase):
+    games = ("A Link to the Past", "Stardew Valley", "The Witness", "Timespinner")
+
+    def test_all_state_matches(self) -> None:
+        """Tests that worlds reach the same locations with compact prog_items as with a Counter"""
+        for game in self.games:
+            with self.subTest(game=game):
+                multiworld = setup_solo_multiworld(AutoWorldRegister.world_types[game])
+                world = multiworld.worlds[1]
+                expected_state = multiworld.get_all_state(False)
+                world.compact_prog_items = True
+                try:
+                    state = multiworld.get_all_state(False)
+                finally:
+                    del world.compact_prog_items
+                self.assertIsInstance(state.prog_items[1], CompactItemCounter)
+                self.assertEqual(Counter(expected_state.prog_items[1]), Counter(state.prog_items[1]))
+                for group in world.item_name_groups:
+                    self.assertEqual(expected_state.count_group(group, 1), state.count_group(group, 1))
+                    self.assertEqual(expected_state.count_group_unique(group, 1), state.count_group_unique(group, 1))
+                self.assertEqual({location for location in multiworld.get_locations()
+                                  if location.can_reach(expected_state)},
+                                 {location for location in multiworld.get_locations() if location.can_reach(state)})
+                self.assertTrue(multiworld.can_beat_game(state))
+                # an empty state can reach the same things as well
+                world.compact_prog_items = True
+                try:
+                    empty_state = CollectionState(multiworld)
+                finally:
+                    del world.compact_prog_items
+                self.assertEqual(
+                    {region for region in multiworld.get_regions() if region.can_reach(multiworld.state)},
+                    {region for region in multiworld.get_regions() if region.can_reach(empty_state)})
+
+    def test_registration_keeps_class_names(self) -> None:
+        """Tests that interning the item names of a world does not change the name of its class"""
+        for game, world_type in AutoWorldRegister.world_types.items():
+            with self.subTest(game=game):
+                self.assertEqual(world_type.__qualname__.rsplit(".", 1)[-1], world_type.__name__)
+                self.assertIn(world_type.__name__, vars(sys.modules[world_type.__module__]))
@@ -1,13 +1,14 @@
 from typing import List, Iterable
+import random
 import unittest
 
 from Options import Accessibility
 from test.general import generate_items, generate_locations, generate_test_multiworld
-from Fill import FillError, balance_multiworld_progression, fill_restrictive, \
-    distribute_early_items, distribute_items_restrictive
+from Fill import FillError, _ExplorationStateTracker, _FillLocationIndex, _SphereSearch, \
+    balance_multiworld_progression, distribute_early_items, distribute_items_restrictive, fill_restrictive, sweep_from_pool
 from BaseClasses import Entrance, LocationProgressType, MultiWorld, Region, Item, Location, \
     ItemClassification
-from worlds.generic.Rules import CollectionRule, add_item_rule, locality_rules, set_rule
+from worlds.generic.Rules import CollectionRule, Has, add_item_rule, locality_rules, set_rule
 
 
 class PlayerDefinition(object):
@@ -464,6 +465,144 @@ class TestFillRestrictive(unittest.TestCase):
         self.assertIsNot(loc0.item, player1.prog_items[0], "Filled item was still present in item pool")
 
 
+class TestFillLocationIndex(unittest.TestCase):
+    def test_matches_linear_scan(self):
+        """Tests that the location index finds the same spots as scanning the locations in order"""
+        for single_player_placement in (False, True):
+            with self.subTest(single_player_placement=single_player_placement):
+                rng = random.Random(single_player_placement)
+                multiworld = generate_test_multiworld(2)
+                players = [generate_player_data(multiworld, player, 0, 8, 8) for player in (1, 2)]
+                shared_item_rule = lambda item: item.advancement
+                for player in players:
+                    for index, item in enumerate(player.prog_items):
+                        region = player.generate_region(player.menu, 10, lambda state, name=item.name, player_id=
+                                                        player.id: state.has(name, player_id))
+                        for location in region.locations:
+                            kind = rng.randrange(6)
+                            if kind == 0:
+                                location.progress_type = LocationProgressType.EXCLUDED
+                            elif kind == 1:
+                                location.item_rule = shared_item_rule
+                            elif kind == 2:
+                                add_item_rule(location, lambda item, index=index: item.name.endswith(str(index)))
+                            elif kind == 3:
+                                location.always_allow = lambda state, item: not item.advancement
+                locations = [location for player in players for location in player.locations]
+                rng.shuffle(locations)
+                items = [item for player in players for item in player.prog_items + player.basic_items]
+                location_index = _FillLocationIndex(locations, single_player_placement)
+                remaining = locations.copy()
+
+                state = multiworld.state
+                for step in range(120):
+                    if step % 8 == 0:
+                        # a new exploration state
+                        state = state.copy()
+                        state.collect(rng.choice(items), True)
+                    item = rng.choice(items)
+                    check_access = rng.random() < 0.9
+                    expected = next((location for location in remaining
+                                     if (not single_player_placement or location.player == item.player)
+                                     and location.can_fill(state, item, check_access)), None)
+                    self.assertIs(expected, location_index.find_spot(state, item, check_access), f"step {step}")
+                    if expected:
+                        location_index.remove(expected)
+                        remaining.remove(expected)
+                        self.assertEqual(remaining, locations)
+
+
+class TestExplorationStateTracker(unittest.TestCase):
+    def test_matches_sweep_from_pool(self):
+        """Tests that the maintained exploration state matches sweeping the pool from the base state every round"""
+        rng = random.Random(0)
+        multiworld = generate_test_multiworld(2)
+        players = [generate_player_data(multiworld, player, 0, 12, 4) for player in (1, 2)]
+        for player in players:
+            for index, item in enumerate(player.prog_items):
+                required = rng.choice(players).prog_items[rng.randrange(index + 1)]
+                player.generate_region(rng.choice(player.regions), 3, lambda state, name=required.name,
+                                       player_id=required.player: state.has(name, player_id))
+        locations = [location for player in players for location in player.locations]
+        pool = [item for player in players for item in player.prog_items + player.basic_items]
+        rng.shuffle(pool)
+        tracker = _ExplorationStateTracker(multiworld, multiworld.state)
+        placed: List[Location] = []
+
+        for step in range(60):
+            if placed and pool and rng.random() < 0.2:
+                # a swap, the previously placed item returns to the pool
+                location = rng.choice(placed)
+                item = pool.pop()
+                tracker.take(item)
+                pool.insert(0, location.item)
+                tracker.give(location.item)
+                location.item = None
+                multiworld.push_item(location, item, False)
+                tracker.placed(location)
+            elif pool:
+                for _ in range(rng.randint(1, 2)):
+                    item = pool.pop(rng.randrange(len(pool)))
+                    tracker.take(item)
+                    location = rng.choice([location for location in locations if not location.item])
+                    multiworld.push_item(location, item, False)
+                    tracker.placed(location)
+                    placed.append(location)
+            state = tracker.sweep(pool, [])
+            expected = sweep_from_pool(multiworld.state, pool)
+            self.assertEqual(expected.advancements, state.advancements, f"step {step}")
+            for player in players:
+                self.assertEqual(+expected.prog_items[player.id], +state.prog_items[player.id], f"step {step}")
+
+
+class TestSphereSearch(unittest.TestCase):
+    def test_matches_testing_every_location(self):
+        """Tests that only testing locations with changed inputs finds the same spheres as testing every location"""
+        for seed in range(5):
+            rng = random.Random(seed)
+            multiworld = generate_test_multiworld(2)
+            multiworld.worlds[1].indexed_sweep = True
+            players = [generate_player_data(multiworld, player, 3, 10, 0) for player in (1, 2)]
+            for player in players:
+                for index, item in enumerate(player.prog_items):
+                    required = rng.choice(players).prog_items[rng.randrange(index + 1)]
+                    region = player.generate_region(rng.choice(player.regions), 3,
+                                                    Has(required.name, required.player) if rng.random() < 0.5 else
+                                                    lambda state, name=required.name, player_id=required.player:
+                                                    state.has(name, player_id))
+                    required = rng.choice(players).prog_items[rng.randrange(index + 1)]
+                    set_rule(region.locations[0], Has(required.name, required.player))
+            # the k-th items go into regions only requiring earlier items, so several spheres can be reached
+            for index in range(10):
+                for player in players:
+                    location = rng.choice([location for other in players for region in other.regions[:index + 1]
+                                           for location in region.locations if not location.item])
+                    multiworld.push_item(location, player.prog_items[index], False)
+            for location in multiworld.get_unfilled_locations():
+                multiworld.push_item(location, Item("Filler", ItemClassification.filler, None, location.player), False)
+
+            search = _SphereSearch(multiworld.state, multiworld.get_locations())
+            state = multiworld.state.copy()
+            unchecked = set(multiworld.get_locations())
+            spheres = 0
+            expected_state = multiworld.state.copy()
+            while True:
+                if rng.random() < 0.2:
+                    search = search.copy()
+                sphere = search.next_sphere(state)
+                expected = {location for location in unchecked if location.can_reach(expected_state)}
+                self.assertEqual(expected, sphere, f"seed {seed}")
+                spheres += 1
+                if not sphere:
+                    break
+                unchecked -= sphere
+                for location in sphere:
+                    state.collect(location.item, True, location)
+                    expected_state.collect(location.item, True, location)
+            self.assertEqual(unchecked, search.unchecked)
+            self.assertGreater(spheres, 3)
+
+
 class TestDistributeItemsRestrictive(unittest.TestCase):
     def test_basic_distribute(self):
         """Test that distribute_items_restrictive is deterministic"""
@@ -0,0 +1,115 @@
+import random
+import unittest
+from typing import Callable, List
+
+from BaseClasses import CollectionState, Entrance, Item, ItemClassification, MultiWorld, Region
+from . import generate_test_multiworld
+
+item_names = [f"Key {i}" for i in range(8)]
+
+
+def build_random_world(multiworld: MultiWorld, player: int, rng: random.Random, region_count: int = 40) -> None:
+    """Creates a random Region graph with item, count and indirect Region conditions on its Entrances."""
+    menu = multiworld.get_region("Menu", player)
+    regions = [menu] + [Region(f"Region {i}", player, multiworld) for i in range(region_count)]
+    multiworld.regions += regions[1:]
+
+    for index, region in enumerate(regions):
+        targets = rng.sample(regions, 3)
+        if index + 1 < len(regions):
+            # keep every region reachable with enough items
+            targets.append(regions[index + 1])
+        for target in targets:
+            entrance = Entrance(player, f"{region.name} -> {target.name} {len(region.exits)}", region)
+            region.exits.append(entrance)
+            entrance.connect(target)
+            kind = rng.randrange(5)
+            if kind == 1:
+                name = rng.choice(item_names)
+                entrance.access_rule = lambda state, name=name: state.has(name, player)
+            elif kind == 2:
+                names = rng.sample(item_names, 2)
+                entrance.access_rule = lambda state, names=names: state.has_all(names, player)
+            elif kind == 3:
+                name = rng.choice(item_names)
+                entrance.access_rule = lambda state, name=name: state.has(name, player, 2)
+            elif kind == 4:
+                other = rng.choice(regions)
+                entrance.access_rule = lambda state, other=other.name: state.can_reach_region(other, player)
+                multiworld.register_indirect_condition(other, entrance)
+
+
+def reachable_region_names(multiworld: MultiWorld, state: CollectionState, player: int) -> List[str]:
+    return sorted(region.name for region in multiworld.get_regions(player) if region.can_reach(state))
+
+
+class TestIncrementalReachability(unittest.TestCase):
+    player = 1
+
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.world = self.multiworld.worlds[self.player]
+        build_random_world(self.multiworld, self.player, random.Random(0))
+
+    def create_state(self, incremental: bool) -> CollectionState:
+        self.world.incremental_reachability = incremental
+        try:
+            return CollectionState(self.multiworld)
+        finally:
+            del self.world.incremental_reachability
+
+    def reference_regions(self, items: List[Item]) -> List[str]:
+        state = self.create_state(False)
+        for item in items:
+            state.collect(item, True)
+        return reachable_region_names(self.multiworld, state, self.player)
+
+    def run_operations(self, state: CollectionState, seed: int, operations: int = 150,
+                       on_step: Callable[[int, CollectionState], CollectionState] = lambda step, state: state) -> None:
+        rng = random.Random(seed)
+        collected: List[Item] = []
+        for step in range(operations):
+            if collected and rng.random() < 0.4:
+                item = collected.pop(rng.randrange(len(collected)))
+                state.remove(item)
+            else:
+                item = Item(rng.choice(item_names), ItemClassification.progression, None, self.player)
+                collected.append(item)
+                state.collect(item, True)
+            state = on_step(step, state)
+            self.assertEqual(self.reference_regions(collected),
+                             reachable_region_names(self.multiworld, state, self.player),
+                             f"Mismatch after step {step}")
+
+    def test_incremental_enabled(self) -> None:
+        """Tests that incremental reachability is only used when enabled"""
+        self.assertIn(self.player, self.create_state(True).incremental_players)
+        self.assertNotIn(self.player, self.create_state(False).incremental_players)
+
+    def test_equivalent_to_full_rebuild(self) -> None:
+        """Tests that incremental reachability matches a from-scratch BFS through collects and removes"""
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.run_operations(self.create_state(True), seed)
+
+    def test_equivalent_across_copies(self) -> None:
+        """Tests that copies of an incremental state keep matching a from-scratch BFS"""
+        self.run_operations(self.create_state(True), 42,
+                            on_step=lambda step, state: state.copy() if step % 7 == 0 else state)
+
+    def test_equivalent_across_copy_on_write_copies(self) -> None:
+        """Tests that copy-on-write copies of an incremental state keep matching a from-scratch BFS"""
+        self.run_operations(self.create_state(True), 43,
+                            on_step=lambda step, state: state.copy(copy_on_write=True) if step % 3 == 0 else state)
+
+    def test_external_wipe(self) -> None:
+        """Tests that wiping the reachable regions from outside, as some worlds do, rebuilds from scratch"""
+        state = self.create_state(True)
+        items = [Item(name, ItemClassification.progression, None, self.player) for name in item_names]
+        for item in items:
+            state.collect(item, True)
+        expected = reachable_region_names(self.multiworld, state, self.player)
+        state.reachable_regions[self.player] = set()
+        state.stale[self.player] = True
+        self.assertEqual(expected, reachable_region_names(self.multiworld, state, self.player))
+        self.assertEqual(self.reference_regions(items), expected)
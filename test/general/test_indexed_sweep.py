@@ -0,0 +1,106 @@
+import random
+import unittest
+from typing import List
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location, Region
+from worlds.generic.Rules import CanReachRegion, Count, Has, HasAll, HasAny, set_rule
+from . import generate_test_multiworld
+
+item_names = [f"Key {i}" for i in range(12)]
+
+
+class TestIndexedSweep(unittest.TestCase):
+    player = 1
+
+    def build(self, seed: int) -> None:
+        """Creates random regions and locations holding the keys, with Rules, lambdas and region conditions."""
+        rng = random.Random(seed)
+        player = self.player
+        self.multiworld = generate_test_multiworld()
+        menu = self.multiworld.get_region("Menu", player)
+        regions = [menu] + [Region(f"Region {i}", player, self.multiworld) for i in range(6)]
+        self.multiworld.regions += regions[1:]
+        for index, region in enumerate(regions[1:]):
+            regions[index].connect(region, f"Door {index}", Has(rng.choice(item_names), player))
+
+        items = [Item(name, ItemClassification.progression, None, player)
+                 for name in item_names for _ in range(2)]
+        rng.shuffle(items)
+        for index, item in enumerate(items):
+            # a few free locations to get the sweep going
+            region = menu if index < 6 else rng.choice(regions)
+            location = Location(player, f"Location {index}", None, region)
+            region.locations.append(location)
+            kind = 0 if index < 6 else rng.randrange(6)
+            if kind == 1:
+                set_rule(location, Has(rng.choice(item_names), player, rng.randint(1, 2)))
+            elif kind == 2:
+                set_rule(location, HasAll(rng.sample(item_names, 2), player) | HasAny(rng.sample(item_names, 2), player))
+            elif kind == 3:
+                set_rule(location, Count(rng.sample(item_names, 3), player, 3))
+            elif kind == 4:
+                set_rule(location, CanReachRegion(rng.choice(regions).name, player) & Has(rng.choice(item_names), player))
+            elif kind == 5:
+                set_rule(location, lambda state, name=rng.choice(item_names): state.has(name, player))
+            location.place_locked_item(item)
+
+    def sweep(self, indexed: bool) -> List[str]:
+        self.multiworld.worlds[self.player].indexed_sweep = indexed
+        try:
+            state = CollectionState(self.multiworld)
+            state.sweep_for_advancements()
+        finally:
+            del self.multiworld.worlds[self.player].indexed_sweep
+        return sorted(location.name for location in state.advancements)
+
+    def test_matches_brute_force(self) -> None:
+        """Tests that the indexed sweep collects the same locations as testing every location on every pass"""
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                self.build(seed)
+                self.assertEqual(self.sweep(False), self.sweep(True))
+
+    def test_rule_dependencies(self) -> None:
+        """Tests that locations report their parent region and the inputs of introspectable rules"""
+        player = self.player
+        self.multiworld = generate_test_multiworld()
+        menu = self.multiworld.get_region("Menu", player)
+        location = Location(player, "Test", None, menu)
+        self.assertEqual((frozenset(), {(player, "Menu")}), location.get_rule_dependencies())
+        set_rule(location, Has("A", player) & CanReachRegion("Other", player))
+        self.assertEqual(({(player, "A")}, {(player, "Menu"), (player, "Other")}), location.get_rule_dependencies())
+        set_rule(location, lambda state: True)
+        self.assertIsNone(location.get_rule_dependencies())
+
+    def test_unchanged_locations_are_skipped(self) -> None:
+        """Tests that locations are not tested again while none of their inputs change"""
+        player = self.player
+        self.multiworld = generate_test_multiworld()
+        menu = self.multiworld.get_region("Menu", player)
+        evaluations: List[str] = []
+
+        class CountingCanReachRegion(CanReachRegion):
+            __slots__ = ()
+
+            def __call__(self, state: CollectionState) -> bool:
+                evaluations.append(self._args[0])
+                return super().__call__(state)
+
+        # a chain of keys, and a location that is never reachable
+        self.multiworld.regions.append(Region("Nowhere", player, self.multiworld))
+        for index in range(5):
+            location = Location(player, f"Chain {index}", None, menu)
+            menu.locations.append(location)
+            if index:
+                set_rule(location, Has(f"Key {index - 1}", player))
+            location.place_locked_item(Item(f"Key {index}", ItemClassification.progression, None, player))
+        location = Location(player, "Never", None, menu)
+        menu.locations.append(location)
+        set_rule(location, CountingCanReachRegion("Nowhere", player))
+        location.place_locked_item(Item("Unused", ItemClassification.progression, None, player))
+
+        self.assertEqual(5, len(self.sweep(True)))
+        self.assertEqual(1, evaluations.count("Nowhere"))
+        evaluations.clear()
+        self.assertEqual(5, len(self.sweep(False)))
+        self.assertLess(1, evaluations.count("Nowhere"))
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from BaseClasses import Item, ItemClassification, Location, MultiWorld, Region
+from Fill import swap_location_item
+from worlds.generic.Rules import set_rule
+from . import generate_test_multiworld
+
+
+class TestPlaythroughModel(unittest.TestCase):
+    def build(self, seed: int) -> MultiWorld:
+        """Creates two players with random key locked regions, holding sendable items and events."""
+        rng = random.Random(seed)
+        multiworld = generate_test_multiworld(2)
+        keys = [(player, f"Key {index}") for player in (1, 2) for index in range(6)]
+        locations = []
+        for player in (1, 2):
+            regions = [multiworld.get_region("Menu", player)]
+            for index in range(4):
+                region = Region(f"Region {index}", player, multiworld)
+                multiworld.regions.append(region)
+                # regions may only depend on the player's own items
+                key = f"Key {rng.randrange(6)}"
+                rng.choice(regions).connect(region, f"Door {index}",
+                                            lambda state, key=key, player=player: state.has(key, player))
+                regions.append(region)
+            for index in range(12):
+                region = rng.choice(regions)
+                # every other location is an event
+                location = Location(player, f"Location {index}", index if index % 2 else None, region)
+                region.locations.append(location)
+                if rng.random() < 0.3:
+                    key_player, key = rng.choice(keys)
+                    set_rule(location, lambda state, key=key, key_player=key_player: state.has(key, key_player))
+                locations.append(location)
+        rng.shuffle(locations)
+        for player, key in keys:
+            location = locations.pop()
+            code = None if location.address is None else 0
+            multiworld.push_item(location, Item(key, ItemClassification.progression, code, player), False)
+        for location in locations:
+            code = None if location.address is None else 0
+            multiworld.push_item(location, Item("Filler", ItemClassification.filler, code, location.player), False)
+        return multiworld
+
+    def test_cached_spheres_match(self) -> None:
+        """Tests that the spheres read from the cached model match the ones computed without it"""
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                multiworld = self.build(seed)
+                spheres = list(multiworld.get_spheres())
+                sendable_spheres = list(multiworld.get_sendable_spheres())
+                self.assertIsNone(multiworld.playthrough_model)
+                model = multiworld.get_playthrough_model()
+                self.assertIs(model, multiworld.get_playthrough_model())
+                self.assertEqual(spheres, list(multiworld.get_spheres()))
+                self.assertEqual(sendable_spheres, list(multiworld.get_sendable_spheres()))
+
+    def test_invalidation(self) -> None:
+        """Tests that changing placements drops the cached model"""
+        multiworld = self.build(0)
+        location_1, location_2 = multiworld.get_filled_locations()[:2]
+        multiworld.get_playthrough_model()
+        swap_location_item(location_1, location_2)
+        self.assertIsNone(multiworld.playthrough_model)
+        multiworld.get_playthrough_model()
+        multiworld.push_item(location_1, location_2.item, False)
+        self.assertIsNone(multiworld.playthrough_model)
+
+        empty = Location(1, "Empty", None, multiworld.get_region("Menu", 1))
+        multiworld.get_region("Menu", 1).locations.append(empty)
+        multiworld.get_playthrough_model()
+        empty.place_locked_item(Item("Event", ItemClassification.progression, None, 1))
+        self.assertIsNone(multiworld.playthrough_model)
+
+    def test_direct_placement(self) -> None:
+        """Tests that items placed without going through the multiworld are noticed before the cached model is read"""
+        multiworld = self.build(0)
+        location = next(location for location in multiworld.get_filled_locations() if location.item.advancement)
+        model = multiworld.get_playthrough_model()
+        location.item = Item("Filler", ItemClassification.filler, location.item.code, location.player)
+        self.assertNotEqual(model.spheres, list(multiworld.get_spheres()))
+        self.assertIsNone(multiworld.playthrough_model)
+        self.assertIsNot(model, multiworld.get_playthrough_model())
@@ -0,0 +1,118 @@
+import pickle
+import unittest
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location, Region
+from worlds.generic.Rules import And, CanReachRegion, Count, Has, HasAll, HasAny, Opaque, Or, add_rule, set_rule
+from . import generate_test_multiworld
+
+
+class TestRuleNodes(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.player = 1
+        self.state = CollectionState(self.multiworld)
+
+    def add(self, name: str, count: int = 1) -> None:
+        self.state.add_item(name, self.player, count)
+
+    def test_leaves(self) -> None:
+        """Tests that leaf rules match the CollectionState helpers they stand for"""
+        player = self.player
+        rules = (Has("A", player), Has("A", player, 2), HasAll(("A", "B"), player), HasAny(("A", "B"), player),
+                 Count(("A", "B"), player, 3))
+        expected = (
+            lambda state: state.has("A", player), lambda state: state.has("A", player, 2),
+            lambda state: state.has_all(("A", "B"), player), lambda state: state.has_any(("A", "B"), player),
+            lambda state: state.has_from_list(("A", "B"), player, 3),
+        )
+        for items in ((), ("A",), ("A", "A"), ("B",), ("A", "B"), ("A", "A", "B")):
+            self.state = CollectionState(self.multiworld)
+            for item in items:
+                self.add(item)
+            for rule, lambda_rule in zip(rules, expected):
+                with self.subTest(rule=rule, items=items):
+                    self.assertEqual(lambda_rule(self.state), rule(self.state))
+
+    def test_combined(self) -> None:
+        """Tests that And/Or, including merged item checks and opaque leaves, evaluate like their lambda versions"""
+        player = self.player
+        rule = Or(And(Has("A", player, 2), HasAll(("B", "C"), player), lambda state: state.has("D", player)),
+                  Has("E", player) & Has("A", player), HasAny(("F", "G"), player))
+        expected = lambda state: ((state.has("A", player, 2) and state.has_all(("B", "C"), player)
+                                   and state.has("D", player))
+                                  or (state.has("E", player) and state.has("A", player))
+                                  or state.has_any(("F", "G"), player))
+        for items in ((), ("A", "A", "B", "C"), ("A", "A", "B", "C", "D"), ("A", "B", "C", "D"), ("E",), ("E", "A"),
+                      ("G",)):
+            self.state = CollectionState(self.multiworld)
+            for item in items:
+                self.add(item)
+            with self.subTest(items=items):
+                self.assertEqual(expected(self.state), rule(self.state))
+
+    def test_item_dependencies(self) -> None:
+        """Tests that item dependencies are known unless a rule depends on more than items"""
+        player = self.player
+        self.assertEqual({(player, "A"), (player, "B")}, And(Has("A", player), HasAny(("B",), player)).item_dependencies)
+        self.assertIsNone(And(Has("A", player), CanReachRegion("Menu", player)).item_dependencies)
+        self.assertIsNone(Or(Has("A", player), lambda state: True).item_dependencies)
+        self.assertIsNone(Opaque(lambda state: True).item_dependencies)
+
+    def test_flattening_and_identity(self) -> None:
+        """Tests that nested And/Or are flattened and equal rules compare and hash equal"""
+        player = self.player
+        rule = And(Has("A", player), And(Has("B", player), Has("C", player)))
+        self.assertEqual(And(Has("A", player), Has("B", player), Has("C", player)), rule)
+        self.assertEqual(hash(Has("A", player, 2)), hash(Has("A", player, 2)))
+        self.assertNotEqual(Has("A", player), Has("A", player + 1))
+        self.assertEqual(rule, pickle.loads(pickle.dumps(rule)))
+        self.assertEqual("Has('A', 1, 1)", repr(Has("A", player)))
+
+    def test_add_rule(self) -> None:
+        """Tests that add_rule keeps rules inspectable and lambdas as opaque leaves"""
+        player = self.player
+        region = self.multiworld.get_region("Menu", player)
+        location = Location(player, "Test", None, region)
+        add_rule(location, Has("A", player))
+        self.assertEqual(Has("A", player), location.access_rule)
+        add_rule(location, Has("B", player))
+        self.assertEqual(And(Has("B", player), Has("A", player)), location.access_rule)
+        add_rule(location, lambda state: state.has("C", player), "or")
+        self.assertIsInstance(location.access_rule, Or)
+        self.assertIsNone(location.access_rule.item_dependencies)
+        self.assertFalse(location.can_reach(self.state))
+        self.add("C")
+        self.assertTrue(location.can_reach(self.state))
+
+
+class TestRuleSweep(unittest.TestCase):
+    def test_sweep_matches_lambdas(self) -> None:
+        """Tests that sweeping over Rule based locations collects the same as over equivalent lambdas"""
+        results = []
+        for use_rules in (False, True):
+            multiworld = generate_test_multiworld()
+            player = 1
+            menu = multiworld.get_region("Menu", player)
+            region = Region("Other", player, multiworld)
+            multiworld.regions.append(region)
+            menu.connect(region, "Door", HasAll(("Key 0", "Key 1"), player) if use_rules
+                         else lambda state: state.has_all(("Key 0", "Key 1"), player))
+            # a chain of keys, where several locations share the same rule
+            for index in range(8):
+                for copy in range(3):
+                    location = Location(player, f"Key {index} Location {copy}", None, menu if index < 4 else region)
+                    location.parent_region.locations.append(location)
+                    if index:
+                        if use_rules:
+                            set_rule(location, Has(f"Key {index - 1}", player) | CanReachRegion("Nowhere", player)
+                                     if index == 5 else Has(f"Key {index - 1}", player))
+                        else:
+                            set_rule(location, lambda state, name=f"Key {index - 1}": state.has(name, player))
+                    location.place_locked_item(Item(f"Key {index}" if copy == 0 else f"Extra {index}",
+                                                    ItemClassification.progression, None, player))
+            multiworld.regions.append(Region("Nowhere", player, multiworld))
+            state = CollectionState(multiworld)
+            state.sweep_for_advancements()
+            results.append(sorted(location.name for location in state.advancements))
+        self.assertEqual(24, len(results[0]))
+        self.assertEqual(results[0], results[1])
@@ -0,0 +1,102 @@
+import unittest
+from typing import Dict, List
+
+from BaseClasses import CollectionState, Entrance, Item, ItemClassification, Region
+from . import generate_test_multiworld
+
+
+class TestCopyOnWrite(unittest.TestCase):
+    players = 3
+
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(self.players)
+        for player in self.multiworld.player_ids:
+            menu = self.multiworld.get_region("Menu", player)
+            locked = Region("Locked", player, self.multiworld)
+            self.multiworld.regions.append(locked)
+            entrance = Entrance(player, "Door", menu)
+            menu.exits.append(entrance)
+            entrance.connect(locked)
+            entrance.access_rule = lambda state, player=player: state.has("Key", player)
+        self.state = CollectionState(self.multiworld)
+
+    def key(self, player: int) -> Item:
+        return Item("Key", ItemClassification.progression, None, player)
+
+    def can_reach_locked(self, state: CollectionState, player: int) -> bool:
+        return state.can_reach_region("Locked", player)
+
+    def test_copy_is_independent(self) -> None:
+        """Tests that mutating either side of a copy-on-write copy does not affect the other side"""
+        self.assertFalse(self.can_reach_locked(self.state, 1))
+        copy = self.state.copy(copy_on_write=True)
+        copy.collect(self.key(1), True)
+        self.assertTrue(self.can_reach_locked(copy, 1))
+        self.assertFalse(self.can_reach_locked(self.state, 1))
+        self.assertFalse(self.state.has("Key", 1))
+
+        self.state.collect(self.key(2), True)
+        self.assertTrue(self.can_reach_locked(self.state, 2))
+        self.assertFalse(self.can_reach_locked(copy, 2))
+        self.assertFalse(copy.has("Key", 2))
+
+        copy.remove(self.key(1))
+        self.assertFalse(self.can_reach_locked(copy, 1))
+        self.state.add_item("Key", 3)
+        self.assertFalse(copy.has("Key", 3))
+
+    def test_unmutated_players_are_shared(self) -> None:
+        """Tests that players which are not mutated keep sharing their structures with the parent state"""
+        self.state.collect(self.key(1), True)
+        self.assertTrue(self.can_reach_locked(self.state, 1))
+        self.assertFalse(self.can_reach_locked(self.state, 2))
+        copy = self.state.copy(copy_on_write=True)
+        copy.collect(self.key(2), True)
+
+        self.assertTrue(self.can_reach_locked(copy, 1))
+        self.assertTrue(self.can_reach_locked(copy, 2))
+        self.assertIs(copy.prog_items[1], self.state.prog_items[1])
+        self.assertIs(copy.reachable_regions[1], self.state.reachable_regions[1])
+        self.assertIsNot(copy.prog_items[2], self.state.prog_items[2])
+        self.assertIsNot(copy.reachable_regions[2], self.state.reachable_regions[2])
+
+    def test_matches_full_copy(self) -> None:
+        """Tests that chains of copy-on-write copies reach the same regions as full copies"""
+        lazy = self.state
+        full = self.state
+        for player in (1, 2, 1, 3):
+            lazy = lazy.copy(copy_on_write=True)
+            full = full.copy()
+            lazy.collect(self.key(player), True)
+            full.collect(self.key(player), True)
+            for check_player in self.multiworld.player_ids:
+                self.assertEqual(self.can_reach_locked(full, check_player),
+                                 self.can_reach_locked(lazy, check_player))
+                self.assertEqual(full.prog_items[check_player], lazy.prog_items[check_player])
+
+    def test_lazy_copy_functions(self) -> None:
+        """Tests that lazy copy and materialize hooks are used by copy-on-write copies"""
+        calls: List[int] = []
+
+        def lazy_copy(state: CollectionState, new_state: CollectionState) -> CollectionState:
+            new_state.test_counts = state.test_counts.copy()
+            return new_state
+
+        def materialize(state: CollectionState, player: int) -> None:
+            calls.append(player)
+            state.test_counts[player] = state.test_counts[player].copy()
+
+        CollectionState.additional_lazy_copy_functions.append(lazy_copy)
+        CollectionState.additional_materialize_functions.append(materialize)
+        try:
+            test_counts: Dict[int, List[int]] = {player: [] for player in self.multiworld.player_ids}
+            self.state.test_counts = test_counts
+            copy = self.state.copy(copy_on_write=True)
+            self.assertIs(copy.test_counts[1], test_counts[1])
+            copy.collect(self.key(1), True)
+            self.assertEqual([1], calls)
+            self.assertIsNot(copy.test_counts[1], test_counts[1])
+            self.assertIs(copy.test_counts[2], test_counts[2])
+        finally:
+            CollectionState.additional_lazy_copy_functions.remove(lazy_copy)
+            CollectionState.additional_materialize_functions.remove(materialize)
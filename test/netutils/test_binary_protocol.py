@@ -0,0 +1,62 @@
+import typing
+import unittest
+import zlib
+
+from NetUtils import HintStatus, NetworkItem, NetworkSlot, SlotType, build_binary_frame, decode, decode_binary, \
+    decode_frame, encode, encode_binary_value, max_binary_depth, max_binary_size
+from Utils import Version
+
+
+class TestBinaryProtocol(unittest.TestCase):
+    values = [
+        None, True, False, 0, -1, 127, -128, 128, 2 ** 31, -2 ** 31 - 1, 2 ** 63 - 1, -2 ** 63, 2 ** 64, -2 ** 100,
+        1.5, float("inf"), "", "text", "äöü" * 200, [], [1, 2, 3], [2 ** 40, 1], [1, 2 ** 70], [1, "2"], (1, None),
+        {3, 4}, list(range(300)), [[1], {"a": [None]}], {}, {"key": "value"}, {1: 2, None: 3, False: 4, 1.5: 5},
+        HintStatus.HINT_FOUND, SlotType.group, Version(0, 6, 1), NetworkSlot("Player", "Game", SlotType.player),
+        NetworkItem(1, 2, 3, 4), [NetworkItem(-1, 2 ** 40, 3)] * 300, {"class": "Unknown", "value": 1},
+    ]
+
+    def test_matches_json(self) -> None:
+        """Tests that decoding binary returns the same as decoding JSON, with and without compression"""
+        for value in self.values:
+            for compress in (False, True):
+                with self.subTest(value=value, compress=compress):
+                    self.assertEqual(decode(encode([value])),
+                                     decode_binary(build_binary_frame([encode_binary_value(value)], compress)))
+
+    def test_invalid(self) -> None:
+        for frame in (b"", b"\x03\x00", b"\x01\xff", build_binary_frame([encode_binary_value(1)]) + b"\x00",
+                      b"\x02" + zlib.compress(b"\x09\x00")[:-1], b"\x02\x00"):
+            with self.subTest(frame=frame), self.assertRaises(ValueError):
+                decode_binary(frame)
+        with self.assertRaises(TypeError):
+            encode_binary_value(object())
+
+    def test_limits(self) -> None:
+        """Tests that frames decompressing to too much data or nesting too deep are refused"""
+        # a text of max_binary_size bytes, which compresses to a few KiB
+        bomb = b"\x02" + zlib.compress(b"\x08\xff" + max_binary_size.to_bytes(4, "little") + b"\x00" * max_binary_size)
+        with self.assertRaises(ValueError):
+            decode_binary(bomb)
+
+        def nested(depth: int) -> typing.Any:
+            value: typing.Any = None
+            for _ in range(depth):
+                value = [value]
+            return value
+
+        self.assertEqual(nested(max_binary_depth - 1),
+                         decode_binary(build_binary_frame([encode_binary_value(nested(max_binary_depth - 1))]))[0])
+        with self.assertRaises(ValueError):
+            decode_binary(build_binary_frame([encode_binary_value(nested(max_binary_depth))]))
+        with self.assertRaises(ValueError):
+            # lists of one list each, deeper than the recursion limit
+            decode_binary(b"\x01" + b"\x09\x01" * 2000 + b"\x00")
+
+    def test_binary_refused(self) -> None:
+        """Tests that binary frames are refused from peers that did not send the binary protocol tag"""
+        frame = build_binary_frame([encode_binary_value({"cmd": "Sync"})])
+        self.assertEqual([{"cmd": "Sync"}], decode_frame(frame, True))
+        self.assertEqual([{"cmd": "Sync"}], decode_frame(encode([{"cmd": "Sync"}]), False))
+        with self.assertRaises(ValueError):
+            decode_frame(frame, False)
@@ -3,7 +3,7 @@ import os
 import typing
 import unittest
 import warnings
-from NetUtils import LocationStore, _LocationStore
+from NetUtils import LocationStore, LocationTable, _LocationStore
 
 State = typing.Dict[typing.Tuple[int, int], typing.Set[int]]
 RawLocations = typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]]
@@ -241,6 +241,24 @@ class Base:
             self.assertEqual(len(store[1]), 1)
             self.assertEqual(len(store[2]), 0)
 
+        def test_from_columns(self) -> None:
+            store = self.type.from_columns(*LocationTable.from_dict(sample_data).columns)
+            self.assertEqual(sorted(store), sorted(sample_data))
+            for player, locations in sample_data.items():
+                self.assertEqual(dict(store[player].items()), locations)
+
+        def test_from_columns_hole(self) -> None:
+            with self.assertRaises(ValueError):
+                self.type.from_columns(*LocationTable.from_dict({
+                    1: {1: (1, 1, 1)},
+                    3: {1: (1, 1, 1)},
+                }).columns)
+
+        def test_from_columns_length_mismatch(self) -> None:
+            senders, counts, locations, items, receivers, flags = LocationTable.from_dict(sample_data).columns
+            with self.assertRaises(ValueError):
+                self.type.from_columns(senders, counts, locations, items[:-1], receivers, flags)
+
 
 class TestPurePythonLocationStore(Base.TestLocationStore):
     """Run base method tests for pure python implementation."""
@@ -249,6 +267,13 @@ class TestPurePythonLocationStore(Base.TestLocationStore):
         super().setUp()
 
 
+class TestPurePythonLocationStoreFromColumns(Base.TestLocationStore):
+    """Run base method tests for the pure python implementation loaded from columns."""
+    def setUp(self) -> None:
+        self.store = _LocationStore.from_columns(*LocationTable.from_dict(sample_data).columns)
+        super().setUp()
+
+
 class TestPurePythonLocationStoreConstructor(Base.TestLocationStoreConstructor):
     """Run base constructor tests for the pure python implementation."""
     def setUp(self) -> None:
@@ -265,6 +290,15 @@ class TestSpeedupsLocationStore(Base.TestLocationStore):
         super().setUp()
 
 
+@unittest.skipIf(LocationStore is _LocationStore and not ci, "_speedups not available")
+class TestSpeedupsLocationStoreFromColumns(Base.TestLocationStore):
+    """Run base method tests for cython implementation loaded from columns."""
+    def setUp(self) -> None:
+        self.assertFalse(LocationStore is _LocationStore, "Failed to load _speedups")
+        self.store = LocationStore.from_columns(*LocationTable.from_dict(sample_data).columns)
+        super().setUp()
+
+
 @unittest.skipIf(LocationStore is _LocationStore and not ci, "_speedups not available")
 class TestSpeedupsLocationStoreConstructor(Base.TestLocationStoreConstructor):
     """Run base constructor tests and tests the additional constraints for cython implementation."""
@@ -298,3 +332,9 @@ class TestSpeedupsLocationStoreConstructor(Base.TestLocationStoreConstructor):
             self.type({
                 1: {1: None},
             })
+
+    def test_from_columns_unsorted(self) -> None:
+        senders, counts, locations, items, receivers, flags = LocationTable.from_dict(sample_data).columns
+        locations[0], locations[1] = locations[1], locations[0]
+        with self.assertRaises(ValueError):
+            self.type.from_columns(senders, counts, locations, items, receivers, flags)
@@ -0,0 +1,86 @@
+import io
+import pickle
+import unittest
+import zlib
+
+from MultiServer import Context
+from NetUtils import LazyMultiData, LocationTable, MultiDataWriter, NetworkSlot, SlotType
+from Utils import version_tuple
+
+slots = (1, 2, 3)
+
+sample_multidata = {
+    "minimum_versions": {"server": (0, 0, 0), "clients": {slot: (0, 0, 0) for slot in slots}},
+    "version": tuple(version_tuple),
+    "slot_info": {slot: NetworkSlot(f"Player{slot}", "Archipelago", SlotType.player) for slot in slots},
+    "seed_name": "Test",
+    "connect_names": {f"Player{slot}": (0, slot) for slot in slots},
+    "locations": {
+        1: {13: (3, 3, 0), 11: (1, 2, 1), 12: (2, 2, 0)},
+        2: {21: (4, 1, 0)},
+        3: {},
+    },
+    "slot_data": {slot: {"goal": slot} for slot in slots},
+    "er_hint_data": {},
+    "precollected_items": {slot: [] for slot in slots},
+    "precollected_hints": {slot: set() for slot in slots},
+    "spheres": [{1: {11, 12}}, {1: {13}, 2: {21}}],
+    "datapackage": {"Archipelago": {"checksum": "abc"}},
+}
+
+
+def write_multidata(multidata: dict) -> bytes:
+    data = io.BytesIO()
+    with MultiDataWriter(data) as writer:
+        for name, value in multidata.items():
+            writer.write_section(name, value)
+    return data.getvalue()
+
+
+class NotAllowed:
+    pass
+
+
+class TestMultiData(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        """Tests that every section reads back the same, with the locations as a LocationTable"""
+        multidata = Context.decompress(write_multidata(sample_multidata))
+        self.assertIsInstance(multidata, LazyMultiData)
+        self.assertEqual(list(sample_multidata), list(multidata))
+        self.assertIsInstance(multidata["locations"], LocationTable)
+        self.assertEqual(sample_multidata, dict(multidata))
+
+    def test_sections_copied(self) -> None:
+        """Tests that only changed sections are encoded again when writing a loaded multidata"""
+        data = write_multidata(sample_multidata)
+        multidata = Context.decompress(data)
+        self.assertEqual(data, multidata.to_bytes())
+
+        multidata["datapackage"]["Archipelago"] = {"checksum": "def"}
+        del multidata["spheres"]
+        self.assertNotIn("spheres", multidata)
+        changed = Context.decompress(multidata.to_bytes())
+        self.assertEqual({"Archipelago": {"checksum": "def"}}, changed["datapackage"])
+        self.assertNotIn("spheres", changed)
+        self.assertEqual(sample_multidata["slot_data"], changed["slot_data"])
+
+    def test_legacy_format(self) -> None:
+        """Tests that multidata of format 3 still loads as a whole"""
+        data = bytes([3]) + zlib.compress(pickle.dumps(sample_multidata), 9)
+        self.assertEqual(sample_multidata, Context.decompress(data))
+
+    def test_restricted(self) -> None:
+        """Tests that sections the server could not load are rejected when writing them"""
+        with self.assertRaises(pickle.PicklingError):
+            write_multidata({"slot_data": {1: NotAllowed()}})
+
+    def test_load(self) -> None:
+        """Tests that the server loads its location store straight from the location table"""
+        ctx = Context("", 0, "", "", 0, 0, False)
+        multidata = {name: value for name, value in sample_multidata.items() if name != "datapackage"}
+        ctx._load(Context.decompress(write_multidata(multidata)), {}, False)
+        self.assertEqual((1, 2, 1), ctx.locations[1][11])
+        self.assertEqual([11, 12, 13], list(ctx.locations[1]))
+        self.assertEqual(0, len(ctx.locations[3]))
+        self.assertEqual({"goal": 2}, ctx.slot_data[2])
+        self.assertEqual(1, ctx.sphere_store.get_sphere(2, 21))
@@ -0,0 +1,31 @@
+import unittest
+
+from NetUtils import SphereStore
+
+
+class TestSphereStore(unittest.TestCase):
+    spheres = [
+        {1: {5, 1}, 2: {7}},
+        {1: {3}, 2: {2, 9}},
+        {2: {4}, 3: {1}},
+    ]
+
+    def test_matches_spheres(self) -> None:
+        store = SphereStore(self.spheres)
+        self.assertEqual(8, len(store))
+        for sphere_index, sphere in enumerate(self.spheres):
+            for player, location_ids in sphere.items():
+                for location_id in location_ids:
+                    self.assertEqual(sphere_index, store.get_sphere(player, location_id))
+
+    def test_batch(self) -> None:
+        store = SphereStore(self.spheres)
+        self.assertEqual([1, 2, 0, 0], store.get_spheres([(1, 3), (3, 1), (1, 5), (2, 7)]))
+
+    def test_missing(self) -> None:
+        store = SphereStore(self.spheres)
+        for player, location_id in ((1, 2), (1, 0), (1, 6), (2, 10), (4, 1)):
+            with self.subTest(player=player, location_id=location_id), self.assertRaises(KeyError):
+                store.get_sphere(player, location_id)
+        with self.assertRaises(KeyError):
+            store.get_spheres([(1, 1), (1, 2)])
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+
+from worlds import _bizhawk
+from worlds._bizhawk import BizHawkContext, ConnectionStatus, PIPELINED_SCRIPT_VERSION, RequestFailedError, \
+    WATCH_SCRIPT_VERSION
+from ..benchmark.bizhawk_connector import FakeConnector, connect
+
+
+class TestBizHawkConnector(unittest.IsolatedAsyncioTestCase):
+    async def check_requests(self, script_version: int) -> FakeConnector:
+        connector = FakeConnector(script_version)
+        ctx = BizHawkContext()
+        await connect(ctx, await connector.start())
+        try:
+            self.assertEqual(script_version >= PIPELINED_SCRIPT_VERSION, ctx.pipelined)
+            await _bizhawk.ping(ctx)
+            self.assertEqual(ConnectionStatus.CONNECTED, ctx.connection_status)
+            self.assertEqual("FAKEHASH", await _bizhawk.get_hash(ctx))
+
+            await _bizhawk.write(ctx, [(0x10, [1, 2, 3], "RAM"), (0x20, b"\x00\n\xff", "RAM")])
+            self.assertEqual([b"\x01\x02\x03", b"\x00\n\xff\x00"],
+                             await _bizhawk.read(ctx, [(0x10, 3, "RAM"), (0x20, 4, "RAM")]))
+            self.assertEqual([b"\x01"], await _bizhawk.guarded_read(ctx, [(0x10, 1, "RAM")], [(0x11, [2], "RAM")]))
+            self.assertIsNone(await _bizhawk.guarded_read(ctx, [(0x10, 1, "RAM")], [(0x11, [3], "RAM")]))
+            self.assertFalse(await _bizhawk.guarded_write(ctx, [(0x10, [9], "RAM")], [(0x11, [3], "RAM")]))
+            self.assertEqual(b"\x01", connector.memory["RAM"][0x10:0x11])
+
+            reads = await asyncio.gather(*(_bizhawk.read(ctx, [(0x10 + index, 1, "RAM")]) for index in range(3)))
+            self.assertEqual([[b"\x01"], [b"\x02"], [b"\x03"]], reads)
+        finally:
+            _bizhawk.disconnect(ctx)
+            await connector.stop()
+        return connector
+
+    async def test_pipelined(self) -> None:
+        """Tests that requests work over pipelined connections, and concurrent ones are handled on the same frame"""
+        connector = await self.check_requests(PIPELINED_SCRIPT_VERSION)
+        self.assertEqual(3, connector.most_messages_per_frame)
+
+    async def test_legacy(self) -> None:
+        """Tests that requests to scripts without pipelining still work, one message per round trip"""
+        connector = await self.check_requests(1)
+        self.assertEqual(1, connector.most_messages_per_frame)
+
+    async def test_connection_lost(self) -> None:
+        """Tests that pending requests fail when the connector goes away"""
+        connector = FakeConnector(PIPELINED_SCRIPT_VERSION)
+        ctx = BizHawkContext()
+        await connect(ctx, await connector.start())
+        connector.frame_time = 10  # don't answer anymore, once the current frame ended
+        await asyncio.sleep(0.1)
+        pending = asyncio.gather(*(_bizhawk.ping(ctx) for _ in range(2)), return_exceptions=True)
+        await asyncio.sleep(0.1)
+        await connector.stop()
+        for result in await pending:
+            self.assertIsInstance(result, RequestFailedError)
+        self.assertEqual(ConnectionStatus.NOT_CONNECTED, ctx.connection_status)
+        self.assertFalse(ctx.pipelined)
+
+    async def test_watch(self) -> None:
+        """Tests that watched memory is kept up to date, pushed by the connector or polled from older ones"""
+        for script_version in (1, PIPELINED_SCRIPT_VERSION, WATCH_SCRIPT_VERSION):
+            with self.subTest(script_version=script_version):
+                connector = FakeConnector(script_version)
+                connector.memory["RAM"][0x10:0x12] = b"\x01\x02"
+                ctx = BizHawkContext()
+                await connect(ctx, await connector.start())
+                try:
+                    watched = [(0x10, 2, "RAM"), (0x20, 1, "RAM")]
+                    self.assertEqual([b"\x01\x02", b"\x00"], await _bizhawk.watch(ctx, watched))
+                    self.assertTrue(ctx.watch_event.is_set())
+                    ctx.watch_event.clear()
+
+                    connector.memory["RAM"][0x11] = 3
+                    messages = connector.messages
+                    if not ctx.pushes_changes:
+                        await _bizhawk.update_watches(ctx)
+                    await asyncio.wait_for(ctx.watch_event.wait(), 1)
+                    self.assertEqual([b"\x01\x03", b"\x00"], await _bizhawk.watch(ctx, watched))
+                    if ctx.pushes_changes:
+                        self.assertEqual(messages, connector.messages)
+
+                    await _bizhawk.unwatch(ctx, watched[:1])
+                    self.assertEqual([watched[1]], list(ctx.watches))
+                    if ctx.pushes_changes:
+                        self.assertEqual(1, len(connector.watches))
+                finally:
+                    _bizhawk.disconnect(ctx)
+                    await connector.stop()
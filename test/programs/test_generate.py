@@ -126,8 +126,8 @@ class TestGenerateWeights(TestGenerateMain):
 
         # there's likely a better way to do this, but hardcode the results from seed 1 to ensure they're always this
         expected_results = {
-            "accessibility": [0, 2, 0, 2, 2],
-            "progression_balancing": [0, 50, 99, 0, 50],
+            "accessibility": [2, 0, 2, 0, 2],
+            "progression_balancing": [99, 50, 50, 50, 99],
         }
 
         self.assertEqual(seed, 1)
@@ -137,3 +137,15 @@ class TestGenerateWeights(TestGenerateMain):
                     result, getattr(namespace, option_name)[player].value,
                     "Generated results from weights file did not match expected value."
                 )
+
+    def test_roll_processes(self):
+        """Tests that rolling in worker processes gives the same options as rolling in this process."""
+        results = []
+        for roll_processes in ("1", "2"):
+            sys.argv = [sys.argv[0], "--seed", "1", "--player_files_path", str(self.abs_input_dir), "--multi", "5",
+                        "--roll_processes", roll_processes]
+            namespace, seed = Generate.main()
+            results.append({player: (namespace.accessibility[player].value,
+                                     namespace.progression_balancing[player].value)
+                            for player in range(1, 6)})
+        self.assertEqual(results[0], results[1])
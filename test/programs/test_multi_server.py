@@ -1,5 +1,21 @@
+import asyncio
+import copy
+import os
+import tempfile
+import typing
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+import unittest.mock
+
+from typing_extensions import override
+
+from MultiServer import Client, Context, EncodedMessage, ServerCommandProcessor, collect_player, on_client_connected, \
+    process_client_cmd, register_location_checks
+from NetUtils import Endpoint, Hint, HintStatus, MultiDataWriter, NetworkItem, NetworkSlot, SlotType, \
+    binary_protocol_tag, build_binary_frame, decode, decode_binary, decode_frame, encode
+from Utils import version_tuple
+
+if typing.TYPE_CHECKING:
+    from NetUtils import ServerConnection
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +54,335 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class FakeSocket:
+    """Records what the server sends through it, once open."""
+    def __init__(self) -> None:
+        self.open = False
+        self.extensions: typing.List[typing.Any] = []
+        self.sent: typing.List[typing.Union[str, bytes]] = []
+
+    async def send(self, data: typing.Union[str, bytes]) -> None:
+        self.sent.append(data)
+
+
+class FakeClient(Client):
+    """A client connected through a FakeSocket."""
+    def __init__(self, ctx: Context) -> None:
+        self.fake_socket = FakeSocket()
+        super().__init__(typing.cast("ServerConnection", self.fake_socket), ctx)
+
+
+class ContextTestBase(unittest.IsolatedAsyncioTestCase):
+    """Loads three slots, 1 finding items for 2 and 3, 2 finding one for 1 and 3 finding two for 2."""
+    slots = (1, 2, 3)
+
+    @override
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.multidata_filename = os.path.join(self.temp_dir, "Test.archipelago")
+        multidata: typing.Dict[str, typing.Any] = {
+            "minimum_versions": {"server": (0, 0, 0), "clients": {slot: (0, 0, 0) for slot in self.slots}},
+            "version": tuple(version_tuple),
+            "slot_info": {slot: NetworkSlot(f"Player{slot}", "Archipelago", SlotType.player) for slot in self.slots},
+            "seed_name": "Test",
+            "connect_names": {f"Player{slot}": (0, slot) for slot in self.slots},
+            "locations": {
+                1: {11: (1, 2, 0), 12: (2, 2, 0), 13: (3, 3, 0)},
+                2: {21: (4, 1, 0)},
+                3: {31: (5, 2, 0), 32: (6, 2, 0)},
+            },
+            "slot_data": {slot: {} for slot in self.slots},
+            "er_hint_data": {},
+            "precollected_items": {slot: [] for slot in self.slots},
+            "precollected_hints": {slot: set() for slot in self.slots},
+        }
+        with open(self.multidata_filename, "wb") as f, MultiDataWriter(f) as writer:
+            for name, value in multidata.items():
+                writer.write_section(name, value)
+
+        self.ctx = self.create_context()
+        self.clients: typing.Dict[int, FakeClient] = {}
+        for slot in self.slots:
+            client = FakeClient(self.ctx)
+            client.team, client.slot, client.items_handling = 0, slot, 0b111
+            client.no_text = client.no_locations = False
+            client.auth = True
+            self.ctx.clients[0][slot].append(client)
+            self.clients[slot] = client
+
+    def create_context(self) -> Context:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        ctx.load(self.multidata_filename)
+        return ctx
+
+
+class TestItemDelivery(ContextTestBase):
+    async def received_items(self) -> typing.Dict[int, typing.List[typing.List[int]]]:
+        """Returns the items of every ReceivedItems message per receiving slot, since the last call"""
+        received: typing.Dict[int, typing.List[typing.List[int]]] = {}
+        for slot, client in self.clients.items():
+            for msg in self.ctx.outgoing.get(client, []):
+                if msg.cmd == "ReceivedItems":
+                    received.setdefault(slot, []).append([item.item for item in decode(msg.data)["items"]])
+        self.ctx.outgoing.clear()
+        return received
+
+    async def test_check_only_reaches_receivers(self) -> None:
+        """Tests that a check only sends ReceivedItems to the clients of its receivers"""
+        register_location_checks(self.ctx, 0, 1, [11, 13])
+        self.assertEqual({2: [[1]], 3: [[3]]}, await self.received_items())
+        self.assertFalse(self.ctx.pending_item_receivers)
+        register_location_checks(self.ctx, 0, 1, [11])
+        self.assertEqual({}, await self.received_items())
+
+    async def test_collect_is_coalesced(self) -> None:
+        """Tests that collecting items from several worlds sends a single ReceivedItems per client"""
+        collect_player(self.ctx, 0, 2)
+        self.assertEqual({2: [[1, 2, 5, 6]]}, await self.received_items())
+        self.assertEqual(4, self.clients[2].send_index)
+
+
+class TestOutgoingMessages(ContextTestBase):
+    async def test_coalesced(self) -> None:
+        """Tests that messages queued for a client within one tick are sent as one frame, equal to encoding them"""
+        msgs = [{"cmd": "PrintJSON", "data": [{"text": f"Message {index}"}]} for index in range(3)]
+        self.ctx.broadcast_team(0, msgs[:1])
+        self.ctx.notify_client_multiple(self.clients[1], ["Message 1", "Message 2"])
+        self.assertEqual([encode(msgs)], self.ctx.build_frames(self.ctx.outgoing[self.clients[1]]))
+        self.assertEqual([encode(msgs[:1])], self.ctx.build_frames(self.ctx.outgoing[self.clients[2]]))
+        self.assertEqual(3, self.ctx.message_stats["PrintJSON"].encoded)  # once per message, not per client
+        self.assertEqual(4, self.ctx.message_stats["PrintJSON"].sent)
+        self.assertEqual(2, self.ctx.message_stats["PrintJSON"].frames)
+
+    async def test_frame_size(self) -> None:
+        """Tests that coalesced messages are split into frames of up to max_frame_size"""
+        msgs = [self.ctx.encode_msg({"cmd": "PrintJSON", "data": [{"text": "x" * 100}]}) for _ in range(10)]
+        self.ctx.max_frame_size = msgs[0].size * 3 + 2
+        frames = self.ctx.build_frames(msgs)
+        self.assertEqual([3, 3, 3, 1], [len(decode_frame(frame)) for frame in frames])
+        self.assertTrue(all(len(frame) <= self.ctx.max_frame_size + 2 for frame in frames))
+
+    async def test_received_items(self) -> None:
+        """Tests that ReceivedItems encoded from cached items match encoding the message"""
+        items = [NetworkItem(1, 11, 1, 0), NetworkItem(2, 12, 1, 1), NetworkItem(1, 11, 1, 0)]
+        for index in (0, 5):
+            self.assertEqual(encode({"cmd": "ReceivedItems", "index": index, "items": items}),
+                             self.ctx.encode_received_items(index, items).data)
+
+    async def test_send_keeps_order(self) -> None:
+        """Tests that messages sent right away go out after the ones queued for the client, not ahead of them"""
+        client = self.clients[1]
+        client.fake_socket.open = True
+        self.ctx.notify_client(client, "Queued")
+        await Context.send_msgs(self.ctx, client, [{"cmd": "Bounced", "data": {}}])
+        self.assertEqual([["PrintJSON", "Bounced"]],
+                         [[msg["cmd"] for msg in decode_frame(frame)] for frame in client.fake_socket.sent])
+        self.assertNotIn(client, self.ctx.outgoing)
+
+    async def test_connected_first(self) -> None:
+        """Tests that a joining client gets Connected ahead of the join messages"""
+        client = FakeClient(self.ctx)
+        client.fake_socket.open = True
+        self.ctx.endpoints.append(client)
+        await process_client_cmd(self.ctx, client, {
+            "cmd": "Connect", "password": None, "name": "Player1", "game": "Archipelago", "version": version_tuple,
+            "uuid": 1, "tags": [], "items_handling": 0b111})
+        self.assertEqual("Connected", decode_frame(client.fake_socket.sent[0])[0]["cmd"])
+        self.assertIn("Join", [msg.msg.get("type") for msg in self.ctx.outgoing[client]])
+
+
+class TestBinaryProtocol(ContextTestBase):
+    server_cmds = {"RoomInfo", "ConnectionRefused", "Connected", "ReceivedItems", "LocationInfo", "RoomUpdate",
+                   "PrintJSON", "DataPackage", "Bounced", "InvalidPacket", "Retrieved", "SetReply"}
+
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        self.encoded: typing.List[EncodedMessage] = []
+        self.enterContext(unittest.mock.patch.object(self.ctx, "send_msgs", self.send_msgs))
+
+    async def send_msgs(self, endpoint: Endpoint,
+                        msgs: typing.Iterable[typing.Union[typing.Dict[str, typing.Any], EncodedMessage]]) -> bool:
+        """Stands in for Context.send_msgs, keeping what would have been sent"""
+        self.encoded.extend(msg if isinstance(msg, EncodedMessage) else self.ctx.encode_msg(msg) for msg in msgs)
+        return True
+
+    async def process(self, client: Client, msg: typing.Dict[str, typing.Any]) -> None:
+        await process_client_cmd(self.ctx, client, msg)
+        for msgs in self.ctx.outgoing.values():
+            self.encoded.extend(msgs)
+        self.ctx.outgoing.clear()
+
+    async def test_conformance(self) -> None:
+        """Tests that every packet the server emits decodes the same from binary as from JSON"""
+        register_location_checks(self.ctx, 0, 2, [21])
+        client = FakeClient(self.ctx)
+        self.ctx.endpoints.append(client)
+        connect = {"cmd": "Connect", "password": None, "name": "Player1", "game": "Archipelago",
+                   "version": version_tuple, "uuid": 1, "tags": [binary_protocol_tag], "items_handling": 0b111}
+        await on_client_connected(self.ctx, client)
+        await self.process(client, {**connect, "name": "Nobody"})
+        await self.process(client, connect)
+        self.assertTrue(client.binary)
+        for msg in (
+            {"cmd": "GetDataPackage", "games": ["Archipelago"]},
+            {"cmd": "LocationScouts", "locations": [11, 13], "create_as_hint": 2},
+            {"cmd": "LocationChecks", "locations": [12]},
+            {"cmd": "Say", "text": "Hello"},
+            {"cmd": "Bounce", "slots": [1], "data": {"time": 1.5, "source": "Player1", "nested": [[None, True]]}},
+            {"cmd": "Get", "keys": ["_read_hints_0_1", "missing"]},
+            {"cmd": "Set", "key": "Key", "default": 0, "want_reply": True,
+             "operations": [{"operation": "replace", "value": {"1": [2 ** 40, -3], "big": 2 ** 80, "text": "äö"}}]},
+            {"cmd": "Get"},
+        ):
+            await self.process(client, msg)
+
+        self.assertEqual(self.server_cmds, {msg.cmd for msg in self.encoded})
+        for msg in self.encoded:
+            with self.subTest(cmd=msg.cmd):
+                expected = decode(f"[{msg.data}]")
+                self.assertEqual(expected, decode_binary(build_binary_frame([msg.binary])))
+                self.assertEqual(expected, decode_binary(build_binary_frame([msg.binary], True)))
+
+    async def test_frames(self) -> None:
+        """Tests that only clients with the binary protocol tag get binary frames, only for binary_cmds"""
+        items = [NetworkItem(1, 11, 1, 0)] * 100
+        msgs = [self.ctx.encode_received_items(0, items), self.ctx.encode_received_items(100, items),
+                self.ctx.encode_msg({"cmd": "PrintJSON", "data": [{"text": "text"}]}),
+                self.ctx.encode_received_items(200, items)]
+        client = self.clients[1]
+        text_frame, = self.ctx.build_endpoint_frames(client, msgs)
+        self.assertIsInstance(text_frame, str)
+        client.binary = True
+        frames = self.ctx.build_endpoint_frames(client, msgs)
+        self.assertEqual([bytes, str, bytes], [type(frame) for frame in frames])
+        self.assertLess(len(frames[0]), len(text_frame) // 20)  # compressed without permessage-deflate
+        self.assertEqual(decode_frame(text_frame), [msg for frame in frames for msg in decode_frame(frame)])
+
+
+class TestLocationHints(ContextTestBase):
+    async def test_check_updates_hints_of_location(self) -> None:
+        """Tests that checking a location marks its hints found in every slot holding them, and only reports those"""
+        checked_hint = Hint(3, 1, 13, 3, False)
+        other_hint = Hint(2, 1, 11, 1, False)
+        self.ctx.notify_hints(0, [checked_hint, other_hint])
+        changed_hints: typing.List[typing.Tuple[int, int]] = []
+
+        def on_changed_hints(team: int, slot: int) -> None:
+            changed_hints.append((team, slot))
+
+        self.enterContext(unittest.mock.patch.object(self.ctx, "on_changed_hints", on_changed_hints))
+
+        register_location_checks(self.ctx, 0, 1, [13])
+        found_hint = checked_hint._replace(found=True, status=HintStatus.HINT_FOUND)
+        self.assertEqual({(0, 1), (0, 3)}, set(changed_hints))
+        self.assertEqual({found_hint, other_hint}, self.ctx.hints[0, 1])
+        self.assertEqual({other_hint}, self.ctx.hints[0, 2])
+        self.assertEqual({found_hint}, self.ctx.hints[0, 3])
+        self.assertEqual({found_hint}, self.ctx.location_hints[0, 1, 13])
+
+        # nothing is left over for a full recheck
+        changed: typing.Set[typing.Tuple[int, int]] = set()
+        self.ctx.recheck_hints(changed=changed)
+        self.assertEqual(set(), changed)
+
+
+class TestJournalSave(ContextTestBase):
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        self.save_filename = os.path.join(self.temp_dir, "Test.apsave")
+        self.ctx.save_filename = self.save_filename
+        self.ctx.journal_save = self.ctx.saving = True
+
+    def load(self) -> Context:
+        """Loads the save into a new Context, like a restarted server would"""
+        ctx = self.create_context()
+        ctx.save_filename = self.save_filename
+        ctx.journal_save = ctx.saving = True
+        ctx.set_save(ctx.read_save_file())
+        return ctx
+
+    def assert_loaded_state(self, ctx: Context, expected: typing.Dict[str, typing.Any]) -> None:
+        save = ctx.get_save()
+        for section in ("received_items", "hints_used", "hints", "location_checks", "stored_data"):
+            with self.subTest(section=section):
+                self.assertEqual({key: value for key, value in expected[section].items() if value},
+                                 {key: value for key, value in save[section].items() if value})
+
+    async def make_changes(self, step: int) -> None:
+        """Registers one check of slot 1, a hint and a data storage change"""
+        register_location_checks(self.ctx, 0, 1, [11 + step])
+        self.ctx.notify_hints(0, [Hint(2, 3, 31 + step, 5 + step, False)])
+        await process_client_cmd(self.ctx, self.clients[1], {
+            "cmd": "Set", "key": "counter", "default": 0, "operations": [{"operation": "add", "value": step + 1}]})
+        await asyncio.sleep(0)
+
+    async def test_journal_replay(self) -> None:
+        """Tests that a snapshot followed by journal records loads the state at the last save"""
+        self.assertTrue(self.ctx.save(now=True))  # first save writes a snapshot
+        snapshot_size = os.path.getsize(self.save_filename)
+        for step in range(2):
+            await self.make_changes(step)
+            self.assertTrue(self.ctx.save(now=True))
+        self.assertEqual(snapshot_size, os.path.getsize(self.save_filename))
+        self.assertEqual(2, self.ctx.journal_sequence)
+        self.assert_loaded_state(self.load(), self.ctx.get_save())
+        self.assertEqual(3, self.load().stored_data["counter"])
+
+    async def test_torn_record(self) -> None:
+        """Tests that a record cut short by a crash is dropped, and that saving continues after the last good one"""
+        self.ctx.save(now=True)
+        await self.make_changes(0)
+        self.ctx.save(now=True)
+        expected = copy.deepcopy(self.ctx.get_save())
+        await self.make_changes(1)
+        self.ctx.save(now=True)
+        with open(self.ctx.journal_filename, "r+b") as f:
+            f.truncate(os.path.getsize(self.ctx.journal_filename) - 3)
+
+        with self.assertLogs(self.ctx.logger, "WARNING"):
+            loaded = self.load()
+        self.assert_loaded_state(loaded, expected)
+        self.assertEqual(1, loaded.journal_sequence)
+
+        # the server continues with what it loaded
+        self.ctx = loaded
+        for slot, client in self.clients.items():
+            self.ctx.clients[0][slot].append(client)
+        await self.make_changes(1)
+        self.ctx.save(now=True)
+        self.assert_loaded_state(self.load(), self.ctx.get_save())
+
+    async def test_crash_during_compaction(self) -> None:
+        """Tests that records already part of a snapshot are skipped, if the journal was not emptied after it"""
+        self.ctx.save(now=True)
+        for step in range(2):
+            await self.make_changes(step)
+            self.ctx.save(now=True)
+        with open(self.ctx.journal_filename, "rb") as f:
+            journal = f.read()
+        self.ctx.journal_compact = True
+        self.assertTrue(self.ctx.save(now=True))  # compacts
+        self.assertEqual(0, os.path.getsize(self.ctx.journal_filename))
+        expected = self.ctx.get_save()
+        with open(self.ctx.journal_filename, "wb") as f:
+            f.write(journal)
+        self.assert_loaded_state(self.load(), expected)
+
+    async def test_compaction(self) -> None:
+        """Tests that the journal is folded into a snapshot once it grew larger than the snapshot"""
+        self.ctx.save(now=True)
+        self.ctx.snapshot_size = 1
+        await self.make_changes(0)
+        self.ctx.save(now=True)
+        self.assertGreater(os.path.getsize(self.ctx.journal_filename), 0)
+        await self.make_changes(1)
+        self.ctx.save(now=True)
+        self.assertEqual(0, os.path.getsize(self.ctx.journal_filename))
+        self.assertEqual(os.path.getsize(self.save_filename), self.ctx.snapshot_size)
+        self.assert_loaded_state(self.load(), self.ctx.get_save())
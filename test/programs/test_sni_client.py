@@ -0,0 +1,58 @@
+import asyncio
+import json
+import typing
+import unittest
+
+import websockets
+
+from SNIClient import SNESState, SNIContext, merge_snes_ranges, snes_read, snes_read_ranges, snes_recv_loop
+
+
+class FakeSNI:
+    """Answers GetAddress requests with several operand pairs like SNI, spreading the data over two messages"""
+    def __init__(self) -> None:
+        self.memory = bytes(range(256)) * 16
+        self.requests: typing.List[typing.List[str]] = []
+
+    async def handle(self, socket) -> None:
+        async for message in socket:
+            request = json.loads(message)
+            assert request["Opcode"] == "GetAddress"
+            operands = request["Operands"]
+            self.requests.append(operands)
+            data = b"".join(self.memory[int(address, 16):int(address, 16) + int(size, 16)]
+                            for address, size in zip(operands[::2], operands[1::2]))
+            await socket.send(data[:len(data) // 2])
+            await socket.send(data[len(data) // 2:])
+
+
+class TestSNIClient(unittest.IsolatedAsyncioTestCase):
+    def test_merge_ranges(self) -> None:
+        """Tests that overlapping and adjacent ranges are merged, and others are kept apart"""
+        self.assertEqual([(0x10, 8), (0x20, 4)], merge_snes_ranges([(0x20, 2), (0x14, 4), (0x10, 4), (0x21, 3)]))
+        self.assertEqual([(0x10, 16)], merge_snes_ranges([(0x10, 16), (0x12, 2)]))
+        self.assertEqual([], merge_snes_ranges([]))
+
+    async def test_read_ranges(self) -> None:
+        """Tests that several ranges are read with a single request and split back up in the requested order"""
+        sni = FakeSNI()
+        server = await websockets.serve(sni.handle, "127.0.0.1", 0)
+        ctx = SNIContext("", None, None)
+        ctx.snes_socket = await websockets.connect(f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+        ctx.snes_state = SNESState.SNES_ATTACHED
+        recv_loop = asyncio.create_task(snes_recv_loop(ctx))
+        try:
+            ranges = [(0x120, 4), (0x100, 8), (0x104, 8), (0x10C, 2), (0x800, 0x200)]
+            data = await snes_read_ranges(ctx, ranges)
+            self.assertEqual([sni.memory[address:address + size] for address, size in ranges], data)
+            self.assertEqual([["100", "e", "120", "4", "800", "200"]], sni.requests)
+
+            self.assertEqual(sni.memory[0x42:0x45], await snes_read(ctx, 0x42, 3))
+            self.assertEqual(2, len(sni.requests))
+            self.assertEqual([], await snes_read_ranges(ctx, []))
+            self.assertEqual(2, len(sni.requests))
+        finally:
+            await ctx.snes_socket.close()
+            await recv_loop
+            server.close()
+            await server.wait_closed()
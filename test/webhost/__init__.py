@@ -6,20 +6,33 @@ from flask import Flask
 from flask.testing import FlaskClient
 
 
+pony_config = {
+    "provider": "sqlite",
+    "filename": ":memory:",
+    "create_db": True,
+}
+
+
+def bind_db() -> None:
+    """Binds the database for tests that use the models without the app, unless that already happened."""
+    from WebHostLib.models import db
+
+    if db.provider is None:
+        db.bind(**pony_config)
+        db.generate_mapping(create_tables=True)
+
+
 class TestBase(unittest.TestCase):
     app: typing.ClassVar[Flask]
     client: FlaskClient
 
     @classmethod
     def setUpClass(cls) -> None:
+        from pony.orm import BindingError
         from WebHostLib import app as raw_app
         from WebHost import get_app
 
-        raw_app.config["PONY"] = {
-            "provider": "sqlite",
-            "filename": ":memory:",
-            "create_db": True,
-        }
+        raw_app.config["PONY"] = pony_config
         raw_app.config.update({
             "TESTING": True,
             "DEBUG": True,
@@ -31,6 +44,9 @@ class TestBase(unittest.TestCase):
             if "register_blueprint" not in e.args[0]:
                 raise
             cls.app = raw_app
+        except BindingError:
+            # the database was already bound by bind_db, with the same config
+            cls.app = raw_app
 
     def setUp(self) -> None:
         self.client = self.app.test_client()
@@ -0,0 +1,67 @@
+import typing
+import unittest
+from uuid import uuid4
+
+from . import bind_db
+
+
+class FakeLoop:
+    def __init__(self) -> None:
+        self.calls: typing.List[typing.Tuple[typing.Callable[[str], None], str]] = []
+
+    def call_soon_threadsafe(self, callback: typing.Callable[[str], None], text: str) -> None:
+        self.calls.append((callback, text))
+
+
+class TestDBCommandDispatcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        bind_db()
+
+    def setUp(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room, Seed
+
+        owner = uuid4()
+        with db_session:
+            seed = Seed(multidata=b"", owner=owner)
+            self.room_ids = [Room(seed=seed, owner=owner, tracker=uuid4()).id for _ in range(3)]
+
+    def tearDown(self) -> None:
+        from pony.orm import db_session, delete
+        from WebHostLib.models import Command, Room
+
+        with db_session:
+            seed = Room.get(id=self.room_ids[0]).seed
+            for room_id in self.room_ids:
+                delete(command for command in Command if command.room.id == room_id)
+                Room.get(id=room_id).delete()
+            seed.delete()
+
+    def test_dispatch(self) -> None:
+        """Tests that commands reach the loop of their room, in a single pass over all rooms, and only added rooms"""
+        from pony.orm import count, db_session
+        from WebHostLib.customserver import DBCommandDispatcher
+        from WebHostLib.models import Command, Room
+
+        dispatcher = DBCommandDispatcher()
+        dispatcher.max_query_rooms = 1  # split the query
+        loops = [FakeLoop() for _ in self.room_ids]
+        processors = [lambda text: None for _ in self.room_ids]
+        for room_id, loop, processor in zip(self.room_ids[:2], loops, processors):
+            dispatcher.add_room(room_id, loop, processor)
+        with db_session:
+            for room_id in self.room_ids:
+                room = Room.get(id=room_id)
+                Command(room=room, commandtext=f"/first {room_id}")
+                Command(room=room, commandtext=f"/second {room_id}")
+
+        dispatcher.dispatch()
+        for room_id, loop, processor in zip(self.room_ids[:2], loops, processors):
+            self.assertEqual([(processor, f"/first {room_id}"), (processor, f"/second {room_id}")], loop.calls)
+        with db_session:
+            self.assertEqual(2, count(command for command in Command if command.room.id == self.room_ids[2]))
+
+        dispatcher.remove_room(self.room_ids[0])
+        dispatcher.dispatch()
+        self.assertEqual(2, len(loops[0].calls))
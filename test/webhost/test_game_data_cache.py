@@ -0,0 +1,62 @@
+import logging
+import unittest
+
+
+class TestGameDataCache(unittest.TestCase):
+    def test_lru(self) -> None:
+        from WebHostLib.customserver import GameDataCache
+
+        cache = GameDataCache(2)
+        self.assertEqual(({1: "a"}, False), cache.get("a", lambda: {1: "a"})[::2])
+        cache.get("b", lambda: {2: "b"})
+        self.assertEqual(({1: "a"}, True), cache.get("a", lambda: self.fail("a should be cached"))[::2])
+        cache.get("c", lambda: {3: "c"})  # evicts b, which was used least recently
+        self.assertEqual(["a", "c"], list(cache.entries))
+        self.assertEqual((None, 0, False), cache.get("d", lambda: None))
+        self.assertNotIn("d", cache.entries)
+
+
+class TestSharedGameData(unittest.IsolatedAsyncioTestCase):
+    multidata = {
+        "minimum_versions": {"server": (0, 0, 0), "clients": {1: (0, 0, 0)}},
+        "version": (0, 6, 0),
+        "seed_name": "Test",
+        "connect_names": {"Player1": (0, 1)},
+        "slot_data": {1: {}},
+        "er_hint_data": {},
+        "precollected_items": {1: []},
+        "precollected_hints": {1: set()},
+    }
+
+    def create_context(self):
+        from NetUtils import NetworkSlot, SlotType
+        from WebHostLib.customserver import WebHostContext, get_static_server_data
+
+        ctx = WebHostContext(get_static_server_data(), logging.getLogger("Test"))
+        ctx._load({**self.multidata, "locations": {1: {1: (1, 1, 0)}},
+                   "slot_info": {1: NetworkSlot("Player1", "Archipelago", SlotType.player)}}, {}, True)
+        return ctx
+
+    async def test_lookups_shared(self) -> None:
+        """Tests that rooms share their name lookups, which match the ones of MultiServer, without modifying them"""
+        from MultiServer import Context
+
+        ctx_1 = self.create_context()
+        ctx_2 = self.create_context()
+        multiserver_ctx = Context("", 0, "", "", 0, 0, False)
+        multiserver_ctx._init_game_data()
+        self.assertGreater(ctx_2.shared_game_data_size, 0)
+        self.assertIs(ctx_1.non_hintable_names, ctx_2.non_hintable_names)
+        for game in ctx_1.gamespackage:
+            with self.subTest(game=game):
+                self.assertIs(ctx_1.item_names[game], ctx_2.item_names[game])
+                self.assertIs(ctx_1.location_names[game], ctx_2.location_names[game])
+                self.assertIs(ctx_1.all_item_and_group_names[game], ctx_2.all_item_and_group_names[game])
+                self.assertEqual(multiserver_ctx.item_names[game], ctx_1.item_names[game])
+                self.assertEqual(multiserver_ctx.location_names[game], ctx_1.location_names[game])
+                self.assertEqual(multiserver_ctx.all_location_and_group_names[game],
+                                 ctx_1.all_location_and_group_names[game])
+        names = ctx_1.item_names["Archipelago"]
+        size = len(names)
+        self.assertEqual("Unknown item (ID:123456789)", names[123456789])
+        self.assertEqual(size, len(names))
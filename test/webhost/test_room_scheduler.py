@@ -0,0 +1,92 @@
+import typing
+import unittest
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from . import bind_db
+
+
+class FakeHoster:
+    def __init__(self) -> None:
+        self.room_ids: typing.Set[UUID] = set()
+        self.started: typing.List[UUID] = []
+        self.shut_down: typing.List[UUID] = []
+
+    def start_room(self, room_id: UUID) -> None:
+        self.room_ids.add(room_id)
+        self.started.append(room_id)
+
+    def collect_shut_down_rooms(self) -> typing.List[UUID]:
+        shut_down, self.shut_down = self.shut_down, []
+        self.room_ids.difference_update(shut_down)
+        return shut_down
+
+
+class TestRoomScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        bind_db()
+
+    def setUp(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room, Seed
+
+        self.now = datetime.utcnow()
+        owner = uuid4()
+        with db_session:
+            seed = Seed(multidata=b"", owner=owner)
+            # four active rooms and one that timed out an hour ago
+            self.room_ids = [Room(seed=seed, owner=owner, tracker=uuid4(), timeout=60, last_activity=self.now).id
+                             for _ in range(4)]
+            self.room_ids.append(Room(seed=seed, owner=owner, tracker=uuid4(), timeout=60,
+                                      last_activity=self.now - timedelta(hours=1)).id)
+
+    def tearDown(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+
+        with db_session:
+            seed = Room.get(id=self.room_ids[0]).seed
+            for room_id in self.room_ids:
+                Room.get(id=room_id).delete()
+            seed.delete()
+
+    def set_last_activity(self, room_id: UUID, last_activity: datetime) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+
+        with db_session:
+            Room.get(id=room_id).last_activity = last_activity
+
+    def test_scheduling(self) -> None:
+        """Tests that active rooms are started once, balanced over the hosters, and restarted only if still wanted"""
+        from WebHostLib.autolauncher import RoomScheduler
+
+        hosters = [FakeHoster(), FakeHoster()]
+        scheduler = RoomScheduler(hosters)
+        scheduler.tick(self.now)
+        self.assertEqual(set(self.room_ids[:4]), {*hosters[0].started, *hosters[1].started})
+        self.assertEqual([2, 2], [len(hoster.started) for hoster in hosters])
+
+        scheduler.tick(self.now + timedelta(seconds=1))
+        self.assertEqual([2, 2], [len(hoster.started) for hoster in hosters])
+
+        # activity on the timed out room starts it on the hoster hosting the fewest rooms
+        hosters[0].shut_down.append(hosters[0].started[0])
+        self.set_last_activity(hosters[0].started[0], self.now - timedelta(hours=1))
+        self.set_last_activity(self.room_ids[4], self.now + timedelta(seconds=2))
+        scheduler.tick(self.now + timedelta(seconds=2))
+        self.assertEqual(self.room_ids[4], hosters[0].started[-1])
+        self.assertEqual(3, len(hosters[0].started))
+
+        # a room that shuts down while it had new activity is started again
+        restarted = hosters[1].started[0]
+        hosters[1].shut_down.append(restarted)
+        scheduler.tick(self.now + timedelta(seconds=3))
+        self.assertEqual(restarted, hosters[1].started[-1])
+        self.assertEqual(3, len(hosters[1].started))
+
+        # deadlines of rooms past their timeout are dropped
+        scheduler.tick(self.now + timedelta(minutes=5))
+        self.assertEqual({}, scheduler.deadlines)
+        self.assertEqual([], scheduler.deadline_heap)
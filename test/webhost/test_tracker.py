@@ -93,3 +93,32 @@ class TestTracker(TestBase):
                 headers={"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00"},  # missing timezone
             )
             self.assertEqual(response.status_code, 400)
+
+    def test_shared_data(self) -> None:
+        """
+        Verify that tracker data is loaded once for all requests, and the multisave again once the room saved
+        """
+        import datetime
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+        from WebHostLib.tracker import TrackerData
+
+        with db_session:
+            room = Room.get(id=self.room_id)
+            first, second = TrackerData(room), TrackerData(room)
+            self.assertIs(first._multidata, second._multidata)
+            self.assertIs(first._multisave, second._multisave)
+            self.assertIs(first.item_id_to_name["Archipelago"], second.item_id_to_name["Archipelago"])
+            self.assertEqual("Unknown Item (ID: 123456789)", first.item_id_to_name["Archipelago"][123456789])
+            self.assertNotIn(123456789, second.item_id_to_name["Archipelago"])
+            self.assertEqual(set(), first.get_player_checked_locations(0, 1))
+
+        with db_session:
+            room = Room.get(id=self.room_id)
+            room.multisave = pickle.dumps({"location_checks": {(0, 1): {1}}})
+            room.last_activity = datetime.datetime.utcnow() + datetime.timedelta(seconds=1)
+
+        with db_session:
+            saved = TrackerData(Room.get(id=self.room_id))
+            self.assertIs(first._multidata, saved._multidata)
+            self.assertEqual({1}, saved.get_player_checked_locations(0, 1))
@@ -62,6 +62,15 @@ class AutoWorldRegister(type):
         dct["location_name_groups"]["Everywhere"] = dct["location_names"]
         dct["all_item_and_group_names"] = frozenset(dct["item_names"] | set(dct.get("item_name_groups", {})))
 
+        # intern item names for compact prog_items, names first seen during generation, like events, get appended
+        item_name_to_index = {name: index for index, name in enumerate(sorted(dct["item_names"]))}
+        for group_name in sorted(dct["item_name_groups"]):
+            for item_name in sorted(dct["item_name_groups"][group_name]):
+                item_name_to_index.setdefault(item_name, len(item_name_to_index))
+        dct["item_name_to_index"] = item_name_to_index
+        dct["item_name_group_indices"] = {group_name: tuple(sorted(item_name_to_index[name] for name in group_set))
+                                          for group_name, group_set in dct["item_name_groups"].items()}
+
         # move away from get_required_client_version function
         if "game" in dct:
             assert "get_required_client_version" not in dct, f"{name}: required_client_version is an attribute now"
@@ -98,6 +107,13 @@ class AutoLogicRegister(type):
         for item_name, function in dct.items():
             if item_name == "copy_mixin":
                 CollectionState.additional_copy_functions.append(function)
+                if "lazy_copy_mixin" not in dct:
+                    # without a lazy variant, copy-on-write copies fall back to copying everything right away
+                    CollectionState.additional_lazy_copy_functions.append(function)
+            elif item_name == "lazy_copy_mixin":
+                CollectionState.additional_lazy_copy_functions.append(function)
+            elif item_name == "materialize_mixin":
+                CollectionState.additional_materialize_functions.append(function)
             elif item_name == "init_mixin":
                 CollectionState.additional_init_functions.append(function)
             elif not item_name.startswith("__"):
@@ -306,6 +322,23 @@ class World(metaclass=AutoWorldRegister):
     If False, everything is rechecked at every step, which is slower computationally, 
     but may be desirable in complex/dynamic worlds."""
 
+    incremental_reachability: bool = False
+    """If True, CollectionState records which items each reached Region depended on, so collecting an item only
+    retries the Entrances that read it and removing an item only drops the Regions that depended on it, instead of
+    rebuilding reachability from scratch. Requires explicit_indirect_conditions and that the world's logic only depends
+    on state.prog_items, not on LogicMixin attributes."""
+
+    indexed_sweep: bool = False
+    """If True, sweeps only re-test this world's locations whose access rule inputs changed since they were last tested.
+    This needs the access rules to declare what they read, see `Location.get_rule_dependencies`, locations with plain
+    callables as rules are tested on every pass like before."""
+
+    compact_prog_items: bool = False
+    """If True, this world's state.prog_items is a CompactItemCounter, which stores counts in an array indexed by
+    item_name_to_index instead of a Counter. Copying states becomes a buffer copy and item group queries use
+    precomputed indices. All counts stored in prog_items have to be integers. Ignored if incremental_reachability is
+    used."""
+
     multiworld: "MultiWorld"
     """autoset on creation. The MultiWorld object for the currently generating multiworld."""
     player: int
@@ -318,6 +351,11 @@ class World(metaclass=AutoWorldRegister):
 
     item_names: ClassVar[Set[str]]
     """set of all potential item names"""
+    item_name_to_index: ClassVar[Dict[str, int]]
+    """automatically generated small integer index per item name, used by compact prog_items. Item names first counted
+    during generation, such as events, get appended."""
+    item_name_group_indices: ClassVar[Dict[str, Tuple[int, ...]]]
+    """automatically generated item_name_to_index indices of each item name group"""
     location_names: ClassVar[Set[str]]
     """set of all potential location names"""
 
@@ -15,6 +15,10 @@ from typing import Any, Sequence
 
 BIZHAWK_SOCKET_PORT_RANGE_START = 43055
 BIZHAWK_SOCKET_PORT_RANGE_SIZE = 5
+PIPELINED_SCRIPT_VERSION = 2
+"""The first connector script version that accepts pipelined messages with raw binary payloads"""
+WATCH_SCRIPT_VERSION = 3
+"""The first connector script version that pushes changes of watched memory"""
 
 
 class ConnectionStatus(enum.IntEnum):
@@ -46,14 +50,61 @@ class SyncError(Exception):
 class BizHawkContext:
     streams: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None
     connection_status: ConnectionStatus
+    script_version: int | None
+    """The version of the connected script, once `get_script_version` asked for it"""
+    watches: dict[tuple[int, int, str], bytes | None]
+    """The latest known data of every watched `(address, size, domain)`"""
+    watch_event: asyncio.Event
+    """Set when the data of a watched range changed"""
     _lock: asyncio.Lock
     _port: int | None
+    _next_message_id: int
+    _pending: dict[int, asyncio.Future[list[dict[str, Any]]]]
+    _reader_task: asyncio.Task[None] | None
+    _next_watch_id: int
+    _watch_ids: dict[int, tuple[int, int, str]]
+    """The watched ranges the connector script pushes changes of, by their id"""
 
     def __init__(self) -> None:
         self.streams = None
         self.connection_status = ConnectionStatus.NOT_CONNECTED
+        self.script_version = None
+        self.watches = {}
+        self.watch_event = asyncio.Event()
         self._lock = asyncio.Lock()
         self._port = None
+        self._next_message_id = 0
+        self._pending = {}
+        self._reader_task = None
+        self._next_watch_id = 0
+        self._watch_ids = {}
+
+    @property
+    def pipelined(self) -> bool:
+        """Whether requests are sent as pipelined messages, several of which can be awaited at the same time"""
+        return self.script_version is not None and self.script_version >= PIPELINED_SCRIPT_VERSION
+
+    @property
+    def pushes_changes(self) -> bool:
+        """Whether the connector script pushes changes of watched ranges, which otherwise have to be polled"""
+        return self.script_version is not None and self.script_version >= WATCH_SCRIPT_VERSION
+
+    def _close(self, reason: str) -> None:
+        """Closes the connection and fails every request still waiting for a response"""
+        if self.streams is not None:
+            self.streams[1].close()
+            self.streams = None
+        self.connection_status = ConnectionStatus.NOT_CONNECTED
+        self.script_version = None
+        self._watch_ids.clear()  # the ranges stay watched, and are registered again after reconnecting
+        if self._reader_task is not None:
+            if self._reader_task is not asyncio.current_task():
+                self._reader_task.cancel()
+            self._reader_task = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RequestFailedError(reason))
 
     async def _send_message(self, message: str):
         async with self._lock:
@@ -68,9 +119,7 @@ class BizHawkContext:
                 res = await asyncio.wait_for(reader.readline(), timeout=5)
 
                 if res == b"":
-                    writer.close()
-                    self.streams = None
-                    self.connection_status = ConnectionStatus.NOT_CONNECTED
+                    self._close("Connection closed")
                     raise RequestFailedError("Connection closed")
 
                 if self.connection_status == ConnectionStatus.TENTATIVE:
@@ -78,16 +127,79 @@ class BizHawkContext:
 
                 return res.decode("utf-8")
             except asyncio.TimeoutError as exc:
-                writer.close()
-                self.streams = None
-                self.connection_status = ConnectionStatus.NOT_CONNECTED
+                self._close("Connection timed out")
                 raise RequestFailedError("Connection timed out") from exc
             except ConnectionResetError as exc:
-                writer.close()
-                self.streams = None
-                self.connection_status = ConnectionStatus.NOT_CONNECTED
+                self._close("Connection reset")
                 raise RequestFailedError("Connection reset") from exc
 
+    async def _send_pipelined_message(self, requests: list[dict[str, Any]], payload: bytes) -> list[dict[str, Any]]:
+        """Sends a message without waiting for earlier messages to be answered, and returns the responses with their
+        data taken from the binary payload."""
+        if self.streams is None:
+            raise NotConnectedError("You tried to send a request before a connection to BizHawk was made")
+
+        reader, writer = self.streams
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._read_pipelined_messages(reader), name="BizHawkReader")
+
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        response = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = response
+        try:
+            header = json.dumps({"id": message_id, "requests": requests, "size": len(payload)})
+            writer.write(header.encode("utf-8") + b"\n" + payload)
+            await asyncio.wait_for(writer.drain(), timeout=5)
+            return await asyncio.wait_for(response, timeout=5)
+        except asyncio.TimeoutError as exc:
+            self._close("Connection timed out")
+            raise RequestFailedError("Connection timed out") from exc
+        except ConnectionResetError as exc:
+            self._close("Connection reset")
+            raise RequestFailedError("Connection reset") from exc
+        finally:
+            self._pending.pop(message_id, None)
+
+    def _update_watched(self, watch_id: int, data: bytes) -> None:
+        watched = self._watch_ids.get(watch_id, None)
+        if watched is not None and self.watches.get(watched, None) != data:
+            self.watches[watched] = data
+            self.watch_event.set()
+
+    async def _read_pipelined_messages(self, reader: asyncio.StreamReader) -> None:
+        """Hands the responses read from the connector script to the requests waiting for them"""
+        try:
+            while True:
+                header = await reader.readline()
+                if header == b"":
+                    self._close("Connection closed")
+                    return
+
+                message = json.loads(header)
+                payload = await reader.readexactly(message["size"]) if message["size"] else b""
+
+                if self.connection_status == ConnectionStatus.TENTATIVE:
+                    self.connection_status = ConnectionStatus.CONNECTED
+
+                # changes are pushed without an id, and applied here so they stay in order with WATCH responses
+                responses = message["responses"] if "id" in message else message["changes"]
+                offset = 0
+                for item in responses:
+                    if "data_size" in item:
+                        item["value"] = payload[offset:offset + item["data_size"]]
+                        offset += item.pop("data_size")
+                    if item["type"] == "WATCH_RESPONSE":
+                        self._update_watched(item["watch_id"], item["value"])
+
+                response = self._pending.get(message["id"], None) if "id" in message else None
+                if response is not None and not response.done():
+                    response.set_result(responses)
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            self._close("Connection reset")
+        except (ValueError, KeyError):
+            self._close("Received malformed response")
+
 
 async def connect(ctx: BizHawkContext) -> bool:
     """Attempts to establish a connection with a connector script. Returns True if successful."""
@@ -99,6 +211,7 @@ async def connect(ctx: BizHawkContext) -> bool:
         try:
             ctx.streams = await asyncio.open_connection("127.0.0.1", port)
             ctx.connection_status = ConnectionStatus.TENTATIVE
+            ctx.script_version = None
             ctx._port = port
             return True
         except (TimeoutError, ConnectionRefusedError):
@@ -112,21 +225,47 @@ async def connect(ctx: BizHawkContext) -> bool:
 
 def disconnect(ctx: BizHawkContext) -> None:
     """Closes the connection to the connector script."""
-    if ctx.streams is not None:
-        ctx.streams[1].close()
-        ctx.streams = None
-    ctx.connection_status = ConnectionStatus.NOT_CONNECTED
+    ctx._close("Disconnected")
 
 
 async def get_script_version(ctx: BizHawkContext) -> int:
-    return int(await ctx._send_message("VERSION"))
+    """Gets the version of the connector script. Scripts from `PIPELINED_SCRIPT_VERSION` on are sent pipelined
+    messages afterwards."""
+    ctx.script_version = int(await ctx._send_message("VERSION"))
+    return ctx.script_version
 
 
 async def send_requests(ctx: BizHawkContext, req_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Sends a list of requests to the BizHawk connector and returns their responses.
 
+    A request may hold its data as `bytes`, and the `value` of a `READ_RESPONSE` is returned as `bytes`. Pipelined
+    connections send them as raw binary payload, and other connections as base64 strings. Several calls may await
+    their responses at the same time, but they are only sent without waiting for each other on pipelined connections.
+
     It's likely you want to use the wrapper functions instead of this."""
-    responses = json.loads(await ctx._send_message(json.dumps(req_list)))
+    if ctx.pipelined:
+        requests: list[dict[str, Any]] = []
+        data: list[bytes] = []
+        for req in req_list:
+            req = dict(req)
+            for key, value in req.items():
+                if isinstance(value, bytes):
+                    del req[key]
+                    req["data_size"] = len(value)
+                    data.append(value)
+                    break
+            requests.append(req)
+
+        responses = await ctx._send_pipelined_message(requests, b"".join(data))
+    else:
+        responses = json.loads(await ctx._send_message(json.dumps([{
+            key: base64.b64encode(value).decode("ascii") if isinstance(value, bytes) else value
+            for key, value in req.items()
+        } for req in req_list])))
+        for response in responses:
+            if response["type"] == "READ_RESPONSE":
+                response["value"] = base64.b64decode(response["value"])
+
     errors: list[ConnectorError] = []
 
     for response in responses:
@@ -253,7 +392,7 @@ async def guarded_read(ctx: BizHawkContext, read_list: Sequence[tuple[int, int,
     res = await send_requests(ctx, [{
         "type": "GUARD",
         "address": address,
-        "expected_data": base64.b64encode(bytes(expected_data)).decode("ascii"),
+        "expected_data": bytes(expected_data),
         "domain": domain
     } for address, expected_data, domain in guard_list] + [{
         "type": "READ",
@@ -271,11 +410,81 @@ async def guarded_read(ctx: BizHawkContext, read_list: Sequence[tuple[int, int,
             if item["type"] != "READ_RESPONSE":
                 raise SyncError(f"Expected response of type READ_RESPONSE or GUARD_RESPONSE but got {item['type']}")
 
-            ret.append(base64.b64decode(item["value"]))
+            ret.append(item["value"])
 
     return ret
 
 
+async def watch(ctx: BizHawkContext, watch_list: Sequence[tuple[int, int, str]]) -> list[bytes]:
+    """Watches the data at 1 or more addresses, and returns their latest known data.
+
+    Items in `watch_list` should be organized `(address, size, domain)` like in `read`.
+
+    Changes of watched data set `ctx.watch_event`. Connector scripts from `WATCH_SCRIPT_VERSION` on push changes at
+    the end of every frame, so calling this again for ranges that are already watched needs no round trip. Watched
+    ranges of older scripts are read again by `update_watches` instead. Ranges stay watched across reconnects until
+    they are passed to `unwatch`."""
+    for watched in watch_list:
+        ctx.watches.setdefault(tuple(watched), None)
+    registered = set(ctx._watch_ids.values())
+    if any(ctx.watches[tuple(watched)] is None or (ctx.pushes_changes and tuple(watched) not in registered)
+           for watched in watch_list):
+        await update_watches(ctx)
+    return [ctx.watches[tuple(watched)] for watched in watch_list]
+
+
+async def unwatch(ctx: BizHawkContext, watch_list: Sequence[tuple[int, int, str]]) -> None:
+    """Stops watching the data at 1 or more addresses."""
+    unwatched = {tuple(watched) for watched in watch_list}
+    watch_ids = [watch_id for watch_id, watched in ctx._watch_ids.items() if watched in unwatched]
+    for watch_id in watch_ids:
+        del ctx._watch_ids[watch_id]
+    for watched in unwatched:
+        ctx.watches.pop(watched, None)
+    if watch_ids and ctx.pushes_changes:
+        await send_requests(ctx, [{"type": "UNWATCH", "watch_id": watch_id} for watch_id in watch_ids])
+
+
+async def update_watches(ctx: BizHawkContext) -> None:
+    """Registers watched ranges the connector script doesn't push changes of yet, or reads every watched range if the
+    script can't push changes. Sets `ctx.watch_event` if watched data changed."""
+    if ctx.pushes_changes:
+        registered = set(ctx._watch_ids.values())
+        watch_list = [watched for watched in ctx.watches if watched not in registered]
+        if not watch_list:
+            return
+
+        # registered before sending, so the data of the responses and of pushed changes is applied in order
+        watch_ids = range(ctx._next_watch_id, ctx._next_watch_id + len(watch_list))
+        ctx._next_watch_id += len(watch_list)
+        ctx._watch_ids.update(zip(watch_ids, watch_list))
+        try:
+            res = await send_requests(ctx, [{
+                "type": "WATCH",
+                "watch_id": watch_id,
+                "address": address,
+                "size": size,
+                "domain": domain
+            } for watch_id, (address, size, domain) in zip(watch_ids, watch_list)])
+        except Exception:  # errors of the connector script are raised as ExceptionGroup
+            for watch_id in watch_ids:
+                ctx._watch_ids.pop(watch_id, None)
+            raise
+
+        for item in res:
+            if item["type"] != "WATCH_RESPONSE":
+                raise SyncError(f"Expected response of type WATCH_RESPONSE but got {item['type']}")
+    else:
+        watch_list = list(ctx.watches)
+        if not watch_list:
+            return
+
+        for watched, data in zip(watch_list, await read(ctx, watch_list)):
+            if watched in ctx.watches and ctx.watches[watched] != data:
+                ctx.watches[watched] = data
+                ctx.watch_event.set()
+
+
 async def read(ctx: BizHawkContext, read_list: Sequence[tuple[int, int, str]]) -> list[bytes]:
     """Reads data at 1 or more addresses.
 
@@ -306,12 +515,12 @@ async def guarded_write(ctx: BizHawkContext, write_list: Sequence[tuple[int, Seq
     res = await send_requests(ctx, [{
         "type": "GUARD",
         "address": address,
-        "expected_data": base64.b64encode(bytes(expected_data)).decode("ascii"),
+        "expected_data": bytes(expected_data),
         "domain": domain
     } for address, expected_data, domain in guard_list] + [{
         "type": "WRITE",
         "address": address,
-        "value": base64.b64encode(bytes(value)).decode("ascii"),
+        "value": bytes(value),
         "domain": domain
     } for address, value, domain in write_list])
 
@@ -94,7 +94,11 @@ class BizHawkClient(abc.ABC, metaclass=AutoBizHawkClientRegister):
     @abc.abstractmethod
     async def game_watcher(self, ctx: "BizHawkClientContext") -> None:
         """Runs on a loop with the approximate interval `ctx.watcher_timeout`. The currently loaded ROM is guaranteed
-        to have passed your validator when this function is called, and the emulator is very likely to be connected."""
+        to have passed your validator when this function is called, and the emulator is very likely to be connected.
+
+        If you watch the memory your checks depend on with `_bizhawk.watch`, and the connector script pushes changes,
+        it instead runs whenever watched memory changed or an update from the server arrived, and at least every
+        `ctx.watcher_idle_timeout`."""
         ...
 
     def on_package(self, ctx: "BizHawkClientContext", cmd: str, args: dict) -> None:
@@ -15,11 +15,13 @@ import Patch
 import Utils
 
 from . import BizHawkContext, ConnectionStatus, NotConnectedError, RequestFailedError, connect, disconnect, get_hash, \
-    get_script_version, get_system, ping, display_message
+    get_script_version, get_system, ping, display_message, unwatch, update_watches
 from .client import BizHawkClient, AutoBizHawkClientRegister
 
 
-EXPECTED_SCRIPT_VERSION = 1
+EXPECTED_SCRIPT_VERSION = 3
+MINIMUM_SCRIPT_VERSION = 1
+"""Older scripts are still supported, but requests to them are not pipelined"""
 
 
 class AuthStatus(enum.IntEnum):
@@ -131,6 +133,10 @@ class BizHawkClientContext(CommonContext):
     watcher_timeout: float
     """The maximum amount of time the game watcher loop will wait for an update from the server before executing"""
 
+    watcher_idle_timeout: float
+    """The maximum amount of time the game watcher loop will wait for an update from the server or a change of watched
+    memory before executing, while the connector script pushes changes of watched memory"""
+
     def __init__(self, server_address: str | None, password: str | None):
         super().__init__(server_address, password)
         self.text_passthrough_categories = set()
@@ -139,6 +145,7 @@ class BizHawkClientContext(CommonContext):
         self.client_handler = None
         self.bizhawk_ctx = BizHawkContext()
         self.watcher_timeout = 0.5
+        self.watcher_idle_timeout = 2
 
     def _categorize_text(self, args: dict) -> TextCategory:
         if "type" not in args or args["type"] in {"Hint", "Join", "Part", "TagsChanged", "Goal", "Release", "Collect",
@@ -213,12 +220,18 @@ async def _game_watcher(ctx: BizHawkClientContext):
     showed_no_handler_message = False
 
     while not ctx.exit_event.is_set():
-        try:
-            await asyncio.wait_for(ctx.watcher_event.wait(), ctx.watcher_timeout)
-        except asyncio.TimeoutError:
-            pass
+        wait_tasks = [asyncio.create_task(ctx.watcher_event.wait())]
+        timeout = ctx.watcher_timeout
+        if ctx.bizhawk_ctx.watches and ctx.bizhawk_ctx.pushes_changes:
+            # the connector script tells us when watched memory changes, so there's no need to poll
+            wait_tasks.append(asyncio.create_task(ctx.bizhawk_ctx.watch_event.wait()))
+            timeout = ctx.watcher_idle_timeout
+        _, pending = await asyncio.wait(wait_tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
 
         ctx.watcher_event.clear()
+        ctx.bizhawk_ctx.watch_event.clear()
 
         try:
             if ctx.bizhawk_ctx.connection_status == ConnectionStatus.NOT_CONNECTED:
@@ -246,7 +259,7 @@ async def _game_watcher(ctx: BizHawkClientContext):
 
                 script_version = await get_script_version(ctx.bizhawk_ctx)
 
-                if script_version != EXPECTED_SCRIPT_VERSION:
+                if not MINIMUM_SCRIPT_VERSION <= script_version <= EXPECTED_SCRIPT_VERSION:
                     logger.info(f"Connector script is incompatible. Expected version {EXPECTED_SCRIPT_VERSION} but "
                                 f"got {script_version}. Disconnecting.")
                     disconnect(ctx.bizhawk_ctx)
@@ -268,6 +281,7 @@ async def _game_watcher(ctx: BizHawkClientContext):
                 ctx.auth = None
                 ctx.username = None
                 ctx.client_handler = None
+                await unwatch(ctx.bizhawk_ctx, list(ctx.bizhawk_ctx.watches))
                 ctx.finished_game = False
                 await ctx.disconnect(False)
             ctx.rom_hash = rom_hash
@@ -286,6 +300,8 @@ async def _game_watcher(ctx: BizHawkClientContext):
                     showed_no_handler_message = False
                     logger.info(f"Running handler for {ctx.client_handler.game}")
 
+            await update_watches(ctx.bizhawk_ctx)
+
         except RequestFailedError as exc:
             logger.info(f"Lost connection to BizHawk: {exc.args[0]}")
             continue
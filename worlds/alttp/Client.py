@@ -332,7 +332,7 @@ def should_collect(ctx, location_id: int) -> bool:
 
 
 async def track_locations(ctx, roomid, roomdata) -> bool:
-    from SNIClient import snes_read, snes_buffered_write, snes_flush_writes
+    from SNIClient import snes_read, snes_read_ranges, snes_buffered_write, snes_flush_writes
     location_id: int
     new_locations = []
 
@@ -345,8 +345,47 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
             f'({len(ctx.checked_locations) + 1 if ctx.checked_locations else len(ctx.locations_checked)}/' +
             f'{len(ctx.missing_locations) + len(ctx.checked_locations)})')
 
+    uw_begin = 0x129
+    ow_end = uw_end = 0
+    uw_unchecked = {}
+    uw_checked = {}
+    for location, (uw_roomid, mask) in location_table_uw.items():
+        location_id = Regions.lookup_name_to_id[location]
+        if location_id not in ctx.locations_checked:
+            uw_unchecked[location_id] = (uw_roomid, mask)
+            uw_begin = min(uw_begin, uw_roomid)
+            uw_end = max(uw_end, uw_roomid + 1)
+        if should_collect(ctx, location_id):
+            uw_begin = min(uw_begin, uw_roomid)
+            uw_end = max(uw_end, uw_roomid + 1)
+            uw_checked[location_id] = (uw_roomid, mask)
+
+    ow_begin = 0x82
+    ow_unchecked = {}
+    ow_checked = {}
+    for location_id, screenid in location_table_ow_id.items():
+        if location_id not in ctx.locations_checked:
+            ow_unchecked[location_id] = screenid
+            ow_begin = min(ow_begin, screenid)
+            ow_end = max(ow_end, screenid + 1)
+            if should_collect(ctx, location_id):
+                ow_checked[location_id] = screenid
+
+    # read all the save data that is needed in one request
+    ranges = {"shop": (SHOP_ADDR, SHOP_LEN)}
+    if uw_begin < uw_end:
+        ranges["uw"] = (SAVEDATA_START + (uw_begin * 2), (uw_end - uw_begin) * 2)
+    if ow_begin < ow_end:
+        ranges["ow"] = (SAVEDATA_START + 0x280 + ow_begin, ow_end - ow_begin)
+    if not ctx.locations_checked.issuperset(location_table_npc_id):
+        ranges["npc"] = (SAVEDATA_START + 0x410, 2)
+    if not ctx.locations_checked.issuperset(location_table_misc_id):
+        ranges["misc"] = (SAVEDATA_START + 0x3c6, 4)
+    data = await snes_read_ranges(ctx, list(ranges.values()))
+    save_data = dict(zip(ranges, data)) if data is not None else {}
+
     try:
-        shop_data = await snes_read(ctx, SHOP_ADDR, SHOP_LEN)
+        shop_data = save_data.get("shop")
         shop_data_changed = False
         shop_data = list(shop_data)
         for cnt, b in enumerate(shop_data):
@@ -370,23 +409,8 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
         except Exception as e:
             snes_logger.exception(f"Exception: {e}")
 
-    uw_begin = 0x129
-    ow_end = uw_end = 0
-    uw_unchecked = {}
-    uw_checked = {}
-    for location, (roomid, mask) in location_table_uw.items():
-        location_id = Regions.lookup_name_to_id[location]
-        if location_id not in ctx.locations_checked:
-            uw_unchecked[location_id] = (roomid, mask)
-            uw_begin = min(uw_begin, roomid)
-            uw_end = max(uw_end, roomid + 1)
-        if should_collect(ctx, location_id):
-            uw_begin = min(uw_begin, roomid)
-            uw_end = max(uw_end, roomid + 1)
-            uw_checked[location_id] = (roomid, mask)
-
     if uw_begin < uw_end:
-        uw_data = await snes_read(ctx, SAVEDATA_START + (uw_begin * 2), (uw_end - uw_begin) * 2)
+        uw_data = save_data.get("uw")
         if uw_data is not None:
             for location_id, (roomid, mask) in uw_unchecked.items():
                 offset = (roomid - uw_begin) * 2
@@ -403,19 +427,8 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
                     uw_data[offset + 1] = roomdata >> 8
                 snes_buffered_write(ctx, SAVEDATA_START + (uw_begin * 2), bytes(uw_data))
 
-    ow_begin = 0x82
-    ow_unchecked = {}
-    ow_checked = {}
-    for location_id, screenid in location_table_ow_id.items():
-        if location_id not in ctx.locations_checked:
-            ow_unchecked[location_id] = screenid
-            ow_begin = min(ow_begin, screenid)
-            ow_end = max(ow_end, screenid + 1)
-            if should_collect(ctx, location_id):
-                ow_checked[location_id] = screenid
-
     if ow_begin < ow_end:
-        ow_data = await snes_read(ctx, SAVEDATA_START + 0x280 + ow_begin, ow_end - ow_begin)
+        ow_data = save_data.get("ow")
         if ow_data is not None:
             for location_id, screenid in ow_unchecked.items():
                 if ow_data[screenid - ow_begin] & 0x40 != 0:
@@ -427,7 +440,7 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
                 snes_buffered_write(ctx, SAVEDATA_START + 0x280 + ow_begin, bytes(ow_data))
 
     if not ctx.locations_checked.issuperset(location_table_npc_id):
-        npc_data = await snes_read(ctx, SAVEDATA_START + 0x410, 2)
+        npc_data = save_data.get("npc")
         if npc_data is not None:
             npc_value_changed = False
             npc_value = npc_data[0] | (npc_data[1] << 8)
@@ -442,7 +455,7 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
                 snes_buffered_write(ctx, SAVEDATA_START + 0x410, npc_data)
 
     if not ctx.locations_checked.issuperset(location_table_misc_id):
-        misc_data = await snes_read(ctx, SAVEDATA_START + 0x3c6, 4)
+        misc_data = save_data.get("misc")
         if misc_data is not None:
             misc_data = list(misc_data)
             misc_data_changed = False
@@ -474,9 +487,9 @@ class ALTTPSNIClient(SNIClient):
     patch_suffix = [".aplttp", ".apz3"]
 
     async def deathlink_kill_player(self, ctx):
-        from SNIClient import DeathState, snes_read, snes_buffered_write, snes_flush_writes
-        invincible = await snes_read(ctx, WRAM_START + 0x037B, 1)
-        last_health = await snes_read(ctx, WRAM_START + 0xF36D, 1)
+        from SNIClient import DeathState, snes_read, snes_read_ranges, snes_buffered_write, snes_flush_writes
+        invincible, last_health = await snes_read_ranges(ctx, [(WRAM_START + 0x037B, 1),
+                                                               (WRAM_START + 0xF36D, 1)]) or (None, None)
         await asyncio.sleep(0.25)
         health = await snes_read(ctx, WRAM_START + 0xF36D, 1)
         if not invincible or not last_health or not health:
@@ -517,15 +530,18 @@ class ALTTPSNIClient(SNIClient):
         return True
 
     async def game_watcher(self, ctx):
-        from SNIClient import snes_read, snes_buffered_write, snes_flush_writes
-        gamemode = await snes_read(ctx, WRAM_START + 0x10, 1)
+        from SNIClient import snes_read_ranges, snes_buffered_write, snes_flush_writes
+        gamemode, gameend, game_timer, data = await snes_read_ranges(ctx, [
+            (WRAM_START + 0x10, 1),
+            (SAVEDATA_START + 0x443, 1),
+            (SAVEDATA_START + 0x42E, 4),
+            (RECV_PROGRESS_ADDR, 8),
+        ]) or (None, None, None, None)
         if "DeathLink" in ctx.tags and gamemode and ctx.last_death_link + 1 < time.time():
             currently_dead = gamemode[0] in DEATH_MODES
             await ctx.handle_deathlink_state(currently_dead,
                                              ctx.player_names[ctx.slot] + " ran out of hearts." if ctx.slot else "")
 
-        gameend = await snes_read(ctx, SAVEDATA_START + 0x443, 1)
-        game_timer = await snes_read(ctx, SAVEDATA_START + 0x42E, 4)
         if gamemode is None or gameend is None or game_timer is None or \
                 (gamemode[0] not in INGAME_MODES and gamemode[0] not in ENDGAME_MODES):
             return
@@ -538,10 +554,6 @@ class ALTTPSNIClient(SNIClient):
         if gamemode in ENDGAME_MODES:  # triforce room and credits
             return
 
-        data = await snes_read(ctx, RECV_PROGRESS_ADDR, 8)
-        if data is None:
-            return
-
         recv_index = data[0] | (data[1] << 8)
         recv_item = data[2]
         roomid = data[4] | (data[5] << 8)
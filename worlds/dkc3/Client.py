@@ -51,16 +51,18 @@ class DKC3SNIClient(SNIClient):
 
 
     async def game_watcher(self, ctx):
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read, snes_read_ranges
         # DKC3_TODO: Handle Deathlink
-        save_file_name = await snes_read(ctx, DKC3_FILE_NAME_ADDR, 0x5)
+        save_file_name, location_ram_data = await snes_read_ranges(ctx, [
+            (DKC3_FILE_NAME_ADDR, 0x5),
+            (WRAM_START + 0x5FE, 0x81),
+        ]) or (None, None)
         if save_file_name is None or save_file_name[0] == 0x00 or save_file_name == bytes([0x55] * 0x05):
             # We haven't loaded a save file
             return
 
         new_checks = []
         from .Rom import location_rom_data, item_rom_data, boss_location_ids, level_unlock_map
-        location_ram_data = await snes_read(ctx, WRAM_START + 0x5FE, 0x81)
         for loc_id, loc_data in location_rom_data.items():
             if loc_id not in ctx.locations_checked:
                 data = location_ram_data[loc_data[0] - 0x5FE]
@@ -71,13 +73,16 @@ class DKC3SNIClient(SNIClient):
                     # DKC3_TODO: Handle non-included checks
                     new_checks.append(loc_id)
 
-        verify_save_file_name = await snes_read(ctx, DKC3_FILE_NAME_ADDR, 0x5)
+        verify_save_file_name, rom, recv_count = await snes_read_ranges(ctx, [
+            (DKC3_FILE_NAME_ADDR, 0x5),
+            (DKC3_ROMHASH_START, ROMHASH_SIZE),
+            (DKC3_RECV_PROGRESS_ADDR, 1),
+        ]) or (None, None, None)
         if verify_save_file_name is None or verify_save_file_name[0] == 0x00 or verify_save_file_name == bytes([0x55] * 0x05) or verify_save_file_name != save_file_name:
             # We have somehow exited the save file (or worse)
             ctx.rom = None
             return
 
-        rom = await snes_read(ctx, DKC3_ROMHASH_START, ROMHASH_SIZE)
         if rom != ctx.rom:
             ctx.rom = None
             # We have somehow loaded a different ROM
@@ -91,7 +96,6 @@ class DKC3SNIClient(SNIClient):
             await ctx.send_msgs([{"cmd": 'LocationChecks', "locations": [new_check_id]}])
 
         # DKC3_TODO: Make this actually visually display new things received (ASM Hook required)
-        recv_count = await snes_read(ctx, DKC3_RECV_PROGRESS_ADDR, 1)
         recv_index = recv_count[0]
 
         if recv_index < len(ctx.items_received):
@@ -110,8 +114,9 @@ class DKC3SNIClient(SNIClient):
                     snes_buffered_write(ctx, WRAM_START + address, bytes([new_item_count]))
 
                 # Handle Coin Displays
-                current_level = await snes_read(ctx, WRAM_START + 0x5E3, 0x5)
-                overworld_locked = ((await snes_read(ctx, WRAM_START + 0x5FC, 0x1))[0] == 0x01)
+                current_level, overworld_locked = await snes_read_ranges(ctx, [(WRAM_START + 0x5E3, 0x5),
+                                                                               (WRAM_START + 0x5FC, 0x1)])
+                overworld_locked = (overworld_locked[0] == 0x01)
                 if item.item == 0xDC3002 and not overworld_locked and (current_level[0] == 0x0A and current_level[2] == 0x00 and current_level[4] == 0x03):
                     # Bazaar and Barter
                     item_count = await snes_read(ctx, WRAM_START + 0xB02, 0x1)
@@ -180,8 +185,8 @@ class DKC3SNIClient(SNIClient):
             await snes_flush_writes(ctx)
 
         # Handle Collected Locations
-        levels_to_tiles = await snes_read(ctx, ROM_START + 0x3FF800, 0x60)
-        tiles_to_levels = await snes_read(ctx, ROM_START + 0x3FF860, 0x60)
+        levels_to_tiles, tiles_to_levels = await snes_read_ranges(ctx, [(ROM_START + 0x3FF800, 0x60),
+                                                                        (ROM_START + 0x3FF860, 0x60)])
         for loc_id in ctx.checked_locations:
             if loc_id not in ctx.locations_checked and loc_id not in boss_location_ids:
                 loc_data = location_rom_data[loc_id]
@@ -212,17 +217,18 @@ class DKC3SNIClient(SNIClient):
                 ctx.locations_checked.add(loc_id)
 
         # Calculate Boomer Cost Text
-        boomer_cost_text = await snes_read(ctx, WRAM_START + 0xAAFD, 2)
+        boomer_cost_text, boomer_final_cost_text, boomer_cost = await snes_read_ranges(ctx, [
+            (WRAM_START + 0xAAFD, 2),
+            (WRAM_START + 0xAB9B, 2),
+            (ROM_START + 0x349857, 1),
+        ])
         if boomer_cost_text[0] == 0x31 and boomer_cost_text[1] == 0x35:
-            boomer_cost = await snes_read(ctx, ROM_START + 0x349857, 1)
             boomer_cost_tens = int(boomer_cost[0]) // 10
             boomer_cost_ones = int(boomer_cost[0]) % 10
             snes_buffered_write(ctx, WRAM_START + 0xAAFD, bytes([0x30 + boomer_cost_tens, 0x30 + boomer_cost_ones]))
             await snes_flush_writes(ctx)
 
-        boomer_final_cost_text = await snes_read(ctx, WRAM_START + 0xAB9B, 2)
         if boomer_final_cost_text[0] == 0x32 and boomer_final_cost_text[1] == 0x35:
-            boomer_cost = await snes_read(ctx, ROM_START + 0x349857, 1)
             boomer_cost_tens = boomer_cost[0] // 10
             boomer_cost_ones = boomer_cost[0] % 10
             snes_buffered_write(ctx, WRAM_START + 0xAB9B, bytes([0x30 + boomer_cost_tens, 0x30 + boomer_cost_ones]))
@@ -1,3 +1,4 @@
+import abc
 import collections
 import logging
 import typing
@@ -96,15 +97,296 @@ def exclusion_rules(multiworld: MultiWorld, player: int, exclude_locations: typi
                 logging.warning(f"Unable to exclude location {loc_name} in player {player}'s world.")
 
 
-def set_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"], rule: CollectionRule):
+ItemDependencies = typing.Optional[typing.FrozenSet[typing.Tuple[int, str]]]
+
+
+class Rule(abc.ABC):
+    """
+    Declarative access rule, usable anywhere a `CollectionRule` is. Unlike a lambda, a Rule can be inspected and is
+    compiled into a flat evaluation program on first use, merging item checks of And/Or into single
+    `has_all_counts`/`has_any_count` calls.
+    `item_dependencies` holds every (player, item name) the rule reads, or None if it depends on anything else, such as
+    region reachability or an opaque callable. The sweep uses this to evaluate a Rule shared by several locations only
+    once per pass, and to skip it until one of its item counts changed.
+    Rules are combined with `&` and `|`; plain callables become `Opaque` leaves.
+    """
+    __slots__ = ("_args", "_compiled", "item_dependencies")
+    _args: typing.Tuple[typing.Any, ...]
+    _compiled: typing.Optional[CollectionRule]
+    item_dependencies: ItemDependencies
+
+    def __init__(self, args: typing.Tuple[typing.Any, ...], item_dependencies: ItemDependencies) -> None:
+        self._args = args
+        self._compiled = None
+        self.item_dependencies = item_dependencies
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = self.compile()
+        return compiled(state)
+
+    @abc.abstractmethod
+    def compile(self) -> CollectionRule:
+        """Returns a callable that evaluates this rule for a CollectionState."""
+
+    def get_rule_dependencies(self) -> typing.Optional["BaseClasses.RuleDependencies"]:
+        """Returns the (player, item name)s and (player, region name)s this rule reads, None if that is unknown."""
+        if self.item_dependencies is None:
+            return None
+        return self.item_dependencies, frozenset()
+
+    def __and__(self, other: typing.Union["Rule", CollectionRule]) -> "And":
+        return And(self, other)
+
+    def __rand__(self, other: CollectionRule) -> "And":
+        return And(other, self)
+
+    def __or__(self, other: typing.Union["Rule", CollectionRule]) -> "Or":
+        return Or(self, other)
+
+    def __ror__(self, other: CollectionRule) -> "Or":
+        return Or(other, self)
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self._args == other._args
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._args))
+
+    def __reduce__(self) -> typing.Tuple[type, typing.Tuple[typing.Any, ...]]:
+        return type(self), self._args
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self._args!r}"
+
+
+class Has(Rule):
+    """Requires `count` of an item."""
+    __slots__ = ()
+
+    def __init__(self, item: str, player: int, count: int = 1) -> None:
+        super().__init__((item, player, count), frozenset(((player, item),)))
+
+    def compile(self) -> CollectionRule:
+        item, player, count = self._args
+        return lambda state: state.prog_items[player][item] >= count
+
+
+class HasAll(Rule):
+    """Requires at least one of each of the items."""
+    __slots__ = ()
+
+    def __init__(self, items: typing.Iterable[str], player: int) -> None:
+        items = tuple(items)
+        super().__init__((items, player), frozenset((player, item) for item in items))
+
+    def compile(self) -> CollectionRule:
+        items, player = self._args
+        return lambda state: state.has_all(items, player)
+
+
+class HasAny(Rule):
+    """Requires at least one of any of the items."""
+    __slots__ = ()
+
+    def __init__(self, items: typing.Iterable[str], player: int) -> None:
+        items = tuple(items)
+        super().__init__((items, player), frozenset((player, item) for item in items))
+
+    def compile(self) -> CollectionRule:
+        items, player = self._args
+        return lambda state: state.has_any(items, player)
+
+
+class Count(Rule):
+    """Requires `count` items in total from the items, counting duplicates."""
+    __slots__ = ()
+
+    def __init__(self, items: typing.Iterable[str], player: int, count: int) -> None:
+        items = tuple(items)
+        super().__init__((items, player, count), frozenset((player, item) for item in items))
+
+    def compile(self) -> CollectionRule:
+        items, player, count = self._args
+        return lambda state: state.has_from_list(items, player, count)
+
+
+class CanReachRegion(Rule):
+    """Requires the region to be reachable."""
+    __slots__ = ()
+
+    def __init__(self, region: str, player: int) -> None:
+        super().__init__((region, player), None)
+
+    def compile(self) -> CollectionRule:
+        region, player = self._args
+        return lambda state: state.can_reach_region(region, player)
+
+    def get_rule_dependencies(self) -> typing.Optional["BaseClasses.RuleDependencies"]:
+        region, player = self._args
+        return frozenset(), frozenset(((player, region),))
+
+
+class Opaque(Rule):
+    """Wraps a callable that can not be inspected, so rules can be migrated gradually."""
+    __slots__ = ()
+
+    def __init__(self, rule: CollectionRule) -> None:
+        super().__init__((rule,), None)
+
+    def compile(self) -> CollectionRule:
+        return self._args[0]
+
+    def get_rule_dependencies(self) -> typing.Optional["BaseClasses.RuleDependencies"]:
+        # the wrapped callable may be introspectable on its own, such as another world's rule object
+        get_rule_dependencies = getattr(self._args[0], "get_rule_dependencies", None)
+        return get_rule_dependencies() if get_rule_dependencies else None
+
+
+def _as_rule(rule: typing.Union[Rule, CollectionRule]) -> Rule:
+    return rule if isinstance(rule, Rule) else Opaque(rule)
+
+
+def _combine_dependencies(rules: typing.Iterable[Rule]) -> ItemDependencies:
+    dependencies: typing.Set[typing.Tuple[int, str]] = set()
+    for rule in rules:
+        if rule.item_dependencies is None:
+            return None
+        dependencies |= rule.item_dependencies
+    return frozenset(dependencies)
+
+
+def _combine_rule_dependencies(rules: typing.Iterable[Rule]) -> typing.Optional["BaseClasses.RuleDependencies"]:
+    items: typing.Set[typing.Tuple[int, str]] = set()
+    regions: typing.Set[typing.Tuple[int, str]] = set()
+    for rule in rules:
+        dependencies = rule.get_rule_dependencies()
+        if dependencies is None:
+            return None
+        items |= dependencies[0]
+        regions |= dependencies[1]
+    return frozenset(items), frozenset(regions)
+
+
+def _compile_all(parts: typing.Sequence[CollectionRule]) -> CollectionRule:
+    if len(parts) == 1:
+        return parts[0]
+
+    def all_of(state: "BaseClasses.CollectionState") -> bool:
+        for part in parts:
+            if not part(state):
+                return False
+        return True
+    return all_of
+
+
+def _compile_any(parts: typing.Sequence[CollectionRule]) -> CollectionRule:
+    if len(parts) == 1:
+        return parts[0]
+
+    def any_of(state: "BaseClasses.CollectionState") -> bool:
+        for part in parts:
+            if part(state):
+                return True
+        return False
+    return any_of
+
+
+class And(Rule):
+    """Requires all of the rules. Nested Ands are flattened."""
+    __slots__ = ()
+
+    def __init__(self, *rules: typing.Union[Rule, CollectionRule]) -> None:
+        flattened: typing.List[Rule] = []
+        for rule in map(_as_rule, rules):
+            if type(rule) is And:
+                flattened.extend(rule._args)
+            else:
+                flattened.append(rule)
+        super().__init__(tuple(flattened), _combine_dependencies(flattened))
+
+    def get_rule_dependencies(self) -> typing.Optional["BaseClasses.RuleDependencies"]:
+        return _combine_rule_dependencies(self._args)
+
+    def compile(self) -> CollectionRule:
+        # item checks are merged into one has_all_counts per player and done first, as they are the cheapest
+        item_counts: typing.Dict[int, typing.Dict[str, int]] = {}
+        others: typing.List[CollectionRule] = []
+        for rule in self._args:
+            if type(rule) is Has:
+                item, player, count = rule._args
+                counts = item_counts.setdefault(player, {})
+                counts[item] = max(counts.get(item, 0), count)
+            elif type(rule) is HasAll:
+                items, player = rule._args
+                counts = item_counts.setdefault(player, {})
+                for item in items:
+                    counts.setdefault(item, 1)
+            else:
+                others.append(rule.compile())
+        parts: typing.List[CollectionRule] = [
+            lambda state, counts=counts, player=player: state.has_all_counts(counts, player)
+            for player, counts in item_counts.items()
+        ]
+        parts += others
+        return _compile_all(parts) if parts else lambda state: True
+
+
+class Or(Rule):
+    """Requires any of the rules. Nested Ors are flattened."""
+    __slots__ = ()
+
+    def __init__(self, *rules: typing.Union[Rule, CollectionRule]) -> None:
+        flattened: typing.List[Rule] = []
+        for rule in map(_as_rule, rules):
+            if type(rule) is Or:
+                flattened.extend(rule._args)
+            else:
+                flattened.append(rule)
+        super().__init__(tuple(flattened), _combine_dependencies(flattened))
+
+    def get_rule_dependencies(self) -> typing.Optional["BaseClasses.RuleDependencies"]:
+        return _combine_rule_dependencies(self._args)
+
+    def compile(self) -> CollectionRule:
+        # item checks are merged into one has_any_count per player and done first, as they are the cheapest
+        item_counts: typing.Dict[int, typing.Dict[str, int]] = {}
+        others: typing.List[CollectionRule] = []
+        for rule in self._args:
+            if type(rule) is Has:
+                item, player, count = rule._args
+                counts = item_counts.setdefault(player, {})
+                counts[item] = min(counts.get(item, count), count)
+            elif type(rule) is HasAny:
+                items, player = rule._args
+                counts = item_counts.setdefault(player, {})
+                for item in items:
+                    counts[item] = 1
+            else:
+                others.append(rule.compile())
+        parts: typing.List[CollectionRule] = [
+            lambda state, counts=counts, player=player: state.has_any_count(counts, player)
+            for player, counts in item_counts.items()
+        ]
+        parts += others
+        return _compile_any(parts) if parts else lambda state: False
+
+
+def set_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"],
+             rule: typing.Union[Rule, CollectionRule]):
     spot.access_rule = rule
 
 
-def add_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"], rule: CollectionRule, combine="and"):
+def add_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"],
+             rule: typing.Union[Rule, CollectionRule], combine="and"):
     old_rule = spot.access_rule
     # empty rule, replace instead of add
     if old_rule is Location.access_rule or old_rule is Entrance.access_rule:
         spot.access_rule = rule if combine == "and" else old_rule
+    elif isinstance(rule, Rule) or isinstance(old_rule, Rule):
+        # keep the result inspectable, lambdas become opaque leaves
+        spot.access_rule = And(rule, old_rule) if combine == "and" else Or(rule, old_rule)
     else:
         if combine == "and":
             spot.access_rule = lambda state: rule(state) and old_rule(state)
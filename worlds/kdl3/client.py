@@ -261,14 +261,28 @@ class KDL3SNIClient(SNIClient):
 
     async def game_watcher(self, ctx: "SNIContext") -> None:
         try:
-            from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
-            rom = await snes_read(ctx, KDL3_ROMNAME, 0x15)
+            from SNIClient import snes_buffered_write, snes_flush_writes, snes_read, snes_read_ranges
+            (rom, halken, ninten, is_demo, current_save, goal, current_bgm, game_state, current_hp, current_world,
+             current_level, recv_count, gifting_flag, gift) = await snes_read_ranges(ctx, [
+                (KDL3_ROMNAME, 0x15),
+                (KDL3_HALKEN, 6),
+                (KDL3_NINTEN, 6),
+                (KDL3_IS_DEMO, 1),
+                (KDL3_GAME_SAVE, 1),
+                (KDL3_GOAL_ADDR, 1),
+                (KDL3_CURRENT_BGM, 1),
+                (KDL3_GAME_STATE, 1),
+                (KDL3_KIRBY_HP, 1),
+                (KDL3_CURRENT_WORLD, 2),
+                (KDL3_CURRENT_LEVEL, 2),
+                (KDL3_RECV_COUNT, 2),
+                (KDL3_GIFTING_FLAG, 0x02),
+                (KDL3_GIFTING_SEND, 0x01),
+            ]) or (None,) * 14
             if rom != ctx.rom:
                 ctx.rom = None
-            halken = await snes_read(ctx, KDL3_HALKEN, 6)
             if halken != b"halken":
                 return
-            ninten = await snes_read(ctx, KDL3_NINTEN, 6)
             if ninten != b"ninten":
                 return
             if not ctx.slot:
@@ -283,8 +297,8 @@ class KDL3SNIClient(SNIClient):
             # can't check debug anymore, without going and copying the value. might be important later.
             if not self.levels:
                 self.levels = dict()
-                for i in range(5):
-                    level_data = await snes_read(ctx, KDL3_LEVEL_ADDR + (14 * i), 14)
+                levels_data = await snes_read_ranges(ctx, [(KDL3_LEVEL_ADDR + (14 * i), 14) for i in range(5)])
+                for i, level_data in enumerate(levels_data):
                     self.levels[i] = [int.from_bytes(level_data[idx:idx+1], "little")
                                       for idx in range(0, len(level_data), 2)]
                 self.levels[5] = [0x0205,  # Hyper Zone
@@ -299,15 +313,14 @@ class KDL3SNIClient(SNIClient):
             if self.stars is None:
                 stars = await snes_read(ctx, KDL3_STARS_FLAG, 1)
                 self.stars = stars[0] == 0x01
-            is_demo = await snes_read(ctx, KDL3_IS_DEMO, 1)
             # 1 - recording a demo, 2 - playing back recorded, 3+ is a demo
             if is_demo[0] > 0x00:
                 return
-            current_save = await snes_read(ctx, KDL3_GAME_SAVE, 1)
-            goal = await snes_read(ctx, KDL3_GOAL_ADDR, 1)
-            boss_butch_status = await snes_read(ctx, KDL3_BOSS_BUTCH_STATUS + (current_save[0] * 2), 1)
-            mg5_status = await snes_read(ctx, KDL3_MG5_STATUS + (current_save[0] * 2), 1)
-            jumping_status = await snes_read(ctx, KDL3_JUMPING_STATUS + (current_save[0] * 2), 1)
+            boss_butch_status, mg5_status, jumping_status = await snes_read_ranges(ctx, [
+                (KDL3_BOSS_BUTCH_STATUS + (current_save[0] * 2), 1),
+                (KDL3_MG5_STATUS + (current_save[0] * 2), 1),
+                (KDL3_JUMPING_STATUS + (current_save[0] * 2), 1),
+            ])
             if boss_butch_status[0] == 0xFF:
                 return  # save file is not created, ignore
             if (goal[0] == 0x00 and boss_butch_status[0] == 0x01) \
@@ -316,19 +329,15 @@ class KDL3SNIClient(SNIClient):
                     or (goal[0] == 0x03 and jumping_status[0] == 0x03):
                 await ctx.send_msgs([{"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL}])
                 ctx.finished_game = True
-            current_bgm = await snes_read(ctx, KDL3_CURRENT_BGM, 1)
             if current_bgm[0] in (0x00, 0x21, 0x22, 0x23, 0x25, 0x2A, 0x2B):
                 return  # null, title screen, opening, save select, true and false endings
-            game_state = await snes_read(ctx, KDL3_GAME_STATE, 1)
             if "DeathLink" in ctx.tags and game_state[0] == 0x00 and ctx.last_death_link + 1 < time.time():
-                current_hp = await snes_read(ctx, KDL3_KIRBY_HP, 1)
-                current_world = struct.unpack("H", await snes_read(ctx, KDL3_CURRENT_WORLD, 2))[0]
-                current_level = struct.unpack("H", await snes_read(ctx, KDL3_CURRENT_LEVEL, 2))[0]
                 currently_dead = current_hp[0] == 0x00
-                message = deathlink_messages[self.levels[current_world][current_level]]
+                world = struct.unpack("H", current_world)[0]
+                level = struct.unpack("H", current_level)[0]
+                message = deathlink_messages[self.levels[world][level]]
                 await ctx.handle_deathlink_state(currently_dead, f"{ctx.player_names[ctx.slot]}{message}")
 
-            recv_count = await snes_read(ctx, KDL3_RECV_COUNT, 2)
             recv_amount = unpack("H", recv_count)[0]
             if recv_amount < len(ctx.items_received):
                 item = ctx.items_received[recv_amount]
@@ -351,10 +360,9 @@ class KDL3SNIClient(SNIClient):
                     self.item_queue.append(item_idx | 0x80)
 
             # handle gifts here
-            gifting_status = int.from_bytes(await snes_read(ctx, KDL3_GIFTING_FLAG, 0x02), "little")
+            gifting_status = int.from_bytes(gifting_flag, "little")
             if hasattr(self, "gifting") and self.gifting:
                 if gifting_status:
-                    gift = await snes_read(ctx, KDL3_GIFTING_SEND, 0x01)
                     if gift[0]:
                         # we have a gift to send
                         await self.pick_gift_recipient(ctx, gift[0])
@@ -369,10 +377,14 @@ class KDL3SNIClient(SNIClient):
 
             new_checks = []
             # level completion status
-            world_unlocks = await snes_read(ctx, KDL3_WORLD_UNLOCK, 1)
+            save_ranges = [(KDL3_WORLD_UNLOCK, 1), (KDL3_COMPLETED_STAGES, 60), (KDL3_HEART_STARS, 35)]
+            if self.consumables:
+                save_ranges.append((KDL3_CONSUMABLES, 1920))
+            if self.stars:
+                save_ranges.append((KDL3_STARS, 1920))
+            world_unlocks, stages_raw, heart_stars, *collectibles = await snes_read_ranges(ctx, save_ranges)
             if world_unlocks[0] > 0x06:
                 return  # save is not loaded, ignore
-            stages_raw = await snes_read(ctx, KDL3_COMPLETED_STAGES, 60)
             stages = struct.unpack("HHHHHHHHHHHHHHHHHHHHHHHHHHHHHH", stages_raw)
             for i in range(30):
                 loc_id = 0x770000 + i
@@ -382,7 +394,6 @@ class KDL3SNIClient(SNIClient):
                     snes_buffered_write(ctx, KDL3_COMPLETED_STAGES + (i * 2), struct.pack("H", 1))
 
             # heart star status
-            heart_stars = await snes_read(ctx, KDL3_HEART_STARS, 35)
             for i in range(5):
                 start_ind = i * 7
                 for j in range(6):
@@ -393,14 +404,14 @@ class KDL3SNIClient(SNIClient):
                     elif loc_id in ctx.checked_locations:
                         snes_buffered_write(ctx, KDL3_HEART_STARS + level_ind, bytes([0x01]))
             if self.consumables:
-                consumables = await snes_read(ctx, KDL3_CONSUMABLES, 1920)
+                consumables = collectibles.pop(0)
                 for consumable in consumable_addrs:
                     # TODO: see if this can be sped up in any way
                     loc_id = 0x770300 + consumable
                     if loc_id not in ctx.checked_locations and consumables[consumable_addrs[consumable]] == 0x01:
                         new_checks.append(loc_id)
             if self.stars:
-                stars = await snes_read(ctx, KDL3_STARS, 1920)
+                stars = collectibles.pop(0)
                 for star in star_addrs:
                     if star not in ctx.checked_locations and stars[star_addrs[star]] == 0x01:
                         new_checks.append(star)
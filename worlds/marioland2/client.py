@@ -3,7 +3,7 @@ import logging
 
 from NetUtils import ClientStatus
 from worlds._bizhawk.client import BizHawkClient
-from worlds._bizhawk import read, write, guarded_write
+from worlds._bizhawk import read, write, guarded_write, watch
 
 from .rom_addresses import rom_addresses
 
@@ -44,11 +44,11 @@ class MarioLand2Client(BizHawkClient):
 
         (game_loaded_check, level_data, music, auto_scroll_levels, current_level,
          midway_point, bcd_lives, num_items_received, coins, options) = \
-            await read(ctx.bizhawk_ctx, [(0x0046, 10, "CartRAM"), (0x0848, 42, "CartRAM"), (0x0469, 1, "CartRAM"),
-                                         (rom_addresses["Auto_Scroll_Levels_B"], 32, "ROM"),
-                                         (0x0269, 1, "CartRAM"), (0x02A0, 1, "CartRAM"), (0x022C, 1, "CartRAM"),
-                                         (0x00F0, 2, "CartRAM"), (0x0262, 2, "CartRAM"),
-                                         (rom_addresses["Coins_Required"], 8, "ROM")])
+            await watch(ctx.bizhawk_ctx, [(0x0046, 10, "CartRAM"), (0x0848, 42, "CartRAM"), (0x0469, 1, "CartRAM"),
+                                          (rom_addresses["Auto_Scroll_Levels_B"], 32, "ROM"),
+                                          (0x0269, 1, "CartRAM"), (0x02A0, 1, "CartRAM"), (0x022C, 1, "CartRAM"),
+                                          (0x00F0, 2, "CartRAM"), (0x0262, 2, "CartRAM"),
+                                          (rom_addresses["Coins_Required"], 8, "ROM")])
 
         coins_required = int.from_bytes(options[:2], "big")
         difficulty_mode = options[2]
@@ -40,7 +40,7 @@ class SMSNIClient(SNIClient):
     patch_suffix = [".apsm", ".apm3"]
 
     async def deathlink_kill_player(self, ctx):
-        from SNIClient import DeathState, snes_buffered_write, snes_flush_writes, snes_read
+        from SNIClient import DeathState, snes_buffered_write, snes_flush_writes, snes_read_ranges
         snes_buffered_write(ctx, WRAM_START + 0x09C2, bytes([1, 0]))  # set current health to 1 (to prevent saving with 0 energy)
         snes_buffered_write(ctx, WRAM_START + 0x0A50, bytes([255])) # deal 255 of damage at next opportunity
         if not ctx.death_link_allow_survive:
@@ -49,8 +49,8 @@ class SMSNIClient(SNIClient):
         await snes_flush_writes(ctx)
         await asyncio.sleep(1)
 
-        gamemode = await snes_read(ctx, WRAM_START + 0x0998, 1)
-        health = await snes_read(ctx, WRAM_START + 0x09C2, 2)
+        gamemode, health = await snes_read_ranges(ctx, [(WRAM_START + 0x0998, 1),
+                                                        (WRAM_START + 0x09C2, 2)]) or (None, None)
         if health is not None:
             health = health[0] | (health[1] << 8)
         if not gamemode or gamemode[0] in SM_DEATH_MODES or (
@@ -88,12 +88,16 @@ class SMSNIClient(SNIClient):
 
 
     async def game_watcher(self, ctx):
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read_ranges
         if ctx.server is None or ctx.slot is None:
             # not successfully connected to a multiworld server, cannot process the game sending items
             return
 
-        gamemode = await snes_read(ctx, WRAM_START + 0x0998, 1)
+        gamemode, send_queue_counts, recv_queue_wcount = await snes_read_ranges(ctx, [
+            (WRAM_START + 0x0998, 1),
+            (SM_SEND_QUEUE_RCOUNT, 4),
+            (SM_RECV_QUEUE_WCOUNT, 2),
+        ]) or (None, None, None)
         if "DeathLink" in ctx.tags and gamemode and ctx.last_death_link + 1 < time.time():
             currently_dead = gamemode[0] in SM_DEATH_MODES
             await ctx.handle_deathlink_state(currently_dead)
@@ -103,16 +107,22 @@ class SMSNIClient(SNIClient):
                 ctx.finished_game = True
             return
 
-        data = await snes_read(ctx, SM_SEND_QUEUE_RCOUNT, 4)
+        data = send_queue_counts
         if data is None:
             return
 
         recv_index = data[0] | (data[1] << 8)
         recv_item = data[2] | (data[3] << 8) # this is actually SM_SEND_QUEUE_WCOUNT
 
-        while (recv_index < recv_item):
-            item_address = recv_index * 8
-            message = await snes_read(ctx, SM_SEND_QUEUE_START + item_address, 8)
+        # read all the new messages of the send queue at once
+        messages = []
+        if recv_index < recv_item:
+            messages = await snes_read_ranges(ctx, [(SM_SEND_QUEUE_START + index * 8, 8)
+                                                    for index in range(recv_index, recv_item)])
+            if messages is None:
+                return
+
+        for message in messages:
             item_index = (message[4] | (message[5] << 8)) >> 3
 
             recv_index += 1
@@ -128,7 +138,7 @@ class SMSNIClient(SNIClient):
                 f'New Check: {location} ({len(ctx.locations_checked)}/{len(ctx.missing_locations) + len(ctx.checked_locations)})')
             await ctx.send_msgs([{"cmd": 'LocationChecks', "locations": [location_id]}])
 
-        data = await snes_read(ctx, SM_RECV_QUEUE_WCOUNT, 2)
+        data = recv_queue_wcount
         if data is None:
             return
 
@@ -51,7 +51,7 @@ class SMZ3SNIClient(SNIClient):
 
 
     async def game_watcher(self, ctx):
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read_ranges
         if ctx.server is None or ctx.slot is None:
             # not successfully connected to a multiworld server, cannot process the game sending items
             return
@@ -72,31 +72,43 @@ class SMZ3SNIClient(SNIClient):
             recv_progress_size = 2
             recv_progress_addr_table_offset = 0xD38
 
-        currentGame = await snes_read(ctx, SRAM_START + 0x33FE, 2)
-        if (currentGame is not None):
-            if (currentGame[0] != 0):
-                gamemode = await snes_read(ctx, WRAM_START + 0x0998, 1)
-                endGameModes = SM_ENDGAME_MODES
-            else:
-                gamemode = await snes_read(ctx, WRAM_START + 0x10, 1)
-                endGameModes = ENDGAME_MODES
-
-        if gamemode is not None and (gamemode[0] in endGameModes):
+        # the game modes of both games are read, as it's not known yet which game is currently played
+        data = await snes_read_ranges(ctx, [
+            (SRAM_START + 0x33FE, 2),
+            (WRAM_START + 0x0998, 1),
+            (WRAM_START + 0x10, 1),
+            (SMZ3_RECV_PROGRESS_ADDR + send_progress_addr_ptr_offset, 4),
+            (SMZ3_RECV_PROGRESS_ADDR + recv_progress_addr_ptr_offset, 4),
+        ])
+        if data is None:
+            return
+        currentGame, sm_gamemode, z3_gamemode, send_progress, recv_progress = data
+        if (currentGame[0] != 0):
+            gamemode = sm_gamemode
+            endGameModes = SM_ENDGAME_MODES
+        else:
+            gamemode = z3_gamemode
+            endGameModes = ENDGAME_MODES
+
+        if gamemode[0] in endGameModes:
             if not ctx.finished_game:
                 await ctx.send_msgs([{"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL}])
                 ctx.finished_game = True
             return
 
-        data = await snes_read(ctx, SMZ3_RECV_PROGRESS_ADDR + send_progress_addr_ptr_offset, 4)
-        if data is None:
-            return
+        recv_index = send_progress[0] | (send_progress[1] << 8)
+        recv_item = send_progress[2] | (send_progress[3] << 8)
 
-        recv_index = data[0] | (data[1] << 8)
-        recv_item = data[2] | (data[3] << 8)
+        # read all the new messages of the send queue at once
+        messages = []
+        if recv_index < recv_item:
+            messages = await snes_read_ranges(ctx, [
+                (SMZ3_RECV_PROGRESS_ADDR + send_progress_addr_table_offset + index * send_progress_size,
+                 send_progress_size) for index in range(recv_index, recv_item)])
+            if messages is None:
+                return
 
-        while (recv_index < recv_item):
-            item_address = recv_index * send_progress_size
-            message = await snes_read(ctx, SMZ3_RECV_PROGRESS_ADDR + send_progress_addr_table_offset + item_address, send_progress_size)
+        for message in messages:
             is_z3_item = ((message[send_progress_message_byte_offset+1] & 0x80) != 0)
             masked_part = (message[send_progress_message_byte_offset+1] & 0x7F) if is_z3_item else message[send_progress_message_byte_offset+1]
             item_index = ((message[send_progress_message_byte_offset] | (masked_part << 8)) >> 3) + (256 if is_z3_item else 0)
@@ -113,11 +125,7 @@ class SMZ3SNIClient(SNIClient):
             snes_logger.info(f'New Check: {location} ({len(ctx.locations_checked)}/{len(ctx.missing_locations) + len(ctx.checked_locations)})')
             await ctx.send_msgs([{"cmd": 'LocationChecks', "locations": [location_id]}])
 
-        data = await snes_read(ctx, SMZ3_RECV_PROGRESS_ADDR + recv_progress_addr_ptr_offset, 4)
-        if data is None:
-            return
-
-        item_out_ptr = data[2] | (data[3] << 8)
+        item_out_ptr = recv_progress[2] | (recv_progress[3] << 8)
 
         from .TotalSMZ3.Item import items_start_id
         if item_out_ptr < len(ctx.items_received):
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from functools import singledispatch
+from typing import Iterable, List, Optional, Set, Tuple
+
+from BaseClasses import RuleDependencies
+from .base import AggregatingStardewRule, Count, Has
+from .literal import LiteralStardewRule
+from .protocol import StardewRule
+from .state import Reach, Received, TotalReceived
+
+
+class _UnknownDependencies(Exception):
+    pass
+
+
+def get_rule_dependencies(rule: StardewRule) -> Optional[RuleDependencies]:
+    """
+    Walks the rule tree and returns the (player, item name)s and (player, region name)s it can read, or None if part of
+    it can not be introspected. Simplification only ever removes rules, so the original rules are walked.
+    """
+    items: Set[Tuple[int, str]] = set()
+    regions: Set[Tuple[int, str]] = set()
+    # Has rules share large sub-trees, so each rule is only visited once
+    visited: Set[int] = set()
+    to_visit: List[StardewRule] = [rule]
+    try:
+        while to_visit:
+            rule = to_visit.pop()
+            if id(rule) in visited:
+                continue
+            visited.add(id(rule))
+            to_visit.extend(_visit(rule, items, regions))
+    except _UnknownDependencies:
+        return None
+    return frozenset(items), frozenset(regions)
+
+
+@singledispatch
+def _visit(rule: StardewRule, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    raise _UnknownDependencies
+
+
+@_visit.register
+def _(rule: LiteralStardewRule, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    return ()
+
+
+@_visit.register
+def _(rule: AggregatingStardewRule, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    return rule.original_rules
+
+
+@_visit.register
+def _(rule: Count, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    return rule.counter.keys()
+
+
+@_visit.register
+def _(rule: Has, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    if rule.item not in rule.other_rules:
+        raise _UnknownDependencies
+    return rule.other_rules[rule.item],
+
+
+@_visit.register
+def _(rule: Received, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    items.add((rule.player, rule.item))
+    return ()
+
+
+@_visit.register
+def _(rule: TotalReceived, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    items.update((rule.player, item) for item in rule.items)
+    return ()
+
+
+@_visit.register
+def _(rule: Reach, items: Set[Tuple[int, str]], regions: Set[Tuple[int, str]]) -> Iterable[StardewRule]:
+    if rule.resolution_hint != "Region":
+        # reaching a location or an entrance depends on its rule, which is not known here
+        raise _UnknownDependencies
+    regions.add((rule.player, rule.spot))
+    return ()
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Protocol, Tuple, runtime_checkable
+from typing import Optional, Protocol, Tuple, runtime_checkable
 
-from BaseClasses import CollectionState
+from BaseClasses import CollectionState, RuleDependencies
 
 
 @runtime_checkable
@@ -24,3 +24,8 @@ class StardewRule(Protocol):
     @abstractmethod
     def evaluate_while_simplifying(self, state: CollectionState) -> Tuple[StardewRule, bool]:
         ...
+
+    def get_rule_dependencies(self) -> Optional[RuleDependencies]:
+        """Returns what the rule reads for the sweep dependency index, see `World.indexed_sweep`."""
+        from .dependencies import get_rule_dependencies
+        return get_rule_dependencies(self)
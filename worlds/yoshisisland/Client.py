@@ -71,16 +71,25 @@ class YoshisIslandSNIClient(SNIClient):
         return True
 
     async def game_watcher(self, ctx: "SNIContext") -> None:
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
-
-        game_mode = await snes_read(ctx, GAME_MODE, 0x1)
-        item_received = await snes_read(ctx, ITEM_RECEIVED, 0x1)
-        game_music = await snes_read(ctx, DEATHMUSIC_FLAG, 0x1)
-        goal_flag = await snes_read(ctx, GOALFLAG, 0x1)
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read, snes_read_ranges
+
+        data = await snes_read_ranges(ctx, [
+            (GAME_MODE, 0x1),
+            (ITEM_RECEIVED, 0x1),
+            (DEATHMUSIC_FLAG, 0x1),
+            (GOALFLAG, 0x1),
+            (DEATHFLAG, 0x1),
+            (DEATHLINKRECV, 0x1),
+            (YOSHISISLAND_ROMHASH_START, ROMHASH_SIZE),
+            (WRAM_START + 0x1440, 0x80),
+            (ITEMQUEUE_HIGH, 2),
+        ])
+        if data is None:
+            return
+        (game_mode, item_received, game_music, goal_flag, death_flag, deathlink_death, rom, location_ram_data,
+         recv_count) = data
 
         if "DeathLink" in ctx.tags and ctx.last_death_link + 1 < time.time():
-            death_flag = await snes_read(ctx, DEATHFLAG, 0x1)
-            deathlink_death = await snes_read(ctx, DEATHLINKRECV, 0x1)
             currently_dead = (game_music[0] == 0x07 or game_mode[0] == 0x12 or
                               (death_flag[0] == 0x00 and game_mode[0] == 0x11)) and deathlink_death[0] == 0x00
             await ctx.handle_deathlink_state(currently_dead)
@@ -94,7 +103,6 @@ class YoshisIslandSNIClient(SNIClient):
             return
 
         from .Rom import item_values
-        rom = await snes_read(ctx, YOSHISISLAND_ROMHASH_START, ROMHASH_SIZE)
         if rom != ctx.rom:
             ctx.rom = None
             return
@@ -106,7 +114,6 @@ class YoshisIslandSNIClient(SNIClient):
         new_checks = []
         from .Rom import location_table
 
-        location_ram_data = await snes_read(ctx, WRAM_START + 0x1440, 0x80)
         for loc_id, loc_data in location_table.items():
             if loc_id not in ctx.locations_checked:
                 data = location_ram_data[loc_data[0] - 0x1440]
@@ -123,7 +130,6 @@ class YoshisIslandSNIClient(SNIClient):
             snes_logger.info(f"New Check: {location} ({len(ctx.locations_checked)}/{total_locations})")
             await ctx.send_msgs([{"cmd": "LocationChecks", "locations": [new_check_id]}])
 
-        recv_count = await snes_read(ctx, ITEMQUEUE_HIGH, 2)
         recv_index = struct.unpack("H", recv_count)[0]
         if recv_index < len(ctx.items_received):
             item = ctx.items_received[recv_index]